@@ -0,0 +1,169 @@
+from functools import partial
+
+from app.market.data.transform.stored.handler import StoredTransformHandler
+from app.market.handler import MarketHandler
+from app.market.runner.handler import RunnerHandler
+
+from infrastructure.storage.historical.cache.handler import HistoricalCacheHandler
+from infrastructure.storage.historical.cache.market.handler import (
+    HistoricalCacheMarketHandler,
+)
+from infrastructure.storage.historical.cache.record.adapter import (
+    HistoricalCacheRecordAdapter,
+)
+from infrastructure.storage.historical.download.file.handler import (
+    HistoricalDownloadFileHandler,
+)
+from infrastructure.storage.historical.feature.handler import (
+    HistoricalFeatureStoreHandler,
+)
+from infrastructure.storage.historical.download.file.record.adapter import (
+    HistoricalDownloadFileRecordAdapter,
+)
+
+from infrastructure.built_in.adapter.log_utils import log_exception
+from infrastructure.built_in.adapter.os_utils import (
+    get_matching_paths,
+    remove_file_extension,
+    split_path,
+)
+from infrastructure.built_in.adapter.process_utils import (
+    get_processor_count,
+    map_in_processes,
+)
+from infrastructure.built_in.adapter.time_utils import get_time, get_elapsed_time
+
+
+class BacktestHandler:
+    def __init__(
+        self,
+        path,
+        processes=None,
+        bank=5000,
+        extension=".bz2",
+        cache_directory=None,
+        feature_directory=None,
+    ):
+        self.__paths = get_matching_paths(path=path, extension=extension)
+        self.__processes = processes or get_processor_count()
+        self.__bank = bank
+        self.__cache_directory = cache_directory
+        self.__feature_directory = feature_directory
+
+    def get_paths(self):
+        return self.__paths
+
+    def run(self):
+        start_time = get_time()
+        markets = list(
+            filter(
+                None,
+                map_in_processes(
+                    function=partial(
+                        run_market,
+                        bank=self.__bank,
+                        cache_directory=self.__cache_directory,
+                        feature_directory=self.__feature_directory,
+                    ),
+                    iterable=self.__paths,
+                    processes=self.__processes,
+                ),
+            )
+        )
+        return self._aggregate(markets=markets, seconds=get_elapsed_time(start_time))
+
+    def _aggregate(self, markets, seconds):
+        markets = sorted(markets, key=lambda market: market.get("path"))
+        return {
+            "markets": markets,
+            "market_count": len(markets),
+            "order_count": sum(len(market.get("orders")) for market in markets),
+            "record_count": sum(market.get("records") for market in markets),
+            "seconds": seconds,
+            "markets_per_hour": (len(markets) * 60 * 60) / seconds if seconds else 0,
+        }
+
+
+def run_market(
+    path, bank=5000, cache_directory=None, models=None, feature_directory=None
+):
+    # module level so that it can be sent to the long-lived worker processes,
+    # each of which imports the market handler (and its dependencies) once, a
+    # market which can not be run is left out rather than ending the backtest
+    try:
+        return _run_market(
+            path=path,
+            bank=bank,
+            cache_directory=cache_directory,
+            models=models,
+            feature_directory=feature_directory,
+        )
+    except Exception:
+        log_exception("market %s could not be run", path)
+        return None
+
+
+def _run_market(path, bank, cache_directory, models, feature_directory):
+    start_time = get_time()
+    directory, file = split_path(path)
+    runners = RunnerHandler()
+    transformer = None
+    if feature_directory:
+        # the records from the feature store have already been transformed
+        market = HistoricalFeatureStoreHandler(directory=feature_directory).get_market(
+            path
+        )
+        if market is None:
+            return None
+        external_api = HistoricalCacheMarketHandler(market=market)
+        data_adapter = HistoricalCacheRecordAdapter()
+        transformer = StoredTransformHandler(runners=runners)
+    elif cache_directory:
+        market = HistoricalCacheHandler(directory=cache_directory).get_market(path)
+        if market is None:
+            return None
+        external_api = HistoricalCacheMarketHandler(market=market)
+        data_adapter = HistoricalCacheRecordAdapter()
+    else:
+        external_api = HistoricalDownloadFileHandler(directory=directory, file=file)
+        if not external_api.is_valid_market():
+            return None
+        data_adapter = HistoricalDownloadFileRecordAdapter()
+
+    market_handler = MarketHandler(
+        market_id=remove_file_extension(file),
+        external_api=external_api,
+        market_start_time=external_api.get_market_start_time(),
+        data_adapter=data_adapter,
+        bank=bank,
+        models=models,
+        exit_on_close=False,
+        runners=runners,
+        transformer=transformer,
+    )
+    external_api.set_mediator(mediator=market_handler)
+    if models:
+        models.set_mediator(mediator=market_handler)
+
+    records = 0
+    while True:
+        market_handler.run()
+        if external_api.is_exhausted():
+            break
+        records += 1
+        if market_handler.is_closed():
+            break
+
+    try:
+        outcome = external_api.get_outcome()
+    except:
+        outcome = None
+
+    return {
+        "market_id": market_handler.get_market_id(),
+        "path": path,
+        "orders": market_handler.get_orders(),
+        "outcome": outcome,
+        "records": records,
+        "seconds": get_elapsed_time(start_time),
+    }
@@ -0,0 +1,173 @@
+from functools import partial
+
+from app.backtest.handler import run_market
+from app.backtest.sweep.recorder import FeatureRecorder
+from app.market.model.handler import ModelHandler
+from app.market.orders.handler import OrdersHandler
+
+from infrastructure.third_party.adapter.parameter_sweep import BatchParameterSweep
+from infrastructure.third_party.adapter.stats_model import (
+    BatchWeightedLinearRegression,
+)
+
+from infrastructure.built_in.adapter.iter_utils import get_product
+from infrastructure.built_in.adapter.os_utils import get_matching_paths
+from infrastructure.built_in.adapter.process_utils import (
+    get_processor_count,
+    map_in_processes,
+)
+from infrastructure.built_in.adapter.time_utils import get_time, get_elapsed_time
+
+
+class SweepHandler:
+    # every market is replayed once, the grid is then evaluated against the
+    # features of each of its ticks, the sweep keeps the state of every grid
+    # point so the probabilities of the other runners are rescaled and the
+    # regression corrected for the runners ordered on that point, and the
+    # risk is reduced as it is, which gives the orders of a backtest
+    def __init__(
+        self,
+        path,
+        parameters,
+        processes=None,
+        bank=5000,
+        extension=".bz2",
+        cache_directory=None,
+        event_country="AU",
+        feature_directory=None,
+    ):
+        self.__paths = get_matching_paths(path=path, extension=extension)
+        self.__grid = self.make_grid(parameters=parameters)
+        self.__processes = processes or get_processor_count()
+        self.__bank = bank
+        self.__cache_directory = cache_directory
+        self.__event_country = event_country
+        self.__feature_directory = feature_directory
+
+    def get_paths(self):
+        return self.__paths
+
+    def get_grid(self):
+        return self.__grid
+
+    @staticmethod
+    def make_grid(parameters):
+        # a point for every combination of the values given, any parameter
+        # which is not given keeps the value the handlers use by default
+        defaults = dict(
+            ModelHandler.get_default_thresholds(), **OrdersHandler.get_default_sizing()
+        )
+        names = list(parameters.keys())
+        return [
+            dict(defaults, **dict(zip(names, values)))
+            for values in get_product(parameters.values())
+        ]
+
+    def run(self):
+        start_time = get_time()
+        markets = list(
+            filter(
+                None,
+                map_in_processes(
+                    function=partial(
+                        sweep_market,
+                        grid=self.__grid,
+                        bank=self.__bank,
+                        cache_directory=self.__cache_directory,
+                        event_country=self.__event_country,
+                        feature_directory=self.__feature_directory,
+                    ),
+                    iterable=self.__paths,
+                    processes=self.__processes,
+                ),
+            )
+        )
+        return self._aggregate(markets=markets, seconds=get_elapsed_time(start_time))
+
+    def _aggregate(self, markets, seconds):
+        markets = sorted(markets, key=lambda market: market.get("path"))
+        return {
+            "points": [
+                self.__aggregate_point(
+                    parameters=parameters,
+                    markets=[
+                        dict(market, orders=market.get("orders")[point])
+                        for market in markets
+                    ],
+                )
+                for point, parameters in enumerate(self.__grid)
+            ],
+            "market_count": len(markets),
+            "record_count": sum(market.get("records") for market in markets),
+            "seconds": seconds,
+            "markets_per_hour": (len(markets) * 60 * 60) / seconds if seconds else 0,
+        }
+
+    @staticmethod
+    def __aggregate_point(parameters, markets):
+        orders = [
+            (order, market.get("outcome"))
+            for market in markets
+            for order in market.get("orders")
+        ]
+        settled = [(order, outcome) for order, outcome in orders if outcome]
+        return {
+            "parameters": parameters,
+            "market_count": sum(1 for market in markets if market.get("orders")),
+            "order_count": len(orders),
+            "stake": sum(order.get("size") for order, _ in orders),
+            "settled_stake": sum(order.get("size") for order, _ in settled),
+            "profit": sum(
+                SweepHandler.__calc_profit(order=order, outcome=outcome)
+                for order, outcome in settled
+            ),
+        }
+
+    @staticmethod
+    def __calc_profit(order, outcome):
+        if order.get("id") == outcome:
+            return order.get("size") * (order.get("returns_price") - 1)
+        return -order.get("size")
+
+
+def record_market(path, bank=5000, cache_directory=None, feature_directory=None):
+    recorder = FeatureRecorder(
+        mediator=None, batch_wls_model=BatchWeightedLinearRegression()
+    )
+    market = run_market(
+        path=path,
+        bank=bank,
+        cache_directory=cache_directory,
+        models=recorder,
+        feature_directory=feature_directory,
+    )
+    if market is None:
+        return None
+    market["ticks"] = recorder.get_ticks()
+    return market
+
+
+def sweep_market(
+    path,
+    grid,
+    bank=5000,
+    cache_directory=None,
+    event_country="AU",
+    feature_directory=None,
+):
+    # module level so that it can be sent to the worker processes, the grid is
+    # evaluated where the market was replayed so the ticks are never sent back
+    start_time = get_time()
+    market = record_market(
+        path=path,
+        bank=bank,
+        cache_directory=cache_directory,
+        feature_directory=feature_directory,
+    )
+    if market is None:
+        return None
+    sweep = BatchParameterSweep(grid=grid, bank=bank, event_country=event_country)
+    sweep.run(ticks=market.pop("ticks"))
+    market["orders"] = sweep.get_orders()
+    market["seconds"] = get_elapsed_time(start_time)
+    return market
@@ -0,0 +1,56 @@
+from app.colleague import Colleague
+
+from infrastructure.third_party.adapter.numpy_utils import (
+    calculate_log_returns,
+    stack_arrays,
+)
+
+
+class FeatureRecorder(Colleague):
+    # stands in for the models during a replay, keeping what they would need
+    # from each tick, no orders are made so every runner is kept on every tick
+    def __init__(self, mediator, batch_wls_model):
+        self.batch_wls_model = batch_wls_model
+        self.__ticks = []
+        Colleague.__init__(self, mediator=mediator)
+
+    def run_models(self, items):
+        if items:
+            self.__ticks.append(self.__make_tick(items=items))
+        return self._mediator.notify(event="finished processing", data=None)
+
+    def get_ticks(self):
+        return self.__ticks
+
+    def __make_tick(self, items):
+        # the regression is the one the models make, each runner's fit only
+        # depends on its own series, and what is needed to correct it for the
+        # orders made on a grid point is kept with it
+        self.batch_wls_model.run(
+            y=calculate_log_returns(
+                stack_arrays(
+                    [item.get("compositional_sp_back_price_ts") for item in items]
+                )
+            ),
+            x=items[0].get("extract_time_ts"),
+            weights=stack_arrays([item.get("combined_back_size_ts") for item in items]),
+        )
+        tick = {
+            feature: [item.get(feature) for item in items]
+            for feature in self.__features
+        }
+        tick["extract_time"] = items[0].get("extract_time_ts")[-1]
+        tick["alpha"] = self.batch_wls_model.get_alpha()
+        tick["Beta"] = self.batch_wls_model.get_Beta()
+        tick["inverse"] = self.batch_wls_model.get_inverse()
+        tick["origin"] = self.batch_wls_model.get_origin()
+        return tick
+
+    __features = [
+        "id",
+        "combined_back_size_pit",
+        "ex_offered_back_price_pit",
+        "ex_offered_back_price_mc_pit",
+        "compositional_sp_probability_pit",
+        "compositional_ex_average_probability_pit",
+    ]
@@ -0,0 +1,197 @@
+from infrastructure.built_in.adapter.async_utils import (
+    make_thread_pool,
+    run_coroutine,
+    run_in_thread,
+    run_together,
+    start_task,
+    wait_for_seconds,
+)
+from infrastructure.built_in.adapter.time_utils import get_time, get_elapsed_time
+
+
+class LiveHandler:
+    def __init__(
+        self,
+        schedule=None,
+        interval=1,
+        schedule_interval=60,
+        threads=128,
+        batch_handler=None,
+    ):
+        self.__schedule = schedule
+        self.__batch_handler = batch_handler
+        self.__interval = interval
+        self.__schedule_interval = schedule_interval
+        self.__pool = make_thread_pool(threads=threads)
+        self.__markets = {}
+        self.__tasks = {}
+        self.__finished_market_ids = set()
+        self.__errors = {}
+        self.__batch_errors = []
+        self.__running = False
+
+    def add_market(self, market):
+        market_id = market.get_market_id()
+        if market_id in self.__markets:
+            return False
+        self.__markets[market_id] = market
+        if self.__batch_handler:
+            self.__batch_handler.add_market(external_api=market.external_api)
+        elif self.__running:
+            self.__tasks[market_id] = start_task(self.__poll_market(market=market))
+        return True
+
+    def remove_market(self, market_id):
+        self.__markets.pop(market_id, None)
+        task = self.__tasks.pop(market_id, None)
+        if task:
+            task.cancel()
+        if self.__batch_handler:
+            self.__batch_handler.remove_market(market_id=market_id)
+        self.__finished_market_ids.add(market_id)
+
+    def get_market_ids(self):
+        return list(self.__markets.keys())
+
+    def get_finished_market_ids(self):
+        return list(self.__finished_market_ids)
+
+    def get_errors(self):
+        return self.__errors
+
+    def get_batch_errors(self):
+        return self.__batch_errors
+
+    def stop(self):
+        self.__running = False
+
+    async def run(self):
+        self.__running = True
+        if self.__batch_handler:
+            batch_task = start_task(self.__poll_batches())
+        else:
+            for market in list(self.__markets.values()):
+                self.__tasks[market.get_market_id()] = start_task(
+                    self.__poll_market(market=market)
+                )
+
+        schedule_time = None
+        while self.__running and (self.__schedule or self.__markets):
+            if self.__schedule and (
+                schedule_time is None
+                or get_elapsed_time(schedule_time) >= self.__schedule_interval
+            ):
+                schedule_time = get_time()
+                await self.__refresh_schedule()
+            await wait_for_seconds(self.__interval)
+
+        for market_id in list(self.__markets.keys()):
+            self.remove_market(market_id=market_id)
+        self.__running = False
+        if self.__batch_handler:
+            batch_task.cancel()
+
+    async def __refresh_schedule(self):
+        schedule = await run_in_thread(self.__pool, self.__schedule.get_schedule)
+        new_markets = [
+            market
+            for market in schedule or []
+            if not self.__is_known_market(market_id=float(market.get("marketId")))
+        ]
+        if new_markets:
+            # each market is polled by its own task so an exit must only close
+            # that market rather than the whole process
+            for market in self.__schedule.create_new_markets(
+                new_markets, exit_on_close=False
+            ):
+                self.add_market(market=market)
+
+    def __is_known_market(self, market_id):
+        return market_id in self.__markets or market_id in self.__finished_market_ids
+
+    async def __poll_market(self, market):
+        # the blocking request is made in the thread pool so that every market
+        # waits on the exchange at the same time, the response is then passed
+        # down the mediator chain on the event loop one market at a time
+        market_id = market.get_market_id()
+        external_api = market.external_api
+        try:
+            while not market.is_closed():
+                start_time = get_time()
+                data = await run_in_thread(self.__pool, external_api.fetch_market)
+                external_api.process_market(data=data)
+                await wait_for_seconds(
+                    max(self.__interval - get_elapsed_time(start_time), 0)
+                )
+        except Exception as error:
+            self.__errors[market_id] = error
+        finally:
+            self.__finish_market(market_id=market_id)
+
+    async def __poll_batches(self):
+        # every market is requested on the same tick in as few calls as the
+        # request weight allows, with the batches sent at the same time
+        # an error only loses the tick it was raised on, the markets are polled
+        # again on the next tick as a single market's task would be
+        while self.__running:
+            start_time = get_time()
+            try:
+                process_time = self.__batch_handler.get_process_time()
+                batches = await run_together(
+                    *[
+                        self.__fetch_batch(
+                            market_ids=market_ids, process_time=process_time
+                        )
+                        for market_ids in self.__batch_handler.get_batches()
+                    ]
+                )
+                for markets in batches:
+                    for market_id, data in markets.items():
+                        self.__process_market(market_id=market_id, data=data)
+            except Exception as error:
+                self.__batch_errors.append(error)
+            await wait_for_seconds(
+                max(self.__interval - get_elapsed_time(start_time), 0)
+            )
+
+    async def __fetch_batch(self, market_ids, process_time):
+        # a failed request only loses its own batch for the tick
+        try:
+            return await run_in_thread(
+                self.__pool, self.__batch_handler.fetch_batch, market_ids, process_time
+            )
+        except Exception as error:
+            self.__batch_errors.append(error)
+            return {}
+
+    def __process_market(self, market_id, data):
+        market = self.__markets.get(market_id)
+        if market is None:
+            return None
+        try:
+            market.external_api.process_market(data=data)
+        except Exception as error:
+            self.__errors[market_id] = error
+            return self.__finish_market(market_id=market_id)
+        if market.is_closed():
+            return self.__finish_market(market_id=market_id)
+
+    def __finish_market(self, market_id):
+        self.__markets.pop(market_id, None)
+        self.__tasks.pop(market_id, None)
+        if self.__batch_handler:
+            self.__batch_handler.remove_market(market_id=market_id)
+        self.__finished_market_ids.add(market_id)
+
+
+def run_live(
+    schedule, interval=1, schedule_interval=60, threads=128, batch_handler=None
+):
+    handler = LiveHandler(
+        schedule=schedule,
+        interval=interval,
+        schedule_interval=schedule_interval,
+        threads=threads,
+        batch_handler=batch_handler,
+    )
+    return run_coroutine(handler.run())
@@ -1,15 +1,18 @@
 from app.colleague import Colleague
 
 from app.market.data.transform.handler import TransformHandler
-from app.market.metadata.handler import MetadataHandler
+from app.market.metadata.schema import FeatureSchema
+from app.market.runner.handler import RunnerHandler
 
 
 class DataHandler(Colleague):
-    def __init__(self, mediator, adapter, container, transformer=None):
+    def __init__(self, mediator, adapter, container, transformer=None, runners=None):
         self._container = container.new()
         self.__extractor = adapter
-        self.__transformer = transformer or TransformHandler()
-        self.__metadata = MetadataHandler()
+        self.__runners = runners or RunnerHandler()
+        self.__transformer = transformer or TransformHandler(runners=self.__runners)
+        self.__schema = FeatureSchema()
+        self.__runner_columns = {}
         self.__consecutive_empty_data = 0
         Colleague.__init__(self, mediator=mediator)
 
@@ -27,6 +30,7 @@ class DataHandler(Colleague):
         transformed_data = self._transform(extracted_data=extracted_data)
         if transformed_data:
             self.__add_to_container(data=transformed_data)
+            self.__runners.add_runners(items=extracted_data.get("items") or [])
 
         if self._confirm_market_closed():
             return self._mediator.notify(event="market closed")
@@ -52,21 +56,23 @@ class DataHandler(Colleague):
         )
 
     def _get_model_data(self):
+        index = self._container.get_index()
         model_data = list(
             map(
-                self.__get_item_model_data,
+                lambda runner_id: self.__get_item_model_data(
+                    runner_id=runner_id, index=index
+                ),
                 self._get_ids_for_model_data(),
             )
         )
         return model_data
 
     def _get_ids_for_model_data(self):
-        return list(
-            filter(
-                lambda id: not id in self._get_fixed_probability_ids(),
-                self.get_unique_ids(),
-            )
-        )
+        return [
+            runner_id
+            for runner_id in self.get_unique_ids()
+            if not self.__runners.has_fixed_probability(runner_id)
+        ]
 
     def _get_fixed_probability_ids(self):
         return self.__transformer.get_fixed_probability_ids()
@@ -75,8 +81,7 @@ class DataHandler(Colleague):
         self.__transformer.set_probability(runner_id=runner_id, probability=probability)
 
     def get_unique_ids(self):
-        index = self._container.get_column_group_values(name="id")
-        return [id for id in index if isinstance(id, int)]
+        return self.__runners.get_ids()
 
     def _extract(self, data):
         extracted_data = self.__extractor.convert(data)
@@ -88,7 +93,7 @@ class DataHandler(Colleague):
 
     def __add_to_container(self, data):
         record_container = self._container.new(data=data)
-        record_container.set_index((self.__metadata.get_index_name(), ""))
+        record_container.set_index((self.__schema.get_index_name(), ""))
         record_container.set_column_group_name(names=["variable", "id"])
         self._container.add_rows(container=record_container)
 
@@ -103,31 +108,21 @@ class DataHandler(Colleague):
             original_size + self.__get_container_column_count()
         )
 
-    def __get_item_model_data(self, runner_id):
-        data = {
-            "id": runner_id,
-            self.__metadata.get_index_name()
-            + self.__metadata.get_time_series_suffix(): self._container.get_index(),
-        }
-
-        data.update(
-            {
-                column
-                + self.__metadata.get_point_in_time_suffix(): self._container.get_last_column_entry(
-                    name=(column, runner_id)
-                )
-                for column in self.__metadata.get_point_in_time_model_variables()
-            }
-        )
+    def __get_item_model_data(self, runner_id, index):
+        columns = self.__get_runner_columns(runner_id=runner_id)
+        data = {"id": runner_id, self.__schema.get_index_feature(): index}
 
-        data.update(
-            {
-                column
-                + self.__metadata.get_time_series_suffix(): self._container.get_column(
-                    name=(column, runner_id)
-                )
-                for column in self.__metadata.get_time_series_model_variables()
-            }
-        )
+        for feature, slot in self.__schema.get_point_in_time_features():
+            data[feature] = self._container.get_last_column_entry(name=columns[slot])
+
+        for feature, slot in self.__schema.get_time_series_features():
+            data[feature] = self._container.get_column(name=columns[slot])
 
         return data
+
+    def __get_runner_columns(self, runner_id):
+        columns = self.__runner_columns.get(runner_id)
+        if columns is None:
+            columns = self.__schema.make_runner_columns(runner_id=runner_id)
+            self.__runner_columns[runner_id] = columns
+        return columns
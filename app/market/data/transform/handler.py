@@ -1,25 +1,29 @@
 from app.market.data.transform.probability.handler import ProbabilityHandler
 from app.market.data.transform.price.handler import PriceHandler
-from app.market.metadata.handler import MetadataHandler
+from app.market.metadata.schema import FeatureSchema
+from app.market.runner.handler import RunnerHandler
 
 
 class TransformHandler:
-    def __init__(self, total_probability=1):
+    def __init__(self, total_probability=1, runners=None):
         self.__pricer = PriceHandler()
-        self.__metadata = MetadataHandler()
+        self.__schema = FeatureSchema()
         self.__total_probability = total_probability
         self.__remaining_probability = total_probability
-        self.__fixed_probabilities = {}
+        self.__runners = runners or RunnerHandler()
         self.__transformed_data = {}
         self.__items = None
+        self.__item_columns = None
+        self.__runner_columns = {}
         self.__extract_time = None
         self.__closed_indicator = None
+        self.__previous = {"items": None, "fixed_probabilities": None, "data": {}}
 
     def set_probability(self, runner_id, probability):
-        self.__fixed_probabilities[runner_id] = probability
+        self.__runners.set_probability(runner_id=runner_id, probability=probability)
 
     def get_fixed_probability_ids(self):
-        return list(self.__fixed_probabilities.keys())
+        return self.__runners.get_fixed_probability_ids()
 
     def process(self, extracted_data={}):
         items = extracted_data.get("items") or []
@@ -34,7 +38,12 @@ class TransformHandler:
         self._set_closed_indicator(closed_indicator=closed_indicator)
         self._calc_remaining_probability()
 
-        if self.__is_valid_record():
+        if self.__is_carried_forward(items=items):
+            self.__transformed_data = dict(self.__previous.get("data"))
+            self.__add_extract_time()
+            self.__add_closed_indicator()
+        elif self.__is_valid_record():
+            self.__set_item_columns()
             self.__add_extract_time()
             self.__add_closed_indicator()
             self.__add_default_data()
@@ -44,6 +53,11 @@ class TransformHandler:
             self.__add_compositional_ex_data()
             self.__add_market_back_size()
 
+        self.__previous = {
+            "items": items,
+            "fixed_probabilities": dict(self.__runners.get_fixed_probabilities()),
+            "data": self.__transformed_data,
+        }
         return self.__transformed_data
 
     def _set_items(self, items):
@@ -52,7 +66,7 @@ class TransformHandler:
     def _exclude_fixed_items(self, items):
         return list(
             filter(
-                lambda item: item.get("id") not in self.get_fixed_probability_ids(),
+                lambda item: not self.__runners.has_fixed_probability(item.get("id")),
                 items,
             )
         )
@@ -64,8 +78,19 @@ class TransformHandler:
         self.__closed_indicator = closed_indicator
 
     def _calc_remaining_probability(self):
-        self.__remaining_probability = self.__total_probability - sum(
-            self.__fixed_probabilities.values()
+        self.__remaining_probability = (
+            self.__total_probability - self.__runners.get_fixed_probability_total()
+        )
+
+    def __is_carried_forward(self, items):
+        # the same items as the last record (e.g. a gap filled second) give the
+        # same row, only the time and closed indicator need to be updated
+        return (
+            items is self.__previous.get("items")
+            and self.__runners.get_fixed_probabilities()
+            == self.__previous.get("fixed_probabilities")
+            and self.__previous.get("data")
+            and self.__extract_time is not None
         )
 
     def __is_valid_record(self):
@@ -79,35 +104,38 @@ class TransformHandler:
             self.__closed_indicator and self.__extract_time >= 0
         ]
 
+    def __set_item_columns(self):
+        self.__item_columns = [
+            (item, self.__get_runner_columns(runner_id=item.get("id")))
+            for item in self.__items
+        ]
+
+    def __get_runner_columns(self, runner_id):
+        columns = self.__runner_columns.get(runner_id)
+        if columns is None:
+            columns = self.__schema.make_runner_columns(runner_id=runner_id)
+            self.__runner_columns[runner_id] = columns
+        return columns
+
     def __add_default_data(self):
-        for column in self.__metadata.get_required_variables():
-            for item in self.__items:
-                self.__transformed_data[
-                    self.__get_composite_column_name(variable=column, item=item)
-                ] = [item.get(column)]
+        for variable, slot in self.__schema.get_required_slots():
+            for item, columns in self.__item_columns:
+                self.__transformed_data[columns[slot]] = [item.get(variable)]
 
     def __add_adj_back_prices(self):
-        for column in self.__metadata.get_back_prices():
-            for item in self.__items:
-                self.__transformed_data[
-                    self.__get_composite_column_name(
-                        variable=(
-                            column + self.__metadata.get_minus_commission_suffix()
-                        ),
-                        item=item,
-                    )
-                ] = [self.__pricer.remove_commission(item.get(column))]
+        for variable, slot in self.__schema.get_minus_commission_slots():
+            for item, columns in self.__item_columns:
+                self.__transformed_data[columns[slot]] = [
+                    self.__pricer.remove_commission(item.get(variable))
+                ]
 
     def __add_combined_back_size(self):
-        for item in self.__items:
-            combined_back_size = sum(
-                item.get(size) for size in self.__metadata.get_back_sizes()
-            )
-            self.__transformed_data[
-                self.__get_composite_column_name(
-                    variable="combined_back_size", item=item
-                )
-            ] = [combined_back_size]
+        slot = self.__schema.get_slot("combined_back_size")
+        back_sizes = self.__schema.get_back_sizes()
+        for item, columns in self.__item_columns:
+            self.__transformed_data[columns[slot]] = [
+                sum(item.get(size) for size in back_sizes)
+            ]
 
     def __add_compositional_sp_data(self):
         self.__add_compositional_data(name="sp")
@@ -119,32 +147,26 @@ class TransformHandler:
         compositional_data = self._get_compositional_data(
             price_name=(name + "_back_price")
         )
+        probability_slot, price_slot = self.__schema.get_compositional_slots(name)
 
         for item in compositional_data:
-            self.__transformed_data[
-                self.__get_composite_column_name(
-                    variable="compositional_" + name + "_probability", item=item
-                )
-            ] = [item.get("compositional_probability")]
-
-            self.__transformed_data[
-                self.__get_composite_column_name(
-                    variable="compositional_" + name + "_back_price", item=item
-                )
-            ] = [item.get("compositional_price")]
+            columns = self.__get_runner_columns(runner_id=item.get("id"))
+            self.__transformed_data[columns[probability_slot]] = [
+                item.get("compositional_probability")
+            ]
+            self.__transformed_data[columns[price_slot]] = [
+                item.get("compositional_price")
+            ]
 
     def __add_market_back_size(self):
         self.__transformed_data[("market_back_size", "")] = [
             sum(
                 item.get(size)
-                for size in self.__metadata.get_back_sizes()
+                for size in self.__schema.get_back_sizes()
                 for item in self.__items
             )
         ]
 
-    def __get_composite_column_name(self, variable, item):
-        return (variable, item.get("id"))
-
     def _get_compositional_data(self, price_name):
 
         probabilities = list(
@@ -0,0 +1,108 @@
+from app.market.data.transform.handler import TransformHandler
+from app.market.metadata.schema import FeatureSchema
+from app.market.runner.handler import RunnerHandler
+
+
+class StoredTransformHandler(TransformHandler):
+    # the items already hold what the transform makes of them when no
+    # probabilities are fixed, so they are written out as they are, only the
+    # compositional data is made again once some probabilities are fixed
+    def __init__(self, total_probability=1, runners=None):
+        self.__runners = runners or RunnerHandler()
+        self.__schema = FeatureSchema()
+        self.__runner_columns = {}
+        compositional_slots = [
+            slot
+            for name in self.__names
+            for slot in self.__schema.get_compositional_slots(name)
+        ]
+        self.__stored_slots = tuple(
+            (variable, slot)
+            for slot, variable in enumerate(self.__schema.get_runner_variables())
+            if slot not in compositional_slots
+        )
+        TransformHandler.__init__(
+            self, total_probability=total_probability, runners=self.__runners
+        )
+
+    def process(self, extracted_data={}):
+        if not self.__is_transformed(items=extracted_data.get("items") or []):
+            # the transform failed on the record when it was stored, so it is
+            # given the record's required variables as a backtest would be
+            return TransformHandler.process(self, extracted_data)
+
+        items = self._exclude_fixed_items(items=extracted_data.get("items") or [])
+        extract_time = extracted_data.get("extract_time")
+        if not items or extract_time is None:
+            return {}
+
+        # the columns are added in the same order as the transform adds them
+        transformed_data = {
+            ("extract_time", ""): [extract_time],
+            ("closed_indicator", ""): [
+                extracted_data.get("closed_indicator") and extract_time >= 0
+            ],
+        }
+        item_columns = [
+            (item, self.__get_runner_columns(runner_id=item.get("id")))
+            for item in items
+        ]
+        for variable, slot in self.__stored_slots:
+            for item, columns in item_columns:
+                transformed_data[columns[slot]] = [item.get(variable)]
+
+        for name in self.__names:
+            probability_slot, price_slot = self.__schema.get_compositional_slots(name)
+            for probability, price, columns in self.__get_compositional_data(
+                name=name, item_columns=item_columns
+            ):
+                transformed_data[columns[probability_slot]] = [probability]
+                transformed_data[columns[price_slot]] = [price]
+
+        transformed_data[("market_back_size", "")] = [
+            sum(
+                item.get(size)
+                for size in self.__schema.get_back_sizes()
+                for item in items
+            )
+        ]
+        return transformed_data
+
+    @staticmethod
+    def __is_transformed(items):
+        return all(item.get("combined_back_size") is not None for item in items)
+
+    def __get_compositional_data(self, name, item_columns):
+        if not self.__runners.get_fixed_probabilities():
+            variables = self.__schema.get_runner_variables()
+            probability_slot, price_slot = self.__schema.get_compositional_slots(name)
+            return [
+                (
+                    item.get(variables[probability_slot]),
+                    item.get(variables[price_slot]),
+                    columns,
+                )
+                for item, columns in item_columns
+            ]
+        self._set_items(items=[item for item, _ in item_columns])
+        self._calc_remaining_probability()
+        return [
+            (
+                item.get("compositional_probability"),
+                item.get("compositional_price"),
+                columns,
+            )
+            for item, (_, columns) in zip(
+                self._get_compositional_data(price_name=(name + "_back_price")),
+                item_columns,
+            )
+        ]
+
+    def __get_runner_columns(self, runner_id):
+        columns = self.__runner_columns.get(runner_id)
+        if columns is None:
+            columns = self.__schema.make_runner_columns(runner_id=runner_id)
+            self.__runner_columns[runner_id] = columns
+        return columns
+
+    __names = ["sp", "ex_average"]
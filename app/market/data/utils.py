@@ -1,5 +1,48 @@
 from infrastructure.third_party.adapter.numpy_utils import is_not_a_number, not_a_number
 
+__tick_bands = [
+    (1.01, 2, 0.01),
+    (2, 3, 0.02),
+    (3, 4, 0.05),
+    (4, 6, 0.1),
+    (6, 10, 0.2),
+    (10, 20, 0.5),
+    (20, 30, 1),
+    (30, 50, 2),
+    (50, 100, 5),
+    (100, 1000, 10),
+]
+
+
+def __make_ticks():
+    ticks = []
+    for start, end, step in __tick_bands:
+        count = int(round((end - start) / step))
+        ticks.extend(round(start + (step * index), 2) for index in range(count))
+    ticks.append(1000.0)
+    return ticks
+
+
+__ticks = __make_ticks()
+__tick_indexes = {tick: index for index, tick in enumerate(__ticks)}
+
+
+def get_ticks():
+    return list(__ticks)
+
+
+def get_tick_count():
+    return len(__ticks)
+
+
+def get_tick_index(price):
+    # prices which are not on the exchange's ladder have no index
+    return __tick_indexes.get(price)
+
+
+def get_tick_indexes():
+    return __tick_indexes
+
 
 def calc_inverse_price(price):
     return 1 / (1 - (1 / price)) if is_valid_price(price) else not_a_number()
@@ -4,6 +4,7 @@ from app.colleague import Colleague
 from app.market.data.handler import DataHandler
 from app.market.model.handler import ModelHandler
 from app.market.orders.handler import OrdersHandler
+from app.market.runner.handler import RunnerHandler
 
 from infrastructure.external_api.market.record.adapter import (
     ExternalAPIMarketRecordAdapter,
@@ -21,30 +22,44 @@ class MarketHandler(Mediator):
         external_api,
         market_start_time,
         data_adapter=None,
+        container=None,
         bank=5000,
         data=None,
         models=None,
         orders=None,
+        exit_on_close=True,
+        latency=None,
+        runners=None,
+        transformer=None,
     ):
 
         self.__market_id = market_id
+        self.__exit_on_close = exit_on_close
+        self.__closed = False
 
         self.external_api: Colleague = external_api
 
+        self.runners = runners or RunnerHandler()
+
         adapter = data_adapter or ExternalAPIMarketRecordAdapter(
             market_start_time=market_start_time
         )
         self.data: Colleague = data or DataHandler(
             mediator=self,
             adapter=adapter,
-            container=DataContainer(),
+            container=container or DataContainer(),
+            transformer=transformer,
+            runners=self.runners,
         )
 
         self.models: Colleague = models or ModelHandler(
-            mediator=self, wls_model=WeightedLinearRegression()
+            mediator=self,
+            wls_model=WeightedLinearRegression(incremental=True),
         )
 
-        self.orders: Colleague = orders or OrdersHandler(mediator=self, bank=bank)
+        self.orders: Colleague = orders or OrdersHandler(
+            mediator=self, bank=bank, runners=self.runners
+        )
 
         self.__recipients = {
             "external data fetched": self.data.process_data,
@@ -57,6 +72,14 @@ class MarketHandler(Mediator):
             "finished processing": self.__finished,
         }
 
+        self.latency = latency
+        if self.latency:
+            self.latency.set_market_id(market_id)
+            self.__recipients = {
+                event: self.latency.wrap(event=event, recipient=recipient)
+                for event, recipient in self.__recipients.items()
+            }
+
     def run(self):
         return self.external_api.get_market()
 
@@ -69,6 +92,9 @@ class MarketHandler(Mediator):
     def get_orders(self):
         return self.orders.get_orders()
 
+    def is_closed(self):
+        return self.__closed
+
     def __delegate_posted_orders(self, data):
         successful_orders = self.orders.get_successful_orders(
             response=data.get("response"), orders=data.get("orders")
@@ -83,4 +109,9 @@ class MarketHandler(Mediator):
         return False
 
     def __exit(self, data):  # pylint: disable=unused-argument
-        die(0)
+        self.__closed = True
+        if self.latency:
+            self.latency.close()
+        if self.__exit_on_close:
+            die(0)
+        return False
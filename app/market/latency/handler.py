@@ -0,0 +1,151 @@
+from math import floor, log2
+
+from infrastructure.built_in.adapter.json_utils import write_json_to
+from infrastructure.built_in.adapter.os_utils import (
+    get_file_path,
+    make_directory_if_required,
+)
+from infrastructure.built_in.adapter.time_utils import (
+    get_cpu_time,
+    get_elapsed_cpu_time,
+    get_elapsed_time,
+    get_time,
+)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets_per_doubling=16):
+        self.__buckets_per_doubling = buckets_per_doubling
+        self.__buckets = {}
+        self.__non_positive_count = 0
+        self.__count = 0
+        self.__total = 0.0
+        self.__minimum = None
+        self.__maximum = None
+
+    def add(self, value):
+        self.__count += 1
+        self.__total += value
+        if self.__minimum is None or value < self.__minimum:
+            self.__minimum = value
+        if self.__maximum is None or value > self.__maximum:
+            self.__maximum = value
+        if value <= 0:
+            # a cost below the resolution of the clock has no log bucket
+            self.__non_positive_count += 1
+            return
+        bucket = self.__get_bucket(value)
+        self.__buckets[bucket] = self.__buckets.get(bucket, 0) + 1
+
+    def get_count(self):
+        return self.__count
+
+    def get_percentile(self, percentile):
+        if not self.__count:
+            return None
+        required = (percentile / 100) * self.__count
+        cumulative = self.__non_positive_count
+        if cumulative >= required:
+            return self.__minimum
+        for bucket in sorted(self.__buckets):
+            cumulative += self.__buckets.get(bucket)
+            if cumulative >= required:
+                return min(
+                    max(self.__get_upper_bound(bucket), self.__minimum), self.__maximum
+                )
+        return self.__maximum
+
+    def get_summary(self):
+        return {
+            "count": self.__count,
+            "total": self.__total,
+            "mean": (self.__total / self.__count) if self.__count else None,
+            "min": self.__minimum,
+            "max": self.__maximum,
+            "p50": self.get_percentile(50),
+            "p95": self.get_percentile(95),
+            "p99": self.get_percentile(99),
+        }
+
+    def __get_bucket(self, value):
+        # log-linear buckets keep the relative error of every percentile below
+        # 2 ** (1 / buckets_per_doubling) whatever the range of the values
+        return floor(log2(value) * self.__buckets_per_doubling)
+
+    def __get_upper_bound(self, bucket):
+        return 2 ** ((bucket + 1) / self.__buckets_per_doubling)
+
+
+class LatencyHandler:
+    def __init__(self, market_id=None, directory=None):
+        self.__market_id = market_id
+        self.__directory = directory
+        self.__histograms = {}
+        self.__children = []
+        self.__closed = False
+
+    def set_market_id(self, market_id):
+        self.__market_id = market_id
+
+    def get_market_id(self):
+        return self.__market_id
+
+    def wrap(self, event, recipient):
+        histograms = self.__histograms.setdefault(
+            event, {"wall": LatencyHistogram(), "cpu": LatencyHistogram()}
+        )
+
+        def timed_recipient(data):
+            self.__children.append([0.0, 0.0])
+            wall_start = get_time()
+            cpu_start = get_cpu_time()
+            try:
+                return recipient(data)
+            finally:
+                wall = get_elapsed_time(wall_start)
+                cpu = get_elapsed_cpu_time(cpu_start)
+                child_wall, child_cpu = self.__children.pop()
+                # the mediator dispatches the next hop from inside the current
+                # one so only the time spent outside of the nested hops is kept
+                histograms.get("wall").add(wall - child_wall)
+                histograms.get("cpu").add(cpu - child_cpu)
+                if self.__children:
+                    self.__children[-1][0] += wall
+                    self.__children[-1][1] += cpu
+                elif self.__closed:
+                    self.__closed = False
+                    self.dump()
+
+        return timed_recipient
+
+    def get_summary(self):
+        return {
+            "market_id": self.__market_id,
+            "events": {
+                event: {
+                    "wall": histograms.get("wall").get_summary(),
+                    "cpu": histograms.get("cpu").get_summary(),
+                }
+                for event, histograms in self.__histograms.items()
+                if histograms.get("wall").get_count()
+            },
+        }
+
+    def close(self):
+        # the market closes from inside the nested hops, so the latencies are
+        # dumped once the outermost hop has returned and been timed
+        if self.__children:
+            self.__closed = True
+        else:
+            self.dump()
+
+    def dump(self):
+        summary = self.get_summary()
+        if self.__directory:
+            make_directory_if_required(self.__directory)
+            path = get_file_path(
+                directory=self.__directory, file=f"{self.__market_id}.latency.json"
+            )
+            with open(path, "w", encoding="utf-8") as file:
+                write_json_to(file=file, data=summary)
+        return summary
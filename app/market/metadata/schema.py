@@ -0,0 +1,89 @@
+from app.market.metadata.handler import MetadataHandler
+from app.singleton import Singleton
+
+
+class FeatureSchema(metaclass=Singleton):
+    # every runner variable is given a fixed slot once for the process, so the
+    # stages look up a runner's columns by slot rather than building the names
+    # of the columns for every runner on every tick
+    def __init__(self):
+        metadata = MetadataHandler()
+        commission_suffix = metadata.get_minus_commission_suffix()
+
+        required_variables = tuple(metadata.get_required_variables())
+        back_prices = tuple(metadata.get_back_prices())
+        compositional_variables = {
+            name: (
+                "compositional_" + name + "_probability",
+                "compositional_" + name + "_back_price",
+            )
+            for name in ["sp", "ex_average"]
+        }
+
+        self.__runner_variables = (
+            required_variables
+            + tuple(price + commission_suffix for price in back_prices)
+            + ("combined_back_size",)
+            + sum(compositional_variables.values(), ())
+        )
+        slots = {
+            variable: slot for slot, variable in enumerate(self.__runner_variables)
+        }
+
+        self.__slots = slots
+        self.__required_slots = tuple(
+            (variable, slots[variable]) for variable in required_variables
+        )
+        self.__minus_commission_slots = tuple(
+            (price, slots[price + commission_suffix]) for price in back_prices
+        )
+        self.__compositional_slots = {
+            name: tuple(slots[variable] for variable in variables)
+            for name, variables in compositional_variables.items()
+        }
+        self.__back_sizes = tuple(metadata.get_back_sizes())
+
+        self.__index_name = metadata.get_index_name()
+        self.__index_feature = self.__index_name + metadata.get_time_series_suffix()
+        self.__point_in_time_features = tuple(
+            (variable + metadata.get_point_in_time_suffix(), slots[variable])
+            for variable in metadata.get_point_in_time_model_variables()
+        )
+        self.__time_series_features = tuple(
+            (variable + metadata.get_time_series_suffix(), slots[variable])
+            for variable in metadata.get_time_series_model_variables()
+        )
+
+    def get_slot(self, variable):
+        return self.__slots[variable]
+
+    def get_runner_variables(self):
+        return self.__runner_variables
+
+    def get_required_slots(self):
+        return self.__required_slots
+
+    def get_minus_commission_slots(self):
+        return self.__minus_commission_slots
+
+    def get_compositional_slots(self, name):
+        return self.__compositional_slots[name]
+
+    def get_back_sizes(self):
+        return self.__back_sizes
+
+    def get_index_name(self):
+        return self.__index_name
+
+    def get_index_feature(self):
+        return self.__index_feature
+
+    def get_point_in_time_features(self):
+        return self.__point_in_time_features
+
+    def get_time_series_features(self):
+        return self.__time_series_features
+
+    def make_runner_columns(self, runner_id):
+        # the names of a runner's columns in the container, in slot order
+        return tuple((variable, runner_id) for variable in self.__runner_variables)
@@ -1,24 +1,48 @@
 from app.colleague import Colleague
 
-from infrastructure.third_party.adapter.numpy_utils import calculate_log, not_a_number
-from infrastructure.built_in.adapter.copy_utils import make_copy
+from infrastructure.third_party.adapter.numpy_utils import (
+    calculate_log,
+    calculate_log_returns,
+    not_a_number,
+    stack_arrays,
+)
 
 
 class ModelHandler(Colleague):
-    def __init__(self, mediator, wls_model, event_country="AU"):
+    def __init__(
+        self,
+        mediator,
+        wls_model,
+        event_country="AU",
+        batch_wls_model=None,
+        thresholds=None,
+    ):
         self.__event_country = event_country
+        self.__thresholds = dict(self.get_default_thresholds(), **(thresholds or {}))
         self.wls_model = wls_model
+        self.batch_wls_model = batch_wls_model
         Colleague.__init__(self, mediator=mediator)
         self.__market_back_size = None
+        self.__wlr_criteria = None
+        self.__observations = {}
+
+    @staticmethod
+    def get_default_thresholds():
+        return dict(ModelHandler.__default_thresholds)
 
     def run_models(self, items):
 
         self.__market_back_size = self.__get_market_back_size(items=items)
+        self.__wlr_criteria = (
+            self._meets_wlr_criteria_batch(items=items)
+            if self.batch_wls_model and items
+            else None
+        )
 
         results = []
-        for item in items:
+        for index, item in enumerate(items):
             if (
-                self._meets_wlr_criteria(item=item)
+                self.__meets_wlr_criteria(item=item, index=index)
                 and self._meets_wlr_threshold(item=item)
                 and self._has_overlay(
                     item=item, probability="compositional_sp_probability_pit"
@@ -94,48 +118,103 @@ class ModelHandler(Colleague):
 
     def _meets_wlr_criteria(self, item):
 
-        y = self._get_log_returns(y=item.get("compositional_sp_back_price_ts"))
+        if self.wls_model.is_incremental():
+            self.__add_new_observations(item=item)
+        else:
+            y = self._get_log_returns(y=item.get("compositional_sp_back_price_ts"))
 
-        self.wls_model.run(
-            y=y,
-            x=item.get("extract_time_ts"),
-            weights=item.get("combined_back_size_ts"),
-        )
+            self.wls_model.run(
+                y=y,
+                x=item.get("extract_time_ts"),
+                weights=item.get("combined_back_size_ts"),
+                key=item.get("id"),
+            )
 
         alpha = self.wls_model.get_alpha()
         Beta = self.wls_model.get_Beta()
 
-        return Beta < 0 and alpha < -0.00001
+        return Beta < 0 and alpha < self.__thresholds.get("alpha")
+
+    def __add_new_observations(self, item):
+        # the series only ever grow, so only the log returns of the prices added
+        # since the last tick are made, from the last price of the runner kept
+        runner_id = item.get("id")
+        prices = item.get("compositional_sp_back_price_ts")
+        observations = self.__observations.get(runner_id)
+        if observations is None or observations.get("count") > len(prices):
+            self.wls_model.reset(key=runner_id)
+            observations = {"count": 0, "price": not_a_number()}
+            self.__observations[runner_id] = observations
+
+        start = observations.get("count")
+        y = []
+        previous_price = observations.get("price")
+        for price in prices[start:]:
+            y.append(calculate_log(price / previous_price))
+            previous_price = price
+        observations["count"] = len(prices)
+        observations["price"] = previous_price
+
+        self.wls_model.add(
+            y=y,
+            x=item.get("extract_time_ts")[start:],
+            weights=item.get("combined_back_size_ts")[start:],
+            key=runner_id,
+        )
+
+    def _meets_wlr_criteria_batch(self, items):
+
+        y = calculate_log_returns(
+            stack_arrays([item.get("compositional_sp_back_price_ts") for item in items])
+        )
+
+        self.batch_wls_model.run(
+            y=y,
+            x=items[0].get("extract_time_ts"),
+            weights=stack_arrays([item.get("combined_back_size_ts") for item in items]),
+        )
+
+        alpha = self.batch_wls_model.get_alpha()
+        Beta = self.batch_wls_model.get_Beta()
+
+        return (Beta < 0) & (alpha < self.__thresholds.get("alpha"))
+
+    def __meets_wlr_criteria(self, item, index):
+        return (
+            self.__wlr_criteria[index]
+            if self.__wlr_criteria is not None
+            else self._meets_wlr_criteria(item=item)
+        )
 
     def _meets_wlr_threshold(self, item):
         back_size = item.get("combined_back_size_pit")
         return (
-            back_size >= 5000 and self.__event_country != "GB"
-        ) or back_size >= 30000
+            back_size >= self.__thresholds.get("wlr_back_size")
+            and self.__event_country != "GB"
+        ) or back_size >= self.__thresholds.get("wlr_gb_back_size")
 
     def _meets_high_back_size_threshold(self, item):
         back_size = item.get("combined_back_size_pit")
         return (
-            item.get("ex_offered_back_price_pit") > 2
-            and (back_size / self.__market_back_size) >= 0.6
-            and back_size >= 20000
+            item.get("ex_offered_back_price_pit") > self.__thresholds.get("back_price")
+            and (back_size / self.__market_back_size)
+            >= self.__thresholds.get("back_size_share")
+            and back_size >= self.__thresholds.get("high_back_size")
         )
 
     def _meets_low_back_size_threshold(self, item):
         back_size = item.get("combined_back_size_pit")
         offered_back_price = item.get("ex_offered_back_price_pit")
         return (
-            offered_back_price <= 2
+            offered_back_price <= self.__thresholds.get("back_price")
             and (back_size / self.__market_back_size)
-            >= max([0.6, (1 / offered_back_price)])
-            and back_size >= 10000
+            >= max([self.__thresholds.get("back_size_share"), (1 / offered_back_price)])
+            and back_size >= self.__thresholds.get("low_back_size")
         )
 
     def _get_log_returns(self, y):
-        data = make_copy(y)
-        shifted_list = make_copy(data)
-        shifted_list.pop()
-        shifted_list.insert(0, not_a_number())
+        data = list(y)
+        shifted_list = [not_a_number()] + data[:-1]
         return [
             calculate_log(point_in_time / previous_point_in_time)
             for point_in_time, previous_point_in_time in zip(data, shifted_list)
@@ -146,3 +225,14 @@ class ModelHandler(Colleague):
         for item in items:
             market_back_size += item.get("combined_back_size_pit")
         return market_back_size
+
+    # the values the models have been tuned to, see app/backtest/sweep
+    __default_thresholds = {
+        "wlr_back_size": 5000,
+        "wlr_gb_back_size": 30000,
+        "alpha": -0.00001,
+        "back_price": 2,
+        "back_size_share": 0.6,
+        "high_back_size": 20000,
+        "low_back_size": 10000,
+    }
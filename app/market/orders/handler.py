@@ -1,17 +1,43 @@
 from app.colleague import Colleague
+from app.market.runner.handler import RunnerHandler
 
 
 class OrdersHandler(Colleague):
-    def __init__(self, mediator, bank=5000):
+    def __init__(self, mediator, bank=5000, runners=None, sizing=None):
         ## probably going to have to call the exchange to get this number need to think about it
         self.__bank = bank
+        self.__sizing = dict(self.get_default_sizing(), **(sizing or {}))
         self.__existing_orders = []
+        self.__runners = runners or RunnerHandler()
+        self.__existing_risk = {}
+        self.__total_existing_risk = self.__make_risk_product()
         Colleague.__init__(self, mediator=mediator)
         self.__reduced_risk_percentage = None
 
+    @staticmethod
+    def get_default_sizing():
+        return {"kelly_fraction": 1, "cap": 0.05}
+
     def prevent_reorder(self, orders):
         valid_orders = list(filter(self.__is_valid_order, orders))
         self.__existing_orders.extend(valid_orders)
+        for order in valid_orders:
+            self.__add_existing_order(order=order)
+
+    def __add_existing_order(self, order):
+        # the existing orders are indexed by runner, along with the running
+        # product of (1 - risk) for each runner and for all of them together
+        self.__runners.set_ordered(order.get("id"))
+        risk_percentage = order.get("risk_percentage")
+        self.__add_risk(
+            product=self.__existing_risk.setdefault(
+                order.get("id"), self.__make_risk_product()
+            ),
+            risk_percentage=risk_percentage,
+        )
+        self.__add_risk(
+            product=self.__total_existing_risk, risk_percentage=risk_percentage
+        )
 
     def get_orders(self):
         return self.__existing_orders
@@ -103,7 +129,7 @@ class OrdersHandler(Colleague):
             item.get("risk_percentage")
             and item.get("risk_percentage") > 0
             and item.get("min_size") / self.__bank < item.get("risk_percentage")
-            and item.get("id") not in self.get_existing_order_ids()
+            and not self.__runners.has_order(item.get("id"))
         )
 
     def _calc_reduced_risk_percentage(self, initial_risk_percentage):
@@ -113,19 +139,50 @@ class OrdersHandler(Colleague):
             for item in initial_risk_percentage
         }
 
-        risk_percentage = (
-            initial_risk_percentage + self._get_existing_order_risk_percentages()
-        )
-
         if len(initial_risk_percentage) > 1:
+            # each risk is reduced by (1 - risk) of every other runner, which is
+            # the product over all runners divided by the product for its own
+            total = dict(self.__total_existing_risk)
+            runners = {}
+            for item in initial_risk_percentage:
+                item_id = item.get("id")
+                if item_id not in runners:
+                    runners[item_id] = dict(
+                        self.__existing_risk.get(item_id) or self.__make_risk_product()
+                    )
+                self.__add_risk(
+                    product=runners[item_id],
+                    risk_percentage=item.get("risk_percentage"),
+                )
+                self.__add_risk(
+                    product=total, risk_percentage=item.get("risk_percentage")
+                )
             for item_id in reduced_risk_percentage.keys():
-                for another_item in risk_percentage:
-                    if item_id != another_item.get("id"):
-                        reduced_risk_percentage[item_id] *= 1 - (
-                            another_item.get("risk_percentage") or 0
-                        )
+                reduced_risk_percentage[item_id] *= self.__exclude_risk(
+                    total=total, product=runners[item_id]
+                )
         return reduced_risk_percentage
 
+    @staticmethod
+    def __make_risk_product():
+        # a zero factor is counted rather than multiplied in so that it can
+        # be divided back out
+        return {"product": 1, "zeros": 0}
+
+    @staticmethod
+    def __add_risk(product, risk_percentage):
+        factor = 1 - (risk_percentage or 0)
+        if factor:
+            product["product"] *= factor
+        else:
+            product["zeros"] += 1
+
+    @staticmethod
+    def __exclude_risk(total, product):
+        if total.get("zeros") > product.get("zeros"):
+            return 0
+        return total.get("product") / product.get("product")
+
     def __prepare_order(self, item):
 
         item["risk_percentage"] = self.__reduced_risk_percentage[item.get("id")]
@@ -135,18 +192,11 @@ class OrdersHandler(Colleague):
     def get_existing_order_ids(self):
         return [order.get("id") for order in self.get_orders()]
 
-    def _get_existing_order_risk_percentages(self):
-        return list(
-            map(
-                lambda order: {
-                    "id": order.get("id"),
-                    "risk_percentage": order.get("risk_percentage"),
-                },
-                self.get_orders(),
-            )
-        )
-
-    def _calc_risk_percentage(self, probability, price, kelly_fraction=1, cap=0.05):
+    def _calc_risk_percentage(self, probability, price, kelly_fraction=None, cap=None):
+        if kelly_fraction is None:
+            kelly_fraction = self.__sizing.get("kelly_fraction")
+        if cap is None:
+            cap = self.__sizing.get("cap")
         if self.__can_calculate_risk(probability=probability, price=price):
             risk_percentage = min(
                 max(
@@ -0,0 +1,59 @@
+class RunnerHandler:
+    def __init__(self):
+        self.__ids = set()
+        self.__sorted_ids = []
+        self.__fixed_probabilities = {}
+        self.__fixed_probability_total = 0
+        self.__removed_ids = set()
+        self.__ordered_ids = set()
+
+    def add_runners(self, items):
+        new_ids = False
+        for item in items:
+            runner_id = item.get("id")
+            if not isinstance(runner_id, int):
+                continue
+            if runner_id not in self.__ids:
+                self.__ids.add(runner_id)
+                new_ids = True
+            if item.get("removal_date"):
+                self.__removed_ids.add(runner_id)
+        if new_ids:
+            # new runners are rare, so the ordered ids are only rebuilt then
+            self.__sorted_ids = sorted(self.__ids)
+
+    def get_ids(self):
+        return list(self.__sorted_ids)
+
+    def get_active_ids(self):
+        return [
+            runner_id
+            for runner_id in self.__sorted_ids
+            if runner_id not in self.__fixed_probabilities
+            and runner_id not in self.__removed_ids
+        ]
+
+    def set_probability(self, runner_id, probability):
+        self.__fixed_probabilities[runner_id] = probability
+        self.__fixed_probability_total = sum(self.__fixed_probabilities.values())
+
+    def get_fixed_probabilities(self):
+        return self.__fixed_probabilities
+
+    def get_fixed_probability_ids(self):
+        return list(self.__fixed_probabilities.keys())
+
+    def get_fixed_probability_total(self):
+        return self.__fixed_probability_total
+
+    def has_fixed_probability(self, runner_id):
+        return runner_id in self.__fixed_probabilities
+
+    def is_removed(self, runner_id):
+        return runner_id in self.__removed_ids
+
+    def set_ordered(self, runner_id):
+        self.__ordered_ids.add(runner_id)
+
+    def has_order(self, runner_id):
+        return runner_id in self.__ordered_ids
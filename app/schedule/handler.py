@@ -12,17 +12,20 @@ class ScheduleHandler:
     def get_schedule(self):
         return self.external_api.get_schedule("7", DateTime.utc_5_minutes_from_now())
 
-    def create_new_markets(self, schedule):
+    def create_new_markets(self, schedule, exit_on_close=True):
         scheduled_markets = []
         for market in schedule:
             market_id = float(market.get("marketId"))
             external_api = ExternalAPIMarketHandler(
-                market_id=market_id, headers=self.external_api.get_headers()
+                market_id=market_id,
+                headers=self.external_api.get_headers(),
+                connection_pool=self.external_api.get_connection_pool(),
             )
             market_handler = MarketHandler(
                 market_id=market_id,
                 market_start_time=market.get("marketStartTime"),
                 external_api=external_api,
+                exit_on_close=exit_on_close,
             )
             external_api.set_mediator(mediator=market_handler)
             scheduled_markets.append(market_handler)
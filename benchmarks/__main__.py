@@ -0,0 +1,74 @@
+from argparse import ArgumentParser
+
+from benchmarks.generator import MarketGenerator
+from benchmarks.handler import BenchmarkHandler
+from benchmarks.report import compare_reports, read_report, write_report
+
+from infrastructure.third_party.adapter.columnar_data_container import (
+    ColumnarDataContainer,
+)
+
+
+def main(args=None):
+    parser = ArgumentParser(description="time every stage of the market pipeline")
+    parser.add_argument("--runners", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--trade-frequency", type=float, default=0.5)
+    parser.add_argument("--duration", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--columnar", action="store_true")
+    parser.add_argument("--output", default="benchmark.json")
+    parser.add_argument("--baseline", default=None)
+    parser.add_argument("--tolerance", type=float, default=0.1)
+    options = parser.parse_args(args)
+
+    generator = MarketGenerator(
+        runners=options.runners,
+        depth=options.depth,
+        trade_frequency=options.trade_frequency,
+        duration=options.duration,
+        seed=options.seed,
+    )
+    handler = BenchmarkHandler(
+        generator=generator,
+        repeat=options.repeat,
+        container=ColumnarDataContainer() if options.columnar else None,
+    )
+    report = handler.run()
+
+    if options.baseline:
+        report["comparison"] = compare_reports(
+            report=report,
+            baseline=read_report(options.baseline),
+            tolerance=options.tolerance,
+        )
+
+    write_report(report=report, path=options.output)
+
+    for stage, result in report.get("stages").items():
+        comparison = (report.get("comparison") or {}).get(stage) or {}
+        print(
+            "%-28s calls %6d mean %10.6fs p95 %10.6fs%s"
+            % (
+                stage,
+                result.get("calls"),
+                result.get("mean_seconds") or 0,
+                result.get("p95_seconds") or 0,
+                (
+                    " x%.2f%s"
+                    % (
+                        comparison.get("ratio"),
+                        " REGRESSION" if comparison.get("regression") else "",
+                    )
+                    if comparison
+                    else ""
+                ),
+            )
+        )
+
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+from app.colleague import Colleague
+from app.market.interface import ExternalAPIMarketInterface
+
+
+class ReplayExternalAPI(ExternalAPIMarketInterface, Colleague):
+    def __init__(self, market_books, mediator=None):
+        self.__market_books = iter(market_books)
+        self.__exhausted = False
+        if mediator:
+            Colleague.__init__(self, mediator=mediator)
+
+    def is_exhausted(self):
+        return self.__exhausted
+
+    def get_market(self):
+        data = next(self.__market_books, None)
+        if data is None:
+            self.__exhausted = True
+            return None
+        return self._mediator.notify(event="external data fetched", data=data)
+
+    def post_order(self, orders):
+        response = [
+            {"instruction": {"selectionId": order.get("id")}, "status": "SUCCESS"}
+            for order in orders
+        ]
+        return self._mediator.notify(
+            data={"response": response, "orders": orders}, event="orders posted"
+        )
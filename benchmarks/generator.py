@@ -0,0 +1,265 @@
+from random import Random
+
+from app.market.data.utils import get_ticks
+
+
+class MarketGenerator:
+    __market_time = "2019-09-30T10:42:00.000Z"
+    __market_epoch = 1569840120
+
+    def __init__(
+        self,
+        runners=10,
+        depth=3,
+        trade_frequency=0.5,
+        duration=300,
+        seed=0,
+        market_id="1.999999999",
+    ):
+        self.__runners = runners
+        self.__depth = depth
+        self.__trade_frequency = trade_frequency
+        self.__duration = duration
+        self.__seed = seed
+        self.__market_id = market_id
+        self.__ticks = self.get_ticks()
+        self.__seconds = None
+
+    def get_parameters(self):
+        return {
+            "runners": self.__runners,
+            "depth": self.__depth,
+            "trade_frequency": self.__trade_frequency,
+            "duration": self.__duration,
+            "seed": self.__seed,
+        }
+
+    def get_market_id(self):
+        return self.__market_id
+
+    def get_market_start_time(self):
+        return self.__market_time
+
+    def get_runner_ids(self):
+        return [1000 + index for index in range(self.__runners)]
+
+    def get_winner_id(self):
+        return self.__get_seconds()[-1].get("winner")
+
+    def get_market_books(self):
+        return [self.__make_market_book(second) for second in self.__get_seconds()]
+
+    def get_stream_records(self):
+        seconds = self.__get_seconds()
+        records = [self.__make_definition_record()]
+        previous = None
+        for second in seconds:
+            records.append(self.__make_stream_record(second, previous))
+            previous = second
+        records.append(self.__make_settled_record(seconds[-1]))
+        return records
+
+    def get_items_definition(self):
+        return self.__make_runners_definition(winner=None)
+
+    @staticmethod
+    def get_ticks():
+        return get_ticks()
+
+    def __get_seconds(self):
+        if self.__seconds is None:
+            self.__seconds = self.__simulate()
+        return self.__seconds
+
+    def __simulate(self):
+        random = Random(self.__seed)
+        strengths = {
+            runner_id: random.uniform(0.5, 5) for runner_id in self.get_runner_ids()
+        }
+        traded = {runner_id: {} for runner_id in self.get_runner_ids()}
+        sp_back = {runner_id: {} for runner_id in self.get_runner_ids()}
+        sp_lay = {runner_id: {} for runner_id in self.get_runner_ids()}
+
+        seconds = []
+        for extract_time in range(-self.__duration, 2):
+            for runner_id in strengths:
+                strengths[runner_id] *= random.uniform(0.97, 1.03)
+            total = sum(strengths.values())
+
+            runners = {}
+            for runner_id, strength in strengths.items():
+                price = total / strength
+                back_index = self.__get_tick_index(price)
+                if random.random() < self.__trade_frequency:
+                    trade_price = self.__ticks[back_index]
+                    traded[runner_id][trade_price] = round(
+                        traded[runner_id].get(trade_price, 0) + random.uniform(2, 500),
+                        2,
+                    )
+                    sp_back[runner_id][1.01] = round(
+                        sp_back[runner_id].get(1.01, 0) + random.uniform(0, 50), 2
+                    )
+                    sp_lay[runner_id][1000.0] = round(
+                        sp_lay[runner_id].get(1000.0, 0) + random.uniform(0, 20), 2
+                    )
+                runners[runner_id] = {
+                    "atb": self.__make_ladder(random, back_index, -1),
+                    "atl": self.__make_ladder(random, back_index + 1, 1),
+                    "trd": dict(traded[runner_id]),
+                    "spb": dict(sp_back[runner_id]),
+                    "spl": dict(sp_lay[runner_id]),
+                    "spn": round(price, 4),
+                }
+
+            seconds.append(
+                {
+                    "extract_time": extract_time,
+                    "in_play": extract_time >= 0,
+                    "runners": runners,
+                    "winner": max(strengths, key=strengths.get),
+                }
+            )
+        return seconds
+
+    def __get_tick_index(self, price):
+        for index, tick in enumerate(self.__ticks):
+            if tick >= price:
+                return max(min(index, len(self.__ticks) - 2), 0)
+        return len(self.__ticks) - 2
+
+    def __make_ladder(self, random, start, direction):
+        ladder = {}
+        for level in range(self.__depth):
+            index = start + (level * direction)
+            if 0 <= index < len(self.__ticks):
+                ladder[self.__ticks[index]] = round(random.uniform(2, 800), 2)
+        return ladder
+
+    def __make_market_book(self, second):
+        return {
+            "marketId": self.__market_id,
+            "inplay": second.get("in_play"),
+            "status": "OPEN",
+            "process_time": self.__get_publish_time(second.get("extract_time")),
+            "runners": [
+                self.__make_runner_book(runner_id, runner)
+                for runner_id, runner in second.get("runners").items()
+            ],
+        }
+
+    def __make_runner_book(self, runner_id, runner):
+        return {
+            "selectionId": runner_id,
+            "status": "ACTIVE",
+            "sp": {
+                "nearPrice": runner.get("spn"),
+                "backStakeTaken": self.__make_price_sizes(runner.get("spb")),
+                "layLiabilityTaken": self.__make_price_sizes(runner.get("spl")),
+            },
+            "ex": {
+                "availableToBack": self.__make_price_sizes(
+                    runner.get("atb"), reverse=True
+                ),
+                "availableToLay": self.__make_price_sizes(runner.get("atl")),
+                "tradedVolume": self.__make_price_sizes(runner.get("trd")),
+            },
+        }
+
+    @staticmethod
+    def __make_price_sizes(ladder, reverse=False):
+        return [
+            {"price": price, "size": size}
+            for price, size in sorted(ladder.items(), reverse=reverse)
+        ]
+
+    def __make_definition_record(self):
+        return {
+            "op": "mcm",
+            "pt": self.__get_publish_time(-(self.__duration + 60)),
+            "mc": [
+                {
+                    "id": self.__market_id,
+                    "marketDefinition": self.__make_market_definition(
+                        in_play=False, winner=None
+                    ),
+                    "rc": [],
+                }
+            ],
+        }
+
+    def __make_stream_record(self, second, previous):
+        previous_runners = previous.get("runners") if previous else {}
+        changes = []
+        for runner_id, runner in second.get("runners").items():
+            previous_runner = previous_runners.get(runner_id) or {}
+            change = {"id": runner_id}
+            for attribute in ["atb", "atl", "trd", "spb", "spl"]:
+                deltas = self.__make_deltas(
+                    runner.get(attribute), previous_runner.get(attribute) or {}
+                )
+                if deltas:
+                    change[attribute] = deltas
+            if runner.get("spn") != previous_runner.get("spn"):
+                change["spn"] = runner.get("spn")
+            changes.append(change)
+
+        market_change = {"id": self.__market_id, "rc": changes}
+        if second.get("in_play") and not (previous or {}).get("in_play"):
+            market_change["marketDefinition"] = self.__make_market_definition(
+                in_play=True, winner=None
+            )
+        return {
+            "op": "mcm",
+            "pt": self.__get_publish_time(second.get("extract_time")),
+            "mc": [market_change],
+        }
+
+    def __make_settled_record(self, second):
+        return {
+            "op": "mcm",
+            "pt": self.__get_publish_time(second.get("extract_time") + 60),
+            "mc": [
+                {
+                    "id": self.__market_id,
+                    "marketDefinition": self.__make_market_definition(
+                        in_play=True, winner=second.get("winner")
+                    ),
+                    "rc": [],
+                }
+            ],
+        }
+
+    @staticmethod
+    def __make_deltas(ladder, previous_ladder):
+        deltas = [
+            [price, size]
+            for price, size in ladder.items()
+            if previous_ladder.get(price) != size
+        ]
+        deltas.extend([price, 0] for price in previous_ladder if price not in ladder)
+        return deltas
+
+    def __make_market_definition(self, in_play, winner):
+        return {
+            "marketType": "WIN",
+            "marketTime": self.__market_time,
+            "inPlay": in_play,
+            "runners": self.__make_runners_definition(winner=winner),
+        }
+
+    def __make_runners_definition(self, winner):
+        return [
+            {
+                "id": runner_id,
+                "sortPriority": index + 1,
+                "status": (
+                    "ACTIVE"
+                    if winner is None
+                    else ("WINNER" if runner_id == winner else "LOSER")
+                ),
+            }
+            for index, runner_id in enumerate(self.get_runner_ids())
+        ]
+
+    def __get_publish_time(self, extract_time):
+        return ((self.__market_epoch + extract_time) * 1000) + 250
@@ -0,0 +1,191 @@
+from app.market.data.handler import DataHandler
+from app.market.data.transform.handler import TransformHandler
+from app.market.handler import MarketHandler
+from app.market.model.handler import ModelHandler
+from app.market.orders.handler import OrdersHandler
+
+from benchmarks.external_api import ReplayExternalAPI
+from benchmarks.mediator import RecordingMediator
+
+from infrastructure.built_in.adapter.copy_utils import make_copy
+from infrastructure.built_in.adapter.time_utils import get_elapsed_time, get_time
+from infrastructure.external_api.market.record.adapter import (
+    ExternalAPIMarketRecordAdapter,
+)
+from infrastructure.external_api.market.record.item.adapter import ItemAdapter
+from infrastructure.storage.historical.download.file.data.handler import (
+    HistoricalDownloadFileDataHandler,
+)
+from infrastructure.storage.historical.download.file.record.adapter import (
+    HistoricalDownloadFileRecordAdapter,
+)
+from infrastructure.third_party.adapter.data_container import DataContainer
+from infrastructure.third_party.adapter.stats_model import WeightedLinearRegression
+
+
+class BenchmarkHandler:
+    def __init__(self, generator, repeat=3, container=None):
+        self.__generator = generator
+        self.__repeat = repeat
+        self.__container = container or DataContainer()
+        self.__timings = {}
+        self.__market_books = generator.get_market_books()
+        self.__stream_records = generator.get_stream_records()
+        self.__market_start_time = generator.get_market_start_time()
+
+    def run(self):
+        self.__timings = {}
+        extracted_data = self.__benchmark_external_api_record_adapter()
+        self.__benchmark_item_adapter()
+        historical_data = self.__benchmark_historical_data_handler()
+        self.__benchmark_historical_record_adapter(data=historical_data)
+        self.__benchmark_transform_handler(extracted_data=extracted_data)
+        model_data = self.__benchmark_data_handler()
+        self.__benchmark_model_handler(model_data=model_data)
+        self.__benchmark_orders_handler(model_data=model_data)
+        self.__benchmark_market_handler()
+        return self.get_report()
+
+    def get_report(self):
+        return {
+            "parameters": dict(self.__generator.get_parameters(), repeat=self.__repeat),
+            "stages": {
+                stage: self._summarise(durations)
+                for stage, durations in self.__timings.items()
+            },
+        }
+
+    @staticmethod
+    def _summarise(durations):
+        ordered = sorted(durations)
+        count = len(ordered)
+        total = sum(ordered)
+        return {
+            "calls": count,
+            "total_seconds": total,
+            "mean_seconds": (total / count) if count else None,
+            "p50_seconds": BenchmarkHandler.__get_percentile(ordered, 50),
+            "p95_seconds": BenchmarkHandler.__get_percentile(ordered, 95),
+            "max_seconds": ordered[-1] if count else None,
+        }
+
+    @staticmethod
+    def __get_percentile(ordered, percentile):
+        if not ordered:
+            return None
+        index = min(
+            int(round((percentile / 100) * (len(ordered) - 1))), len(ordered) - 1
+        )
+        return ordered[index]
+
+    def __time(self, stage, function, *args):
+        start = get_time()
+        result = function(*args)
+        self.__timings.setdefault(stage, []).append(get_elapsed_time(start))
+        return result
+
+    def __benchmark_item_adapter(self):
+        runners = [
+            runner for book in self.__market_books for runner in book.get("runners")
+        ]
+        for _ in range(self.__repeat):
+            for runner in runners:
+                self.__time(
+                    "item_adapter", lambda: ItemAdapter(runner).get_adapted_data()
+                )
+
+    def __benchmark_external_api_record_adapter(self):
+        for _ in range(self.__repeat):
+            adapter = ExternalAPIMarketRecordAdapter(
+                market_start_time=self.__market_start_time
+            )
+            extracted_data = [
+                self.__time("external_api_record_adapter", adapter.convert, book)
+                for book in self.__market_books
+            ]
+        return extracted_data
+
+    def __benchmark_historical_data_handler(self):
+        for _ in range(self.__repeat):
+            handler = HistoricalDownloadFileDataHandler(
+                items=self.__generator.get_items_definition(),
+                market_start_time=self.__market_start_time,
+            )
+            historical_data = []
+            for record in self.__stream_records:
+                data = self.__time("historical_data_handler", handler.process, record)
+                if data:
+                    historical_data.append(data)
+        return historical_data
+
+    def __benchmark_historical_record_adapter(self, data):
+        for _ in range(self.__repeat):
+            adapter = HistoricalDownloadFileRecordAdapter()
+            for record in data:
+                self.__time("historical_record_adapter", adapter.convert, record)
+
+    def __benchmark_transform_handler(self, extracted_data):
+        for _ in range(self.__repeat):
+            handler = TransformHandler()
+            for record in make_copy(extracted_data):
+                self.__time("transform_handler", handler.process, record)
+
+    def __benchmark_data_handler(self):
+        for _ in range(self.__repeat):
+            mediator = RecordingMediator()
+            handler = DataHandler(
+                mediator=mediator,
+                adapter=ExternalAPIMarketRecordAdapter(
+                    market_start_time=self.__market_start_time
+                ),
+                container=self.__container,
+            )
+            for book in self.__market_books:
+                self.__time("data_handler", handler.process_data, book)
+        return mediator.get_data("data added to container")
+
+    def __benchmark_model_handler(self, model_data):
+        for _ in range(self.__repeat):
+            mediator = RecordingMediator()
+            handler = ModelHandler(
+                mediator=mediator,
+                wls_model=WeightedLinearRegression(incremental=True),
+            )
+            for items in make_copy(model_data):
+                self.__time("model_handler", handler.run_models, items)
+
+    def __benchmark_orders_handler(self, model_data):
+        # every runner is offered as a model result so that the timing does not
+        # depend on whether the synthetic market happens to meet the criteria
+        model_results = [
+            list(map(self.__make_model_result, items)) for items in model_data
+        ]
+        for _ in range(self.__repeat):
+            handler = OrdersHandler(mediator=RecordingMediator())
+            for items in make_copy(model_results):
+                self.__time("orders_handler", handler.get_new_orders, items)
+
+    @staticmethod
+    def __make_model_result(item):
+        return {
+            "id": item.get("id"),
+            "probability": item.get("compositional_sp_probability_pit"),
+            "type": "BUY",
+            "model_id": "SPMB",
+            "ex_price": item.get("ex_offered_back_price_pit"),
+            "returns_price": item.get("ex_offered_back_price_mc_pit"),
+        }
+
+    def __benchmark_market_handler(self):
+        for _ in range(self.__repeat):
+            external_api = ReplayExternalAPI(market_books=self.__market_books)
+            handler = MarketHandler(
+                market_id=self.__generator.get_market_id(),
+                external_api=external_api,
+                market_start_time=self.__market_start_time,
+                container=self.__container,
+                exit_on_close=False,
+            )
+            external_api.set_mediator(handler)
+            while not (external_api.is_exhausted() or handler.is_closed()):
+                self.__time("market_handler_tick", handler.run)
@@ -0,0 +1,14 @@
+from app.mediator import Mediator
+
+
+class RecordingMediator(Mediator):
+    def __init__(self):
+        self.__events = []
+
+    def notify(self, event, data=None):
+        self.__events.append({"event": event, "data": data})
+
+    def get_data(self, event):
+        return [
+            item.get("data") for item in self.__events if item.get("event") == event
+        ]
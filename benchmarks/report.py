@@ -0,0 +1,29 @@
+from infrastructure.built_in.adapter.json_utils import make_dict, write_json_to
+
+
+def write_report(report, path):
+    with open(path, "w", encoding="utf-8") as file:
+        write_json_to(file=file, data=report)
+    return path
+
+
+def read_report(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return make_dict(file.read())
+
+
+def compare_reports(report, baseline, tolerance=0.1):
+    baseline_stages = baseline.get("stages") or {}
+    comparison = {}
+    for stage, result in (report.get("stages") or {}).items():
+        baseline_result = baseline_stages.get(stage)
+        if not (baseline_result and baseline_result.get("mean_seconds")):
+            continue
+        ratio = result.get("mean_seconds") / baseline_result.get("mean_seconds")
+        comparison[stage] = {
+            "baseline_mean_seconds": baseline_result.get("mean_seconds"),
+            "mean_seconds": result.get("mean_seconds"),
+            "ratio": ratio,
+            "regression": ratio > 1 + tolerance,
+        }
+    return comparison
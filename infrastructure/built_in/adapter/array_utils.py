@@ -0,0 +1,5 @@
+from array import array
+
+
+def make_float_array(length):
+    return array("d", bytes(8 * length))
@@ -0,0 +1,26 @@
+from asyncio import create_task, gather, get_running_loop, run, sleep
+from concurrent.futures import ThreadPoolExecutor
+
+
+def make_thread_pool(threads=None):
+    return ThreadPoolExecutor(max_workers=threads)
+
+
+async def run_in_thread(pool, function, *args):
+    return await get_running_loop().run_in_executor(pool, function, *args)
+
+
+def start_task(coroutine):
+    return create_task(coroutine)
+
+
+async def wait_for_seconds(seconds):
+    await sleep(seconds)
+
+
+async def run_together(*coroutines):
+    return await gather(*coroutines)
+
+
+def run_coroutine(coroutine):
+    return run(coroutine)
@@ -0,0 +1,18 @@
+from hashlib import sha256
+from inspect import getsourcefile
+
+
+def hash_file(path, chunk_size=1 << 20):
+    digest = sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_source(objects):
+    digest = sha256()
+    for path in sorted({getsourcefile(obj) for obj in objects}):
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
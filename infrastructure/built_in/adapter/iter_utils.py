@@ -0,0 +1,15 @@
+from itertools import compress, count, islice, product
+from operator import ne
+
+
+def get_product(iterables):
+    return product(*iterables)
+
+
+def get_differences(first, second, first_start=0, second_start=0):
+    # the offsets from the starts at which the items of the two sequences
+    # differ, compared in pairs up to the end of the shorter one
+    return compress(
+        count(),
+        map(ne, islice(first, first_start, None), islice(second, second_start, None)),
+    )
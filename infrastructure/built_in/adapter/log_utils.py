@@ -0,0 +1,6 @@
+from logging import getLogger
+
+
+def log_exception(message, *args):
+    # with the traceback of the exception being handled
+    getLogger("betting").exception(message, *args)
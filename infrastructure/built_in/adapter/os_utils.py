@@ -1,5 +1,7 @@
-from os import environ, linesep, makedirs, remove, rmdir
-from os.path import exists, join, splitext
+from glob import glob
+from shutil import rmtree
+from os import environ, getpid, linesep, makedirs, remove, rename, rmdir
+from os.path import basename, dirname, exists, getsize, isdir, join, splitext
 
 
 def path_exists(path):
@@ -10,11 +12,28 @@ def get_file_path(directory, file):
     return join(directory, file)
 
 
+def get_file_size(path):
+    return getsize(path)
+
+
 def get_file_extension(path):
     extension = splitext(path)[1]
     return extension
 
 
+def remove_file_extension(file):
+    return splitext(file)[0]
+
+
+def split_path(path):
+    return dirname(path), basename(path)
+
+
+def get_matching_paths(path, extension=None):
+    pattern = join(path, f"*{extension or ''}") if isdir(path) else path
+    return sorted(glob(pattern))
+
+
 def get_newline():
     return linesep
 
@@ -31,12 +50,27 @@ def remove_directory(path):
     return __confirm_path_removed(path)
 
 
+def remove_tree(path):
+    if exists(path):
+        rmtree(path)
+    return __confirm_path_removed(path)
+
+
 def remove_file(path):
     if exists(path):
         remove(path)
     return __confirm_path_removed(path)
 
 
+def rename_path(source, destination):
+    rename(source, destination)
+    return destination
+
+
+def get_process_id():
+    return getpid()
+
+
 def get_environment_variable(variable):
     return environ.get(variable)
 
@@ -0,0 +1,10 @@
+from multiprocessing import Pool, cpu_count
+
+
+def get_processor_count():
+    return cpu_count()
+
+
+def map_in_processes(function, iterable, processes=None, chunksize=1):
+    with Pool(processes=processes) as pool:
+        yield from pool.imap_unordered(function, iterable, chunksize)
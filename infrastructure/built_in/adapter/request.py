@@ -1,10 +1,16 @@
+from threading import Lock
 from urllib.error import URLError
 from urllib.request import Request, urlopen
-from requests import post
+from requests import post, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
 from infrastructure.built_in.adapter.json_utils import make_dict
+from infrastructure.built_in.adapter.time_utils import get_time, get_elapsed_time
 
 
-def post_data(url, data=None, cert=None, headers=None):
+def post_data(url, data=None, cert=None, headers=None, pool=None):
+    if pool:
+        return pool.post_data(url=url, data=data, cert=cert, headers=headers)
     response = post(url, data=data, cert=cert, headers=headers)
     if __is_ok(response=response):
         data = _add_ok_status(response.json())
@@ -17,7 +23,9 @@ def __is_ok(response):
     return response.status_code == get_ok_status()
 
 
-def open_url(url, request, headers={}):
+def open_url(url, request, headers={}, pool=None):
+    if pool:
+        return pool.open_url(url=url, request=request, headers=headers)
     try:
         request = URLRequest(url=url, request=request, headers=headers)
         return request.openurl()
@@ -51,6 +59,98 @@ class URLRequest:
         return self.__response.getcode() == get_ok_status()
 
 
+class ConnectionPool:
+    def __init__(self, pool_size=10, connect_timeout=3.05, read_timeout=10):
+        self.__session = Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+        self.__timeout = (connect_timeout, read_timeout)
+        self.__statistics = {}
+        self.__statistics_lock = Lock()
+
+    def open_url(self, url, request, headers=None):
+        try:
+            response = self.__send(
+                url=url, data=request.encode("utf-8"), headers=headers
+            )
+        except RequestException:
+            return None
+        if response.status_code == get_ok_status():
+            return _add_ok_status(data=make_dict(response.content.decode("utf-8")))
+        return {}
+
+    def post_data(self, url, data=None, cert=None, headers=None):
+        response = self.__send(url=url, data=data, cert=cert, headers=headers)
+        if response.status_code == get_ok_status():
+            return _add_ok_status(response.json())
+        return {}
+
+    def get_statistics(self):
+        with self.__statistics_lock:
+            return self.__make_statistics()
+
+    def close(self):
+        self.__session.close()
+
+    def __make_statistics(self):
+        return {
+            url: dict(
+                statistics,
+                mean_seconds=(
+                    statistics.get("total_seconds") / statistics.get("calls")
+                    if statistics.get("calls")
+                    else None
+                ),
+            )
+            for url, statistics in self.__statistics.items()
+        }
+
+    def __send(self, url, data, headers, cert=None):
+        start_time = get_time()
+        failed = False
+        try:
+            return self.__session.post(
+                url, data=data, headers=headers, cert=cert, timeout=self.__timeout
+            )
+        except RequestException:
+            failed = True
+            raise
+        finally:
+            self.__add_call(
+                url=url, seconds=get_elapsed_time(start_time), failed=failed
+            )
+
+    def __add_call(self, url, seconds, failed):
+        # the pool is shared by every thread making requests, so the statistics
+        # are only changed, or read, whilst holding the lock
+        with self.__statistics_lock:
+            statistics = self.__statistics.setdefault(
+                url,
+                {"calls": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0},
+            )
+            statistics["calls"] += 1
+            statistics["errors"] += int(failed)
+            statistics["total_seconds"] += seconds
+            statistics["max_seconds"] = max(statistics.get("max_seconds"), seconds)
+
+
+__shared_pool = []
+
+
+def get_shared_connection_pool():
+    # every exchange handler in the process shares the same keep-alive
+    # connections unless it is given a pool of its own
+    if not __shared_pool:
+        __shared_pool.append(ConnectionPool(pool_size=128))
+    return __shared_pool[0]
+
+
+def set_shared_connection_pool(pool):
+    __shared_pool[:] = [pool]
+    return pool
+
+
 def _add_ok_status(data):
     data["status_code"] = get_ok_status()
     return data
@@ -0,0 +1,19 @@
+from time import perf_counter, thread_time
+
+
+def get_time():
+    return perf_counter()
+
+
+def get_elapsed_time(start):
+    return perf_counter() - start
+
+
+def get_cpu_time():
+    # the time of the calling thread only, so the work of the pool threads is
+    # not counted against whatever the calling thread is timing
+    return thread_time()
+
+
+def get_elapsed_cpu_time(start):
+    return thread_time() - start
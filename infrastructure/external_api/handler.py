@@ -1,4 +1,8 @@
-from infrastructure.built_in.adapter.request import post_data, open_url
+from infrastructure.built_in.adapter.request import (
+    get_shared_connection_pool,
+    post_data,
+    open_url,
+)
 from private.details import (
     get_app_key,
     get_cert,
@@ -11,12 +15,16 @@ from private.details import (
 
 
 class ExternalAPIHandler:
-    def __init__(self, environment="Prod"):
+    def __init__(self, environment="Prod", connection_pool=None):
         self.environment = environment
+        self._connection_pool = connection_pool or get_shared_connection_pool()
         self._app_key = None
         self._token = None
         self._headers = None
 
+    def get_connection_pool(self):
+        return self._connection_pool
+
     def get_headers(self):
         return self._headers
 
@@ -55,7 +63,12 @@ class ExternalAPIHandler:
         return data
 
     def _call_api(self, url, request):
-        response = open_url(url=url, request=request, headers=self.get_headers())
+        response = open_url(
+            url=url,
+            request=request,
+            headers=self.get_headers(),
+            pool=self._connection_pool,
+        )
         return response
 
     def _try_get_data(self, data, name="result"):
@@ -74,6 +87,7 @@ class ExternalAPIHandler:
                 "X-Application": self._app_key,
                 "Content-Type": "application/x-www-form-urlencoded",
             },
+            pool=self._connection_pool,
         )
         return response
 
@@ -0,0 +1,91 @@
+from infrastructure.external_api.handler import ExternalAPIHandler
+from infrastructure.external_api.market.handler import ExternalAPIMarketHandler
+
+from infrastructure.built_in.adapter.date_time import DateTime
+
+
+class ExternalAPIMarketBatchHandler(ExternalAPIHandler):
+    # the exchange rejects a listMarketBook request once the weight of each
+    # requested price projection multiplied by the number of markets exceeds
+    # the maximum weight of a single request
+    __price_data_weights = {
+        "SP_AVAILABLE": 3,
+        "SP_TRADED": 7,
+        "EX_BEST_OFFERS": 5,
+        "EX_ALL_OFFERS": 17,
+        "EX_TRADED": 17,
+    }
+
+    def __init__(
+        self, headers, environment="Prod", connection_pool=None, max_weight=200
+    ):
+        ExternalAPIHandler.__init__(
+            self, environment=environment, connection_pool=connection_pool
+        )
+        self._headers = headers
+        self.__max_weight = max_weight
+        self.__markets = {}
+
+    def add_market(self, external_api):
+        self.__markets[float(external_api.get_market_id())] = external_api
+
+    def remove_market(self, market_id):
+        return self.__markets.pop(float(market_id), None)
+
+    def get_market_ids(self):
+        return list(self.__markets.keys())
+
+    def get_batch_size(self):
+        weight = sum(
+            self.__price_data_weights.get(price_data)
+            for price_data in ExternalAPIMarketHandler.get_price_data()
+        )
+        return max(self.__max_weight // weight, 1)
+
+    def get_batches(self):
+        market_ids = self.get_market_ids()
+        batch_size = self.get_batch_size()
+        return [
+            market_ids[start : start + batch_size]
+            for start in range(0, len(market_ids), batch_size)
+        ]
+
+    def get_markets(self):
+        return self.process_markets(markets=self.fetch_markets())
+
+    def fetch_markets(self):
+        process_time = self.get_process_time()
+        markets = {}
+        for market_ids in self.get_batches():
+            markets.update(
+                self.fetch_batch(market_ids=market_ids, process_time=process_time)
+            )
+        return markets
+
+    @staticmethod
+    def get_process_time():
+        return DateTime.get_utc_now()
+
+    def fetch_batch(self, market_ids, process_time):
+        request = ExternalAPIMarketHandler.make_market_request(market_ids=market_ids)
+        books = {
+            float(book.get("marketId")): book
+            for book in self._call_exchange(request=request) or []
+            if book.get("marketId")
+        }
+
+        # every market in the batch is given the same process time, and an
+        # empty book if the exchange did not return it, as a single request would
+        markets = {}
+        for market_id in market_ids:
+            data = books.get(market_id) or {}
+            data["process_time"] = process_time
+            markets[market_id] = data
+        return markets
+
+    def process_markets(self, markets):
+        return {
+            market_id: self.__markets.get(market_id).process_market(data=data)
+            for market_id, data in markets.items()
+            if market_id in self.__markets
+        }
@@ -12,20 +12,27 @@ from private.details import get_orders_str, get_market_str
 class ExternalAPIMarketHandler(
     ExternalAPIHandler, ExternalAPIMarketInterface, Colleague
 ):
-    def __init__(self, market_id, headers, environment="Prod", mediator=None):
-        ExternalAPIHandler.__init__(self, environment=environment)
+    def __init__(
+        self,
+        market_id,
+        headers,
+        environment="Prod",
+        mediator=None,
+        connection_pool=None,
+    ):
+        ExternalAPIHandler.__init__(
+            self, environment=environment, connection_pool=connection_pool
+        )
         self.__market_id = market_id
         self._headers = headers
         if mediator:
             Colleague.__init__(self, mediator=mediator)
 
     def get_market(self):
-        request = (
-            '{"jsonrpc": "2.0", "method": "%s",'
-            '"params":{"marketIds":[%s],'
-            '"priceProjection":{"priceData":["EX_BEST_OFFERS","SP_AVAILABLE","SP_TRADED","EX_TRADED"]},'  # pylint: disable=line-too-long
-            '"marketProjection":["MARKET_START_TIME"]}, "id": 1}'
-        ) % (get_market_str(), self.__market_id)
+        return self.process_market(data=self.fetch_market())
+
+    def fetch_market(self):
+        request = self.make_market_request(market_ids=[self.__market_id])
 
         process_time = DateTime.get_utc_now()
 
@@ -34,8 +41,34 @@ class ExternalAPIMarketHandler(
         data = market[0] if market else {}
         data["process_time"] = process_time
 
+        return data
+
+    def process_market(self, data):
         return self._mediator.notify(event="external data fetched", data=data)
 
+    def get_market_id(self):
+        return self.__market_id
+
+    @staticmethod
+    def get_price_data():
+        return ["EX_BEST_OFFERS", "SP_AVAILABLE", "SP_TRADED", "EX_TRADED"]
+
+    @staticmethod
+    def make_market_request(market_ids):
+        return (
+            '{"jsonrpc": "2.0", "method": "%s",'
+            '"params":{"marketIds":[%s],'
+            '"priceProjection":{"priceData":[%s]},'
+            '"marketProjection":["MARKET_START_TIME"]}, "id": 1}'
+        ) % (
+            get_market_str(),
+            ",".join(map(str, market_ids)),
+            ",".join(
+                '"%s"' % price_data
+                for price_data in ExternalAPIMarketHandler.get_price_data()
+            ),
+        )
+
     def post_order(self, orders):
 
         valid_orders = self._validate_orders(orders=orders)
@@ -1,12 +1,16 @@
 from app.market.data.interface import MarketDataRecordInterface
+from app.market.metadata.handler import MetadataHandler
 from infrastructure.built_in.adapter.date_time import DateTime
 from infrastructure.external_api.market.record.item.adapter import ItemAdapter
+from infrastructure.external_api.market.record.item.state import ItemState
 
 
 class ExternalAPIMarketRecordAdapter(MarketDataRecordInterface):
-    def __init__(self, market_start_time):
+    def __init__(self, market_start_time, metadata=MetadataHandler()):
         self.__market_start_time = DateTime(market_start_time).get_epoch()
         self.__data = None
+        self.__item_plan = ItemAdapter.make_plan(metadata=metadata)
+        self.__item_states = {}
 
     def convert(self, raw_record):
         self.__data = raw_record
@@ -37,9 +41,21 @@ class ExternalAPIMarketRecordAdapter(MarketDataRecordInterface):
 
     def __process(self, items):
         data = {}
-        data["items"] = self.__non_empty(
-            map(lambda item: ItemAdapter(item).get_adapted_data(), items)
-        )
+        data["items"] = self.__non_empty(map(self.__adapt_item, items))
+        return data
+
+    def __adapt_item(self, item):
+        # each runner's state is kept between polls, a runner which has not
+        # changed since the last poll keeps the data it was adapted to then
+        state = self.__item_states.get(item.get("selectionId"))
+        if state is None:
+            state = ItemState()
+            self.__item_states[item.get("selectionId")] = state
+        elif state.is_unchanged(record=item):
+            return state.get_data()
+
+        data = ItemAdapter(item, state=state, plan=self.__item_plan).get_adapted_data()
+        state.set_data(record=item, data=data)
         return data
 
     def __non_empty(self, items):
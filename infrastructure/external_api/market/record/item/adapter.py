@@ -11,10 +11,10 @@ from infrastructure.external_api.market.record.interface import ItemAdapterInter
 
 
 class ItemAdapter(ItemAdapterInterface):
-    def __init__(self, record, metadata=MetadataHandler()):
+    def __init__(self, record, metadata=MetadataHandler(), state=None, plan=None):
         self.__record = record
-
-        self.__required_variables = metadata.get_required_variables()
+        self.__state = state
+        self.__plan = plan or self.make_plan(metadata=metadata)
 
         self.__id = self.__record.get("selectionId")
 
@@ -22,13 +22,29 @@ class ItemAdapter(ItemAdapterInterface):
         self.__ex = self.__get_value_or_default(value=self.__record.get("ex"))
 
         self.__set_traded_volume()
-        self.__set_ex_back_size()
-        self.__set_ex_lay_size()
-
-        self.__set_sp_back_price()
+        self.__set_traded_volume_totals()
+        self.__ex_back_size = None
+        self.__ex_lay_size = None
 
         self.__data = self.__construct_data()
 
+    @staticmethod
+    def make_plan(metadata):
+        # the required variables are looked up once for the schema, rather than
+        # for every runner, so each runner only runs the extractors it needs
+        required_variables = metadata.get_required_variables()
+        return {
+            "variables": [
+                (variable, extract)
+                for variable, extract in ItemAdapter.__extractors
+                if variable in required_variables
+            ],
+            "running_totals": any(
+                variable in required_variables
+                for variable in ["ex_lay_size", "ex_average_lay_price"]
+            ),
+        }
+
     def get_adapted_data(self):
         return self.__data if self.__is_valid_item() else {}
 
@@ -37,40 +53,8 @@ class ItemAdapter(ItemAdapterInterface):
 
     def __construct_data(self):
         data = {"id": self.__id}
-
-        if "removal_date" in self.__required_variables:
-            data["removal_date"] = self.__get_removal_date()
-
-        if "sp_back_price" in self.__required_variables:
-            data["sp_back_price"] = self.__sp_back_price
-
-        if "sp_lay_price" in self.__required_variables:
-            data["sp_lay_price"] = calc_inverse_price(self.__sp_back_price)
-
-        if "sp_back_size" in self.__required_variables:
-            data["sp_back_size"] = self.__calc_sp_back_size()
-
-        if "sp_lay_size" in self.__required_variables:
-            data["sp_lay_size"] = self.__calc_sp_lay_size()
-
-        if "ex_back_size" in self.__required_variables:
-            data["ex_back_size"] = self.__ex_back_size
-
-        if "ex_lay_size" in self.__required_variables:
-            data["ex_lay_size"] = self.__ex_lay_size
-
-        if "ex_average_back_price" in self.__required_variables:
-            data["ex_average_back_price"] = self.__calc_ex_average_back_price()
-
-        if "ex_average_lay_price" in self.__required_variables:
-            data["ex_average_lay_price"] = self.__calc_ex_average_lay_price()
-
-        if "ex_offered_back_price" in self.__required_variables:
-            data["ex_offered_back_price"] = self.__get_ex_ex_offered_back_price()
-
-        if "ex_offered_lay_price" in self.__required_variables:
-            data["ex_offered_lay_price"] = self.__get_ex_ex_offered_lay_price()
-
+        for variable, extract in self.__plan.get("variables"):
+            data[variable] = extract(self)
         return data
 
     def __get_removal_date(self):
@@ -82,17 +66,12 @@ class ItemAdapter(ItemAdapterInterface):
         )
         return removal_date
 
-    def __set_sp_back_price(self):
+    def __get_sp_back_price(self):
+        price = self.__sp.get("nearPrice")
+        return price if is_valid_price(price=price) else not_a_number()
 
-        if any(
-            variable in ["sp_back_price", "sp_lay_price"]
-            for variable in self.__required_variables
-        ):
-            price = self.__sp.get("nearPrice")
-            sp_back_price = price if is_valid_price(price=price) else not_a_number()
-        else:
-            sp_back_price = None
-        self.__sp_back_price = sp_back_price
+    def __calc_sp_lay_price(self):
+        return calc_inverse_price(self.__get_sp_back_price())
 
     def __set_traded_volume(self):
         traded_volume = self.__ex.get("tradedVolume") if self.__ex else None
@@ -100,38 +79,68 @@ class ItemAdapter(ItemAdapterInterface):
             value=traded_volume, default=[]
         )
 
+    def __set_traded_volume_totals(self):
+        # a live market's traded volume only grows, so with the runner's state
+        # from the last poll the liabilities are brought up to date rather than
+        # worked out again for every price, the plain sums of the sizes cost
+        # less to redo than to find the changes for
+        self.__traded_volume_totals = (
+            self.__state.get_totals(
+                name="tradedVolume",
+                price_sizes=self.__traded_volume,
+                calculate=self.__calc_trade_values,
+                count=4,
+            )
+            if self.__state and self.__plan.get("running_totals")
+            else None
+        )
+
+    @staticmethod
+    def __calc_trade_values(price, size):
+        liability = calc_sell_liability(price=price, size=size)
+        return (size, size * price, liability, liability * calc_inverse_price(price))
+
     def __calc_ex_average_back_price(self):
-        total_back_price = sum(
-            trade.get("size") * trade.get("price") for trade in self.__traded_volume
+        total_back_price = (
+            self.__traded_volume_totals[1]
+            if self.__traded_volume_totals
+            else sum(
+                trade.get("size") * trade.get("price") for trade in self.__traded_volume
+            )
         )
 
+        ex_back_size = self.__get_ex_back_size()
         ex_average_back_price = (
-            total_back_price / self.__ex_back_size
-            if self.__ex_back_size
-            else not_a_number()
+            total_back_price / ex_back_size if ex_back_size else not_a_number()
         )
         return ex_average_back_price
 
     def __calc_ex_average_lay_price(self):
-        total_lay_price = sum(
-            calc_sell_liability(price=trade.get("price"), size=trade.get("size"))
-            * calc_inverse_price(trade.get("price"))
-            for trade in self.__traded_volume
+        total_lay_price = (
+            self.__traded_volume_totals[3]
+            if self.__traded_volume_totals
+            else sum(
+                calc_sell_liability(price=trade.get("price"), size=trade.get("size"))
+                * calc_inverse_price(trade.get("price"))
+                for trade in self.__traded_volume
+            )
         )
 
+        ex_lay_size = self.__get_ex_lay_size()
         ex_average_lay_price = (
-            total_lay_price / self.__ex_lay_size
-            if self.__ex_lay_size
-            else not_a_number()
+            total_lay_price / ex_lay_size if ex_lay_size else not_a_number()
         )
         return ex_average_lay_price
 
-    def __set_ex_back_size(self):
-        self.__ex_back_size = (
-            sum(trade.get("size") for trade in self.__traded_volume)
-            if "ex_back_size" in self.__required_variables
-            else None
-        )
+    def __get_ex_back_size(self):
+        # shared by the size and the average price, so only summed once
+        if self.__ex_back_size is None:
+            self.__ex_back_size = (
+                self.__traded_volume_totals[0]
+                if self.__traded_volume_totals
+                else sum(trade.get("size") for trade in self.__traded_volume)
+            )
+        return self.__ex_back_size
 
     def __calc_sp_back_size(self):
         back_taken = self.__get_value_or_default(
@@ -140,15 +149,19 @@ class ItemAdapter(ItemAdapterInterface):
         sp_back_size = sum(price.get("size") for price in back_taken)
         return sp_back_size
 
-    def __set_ex_lay_size(self):
-        self.__ex_lay_size = (
-            sum(
-                calc_sell_liability(price=trade.get("price"), size=trade.get("size"))
-                for trade in self.__traded_volume
+    def __get_ex_lay_size(self):
+        if self.__ex_lay_size is None:
+            self.__ex_lay_size = (
+                self.__traded_volume_totals[2]
+                if self.__traded_volume_totals
+                else sum(
+                    calc_sell_liability(
+                        price=trade.get("price"), size=trade.get("size")
+                    )
+                    for trade in self.__traded_volume
+                )
             )
-            if "ex_lay_size" in self.__required_variables
-            else None
-        )
+        return self.__ex_lay_size
 
     def __calc_sp_lay_size(self):
         lay_taken = self.__get_value_or_default(
@@ -173,3 +186,18 @@ class ItemAdapter(ItemAdapterInterface):
 
     def __get_value_or_default(self, value, default={}):
         return value or default
+
+    # in the order the variables are added to the adapted data
+    __extractors = [
+        ("removal_date", __get_removal_date),
+        ("sp_back_price", __get_sp_back_price),
+        ("sp_lay_price", __calc_sp_lay_price),
+        ("sp_back_size", __calc_sp_back_size),
+        ("sp_lay_size", __calc_sp_lay_size),
+        ("ex_back_size", __get_ex_back_size),
+        ("ex_lay_size", __get_ex_lay_size),
+        ("ex_average_back_price", __calc_ex_average_back_price),
+        ("ex_average_lay_price", __calc_ex_average_lay_price),
+        ("ex_offered_back_price", __get_ex_ex_offered_back_price),
+        ("ex_offered_lay_price", __get_ex_ex_offered_lay_price),
+    ]
@@ -0,0 +1,141 @@
+from infrastructure.built_in.adapter.iter_utils import get_differences
+
+
+class ItemState:
+    # what is kept for a runner between polls, the last payload and its adapted
+    # data, and running sums over each of its price / size arrays
+    def __init__(self):
+        self.__record = None
+        self.__data = None
+        self.__ladders = {}
+
+    def is_unchanged(self, record):
+        return self.__record is not None and record == self.__record
+
+    def get_data(self):
+        return self.__data
+
+    def set_data(self, record, data):
+        self.__record = record
+        self.__data = data
+
+    def get_totals(self, name, price_sizes, calculate, count):
+        # the arrays only grow between polls, so only the levels which are new
+        # or whose size has changed are added in, as the difference from what
+        # they gave before
+        ladder = self.__ladders.get(name)
+        if ladder is None:
+            ladder = self.__make_ladder(count=count)
+            self.__ladders[name] = ladder
+
+        previous_price_sizes = ladder.get("price_sizes")
+        if price_sizes == previous_price_sizes:
+            return ladder.get("totals")
+
+        changes = (
+            self.__get_changes(
+                price_sizes=price_sizes, previous_price_sizes=previous_price_sizes
+            )
+            if previous_price_sizes
+            else None
+        )
+        if changes is None:
+            self.__set_levels(
+                ladder=ladder, price_sizes=price_sizes, calculate=calculate
+            )
+        else:
+            self.__update_levels(
+                ladder=ladder,
+                price_sizes=price_sizes,
+                changes=changes,
+                calculate=calculate,
+            )
+        ladder["price_sizes"] = price_sizes
+        return ladder.get("totals")
+
+    @staticmethod
+    def __get_changes(price_sizes, previous_price_sizes):
+        # pairs of the position of each new or changed level and where it was
+        # before (None if new), the levels are compared in pairs from a pointer
+        # into each ladder, and the pointers only move apart when a level is new
+        changes = []
+        index = 0
+        previous_index = 0
+        while True:
+            for offset in get_differences(
+                first=price_sizes,
+                second=previous_price_sizes,
+                first_start=index,
+                second_start=previous_index,
+            ):
+                if price_sizes[index + offset].get("price") == previous_price_sizes[
+                    previous_index + offset
+                ].get("price"):
+                    changes.append((index + offset, previous_index + offset))
+                    continue
+                changes.append((index + offset, None))
+                index += offset + 1
+                previous_index += offset
+                break
+            else:
+                break
+
+        compared = min(
+            len(price_sizes) - index, len(previous_price_sizes) - previous_index
+        )
+        if previous_index + compared < len(previous_price_sizes):
+            # a level has gone, which the exchange does not do
+            return None
+        changes.extend(
+            (new_index, None) for new_index in range(index + compared, len(price_sizes))
+        )
+        return changes
+
+    @staticmethod
+    def __update_levels(ladder, price_sizes, changes, calculate):
+        previous_values = ladder.get("values")
+        totals = ladder.get("totals")
+        values = []
+        previous_index = 0
+        for index, changed_index in changes:
+            unchanged = index - len(values)
+            values.extend(previous_values[previous_index : previous_index + unchanged])
+            previous_index += unchanged
+            level_values = ItemState.__calc_level(
+                price_size=price_sizes[index], calculate=calculate
+            )
+            if changed_index is None:
+                totals = [total + value for total, value in zip(totals, level_values)]
+            else:
+                totals = [
+                    total + value - previous
+                    for total, value, previous in zip(
+                        totals, level_values, previous_values[changed_index]
+                    )
+                ]
+                previous_index += 1
+            values.append(level_values)
+        values.extend(previous_values[previous_index:])
+        ladder["values"] = values
+        ladder["totals"] = totals
+
+    @staticmethod
+    def __set_levels(ladder, price_sizes, calculate):
+        values = [
+            ItemState.__calc_level(price_size=price_size, calculate=calculate)
+            for price_size in price_sizes
+        ]
+        ladder["values"] = values
+        ladder["totals"] = (
+            [sum(column) for column in zip(*values)]
+            if values
+            else [0] * len(ladder.get("totals"))
+        )
+
+    @staticmethod
+    def __calc_level(price_size, calculate):
+        return calculate(price=price_size.get("price"), size=price_size.get("size"))
+
+    @staticmethod
+    def __make_ladder(count):
+        return {"price_sizes": [], "values": [], "totals": [0] * count}
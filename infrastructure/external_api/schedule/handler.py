@@ -5,8 +5,10 @@ from private.details import get_catalogue_str
 
 
 class ExternalAPIScheduleHandler(ExternalAPIHandler, ScheduleDataInterface):
-    def __init__(self, environment="Prod"):
-        ExternalAPIHandler.__init__(self, environment=environment)
+    def __init__(self, environment="Prod", connection_pool=None):
+        ExternalAPIHandler.__init__(
+            self, environment=environment, connection_pool=connection_pool
+        )
         self.set_headers()
 
     def get_schedule(self, event_type_id, to_date_time):
@@ -8,6 +8,7 @@ from infrastructure.built_in.adapter.os_utils import (
     path_exists,
     make_directory_if_required,
 )
+from infrastructure.built_in.adapter.time_utils import get_time, get_elapsed_time
 
 
 class FileHandler:
@@ -15,47 +16,54 @@ class FileHandler:
         self.__directory = directory
         self.__file = self.__add_path_to(file)
         self.__make_directory()
-
-    def get_file_as_generator(self):
-        if get_file_extension(self.__file) == ".bz2":
-            yield from self.__get_bz2_contents()
-        else:
-            yield from self.__get_file_contents()
+        self.__bytes_read = 0
+        self.__records_read = 0
+        self.__start_time = None
+        self.__elapsed_time = None
+
+    def get_file_as_generator(self, offset=0):
+        self.__bytes_read = offset
+        self.__records_read = 0
+        self.__start_time = get_time()
+        self.__elapsed_time = None
+        with self.__open() as file:
+            if offset:
+                file.seek(offset)
+            for line in file:
+                self.__bytes_read += len(line)
+                record = make_dict(line)
+                if record:
+                    self.__records_read += 1
+                    yield record
+        self.__elapsed_time = get_elapsed_time(self.__start_time)
 
     def get_file_as_list(self):
-        if get_file_extension(self.__file) == ".bz2":
-            return self.__get_bz2_contents()
-
-        return self.__get_file_contents()
-
-    def __get_bz2_contents(self):
-        with bz2.open(self.__file, "r") as file:
-            contents = self.__get_contents(file)
-        return contents
+        return list(self.get_file_as_generator())
 
-    def __get_file_contents(self):
-        with open(self.__file, "r", encoding="utf-8") as file:
-            contents = self.__get_contents(file)
-        return contents
+    def get_bytes_read(self):
+        return self.__bytes_read
 
-    def __get_contents(self, file):
-        return [make_dict(line) for line in file.readlines() if self.__is_valid(line)]
+    def get_records_read(self):
+        return self.__records_read
 
-    def __is_valid(self, line):
-        return True if make_dict(line) else False
+    def get_records_per_second(self):
+        if self.__start_time is None:
+            return 0
+        elapsed_time = (
+            self.__elapsed_time
+            if self.__elapsed_time is not None
+            else get_elapsed_time(self.__start_time)
+        )
+        return self.__records_read / elapsed_time if elapsed_time else 0
 
     def get_first_record(self):
-        if get_file_extension(self.__file) == ".bz2":
-            return self.__get_first_bz2_record()
-        return self.__get_first_record()
-
-    def __get_first_bz2_record(self):
-        with bz2.open(self.__file, "r") as file:
+        with self.__open() as file:
             return make_dict(next(file))
 
-    def __get_first_record(self):
-        with open(self.__file, "r", encoding="utf-8") as file:
-            return make_dict(next(file))
+    def __open(self):
+        if get_file_extension(self.__file) == ".bz2":
+            return bz2.open(self.__file, "rb")
+        return open(self.__file, "rb")
 
     def add_dict(self, data):
         with open(self.__file, self.__write_type, encoding="utf-8") as file:
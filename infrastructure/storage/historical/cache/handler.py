@@ -0,0 +1,162 @@
+from app.market.data import utils
+from app.market.metadata.handler import MetadataHandler
+
+from infrastructure.storage.historical.download.file.data.handler import (
+    HistoricalDownloadFileDataHandler,
+)
+from infrastructure.storage.historical.download.file.data.state import RunnerState
+from infrastructure.storage.historical.download.file.handler import (
+    HistoricalDownloadFileHandler,
+)
+from infrastructure.storage.historical.download.file.record.adapter import (
+    HistoricalDownloadFileRecordAdapter,
+)
+from infrastructure.third_party.adapter import record_array
+from infrastructure.third_party.adapter.record_array import (
+    iterate_records,
+    load_arrays,
+    make_record_arrays,
+    save_arrays,
+)
+
+from infrastructure.built_in.adapter.hash_utils import hash_file, hash_source
+from infrastructure.built_in.adapter.json_utils import make_dict, write_json_to
+from infrastructure.built_in.adapter.os_utils import (
+    get_file_path,
+    get_process_id,
+    make_directory_if_required,
+    path_exists,
+    remove_file_extension,
+    remove_tree,
+    rename_path,
+    split_path,
+)
+
+
+class HistoricalCacheHandler:
+    __format_version = 1
+    __array_names = ["values", "present", "missing", "extract_time", "closed_indicator"]
+    __code_versions = {}
+
+    def __init__(self, directory):
+        self.__directory = directory
+
+    def get_market(self, path):
+        key = self.get_key(path=path)
+        return self.load(path=path, key=key) or self.build(path=path, key=key)
+
+    def load(self, path, key=None):
+        directory = self.__get_market_directory(
+            path=path, key=key or self.get_key(path=path)
+        )
+        header_path = get_file_path(directory=directory, file="header.json")
+        if not path_exists(header_path):
+            return None
+        with open(header_path, "r", encoding="utf-8") as file:
+            header = make_dict(file.read())
+        return {
+            "header": header,
+            "arrays": load_arrays(directory=directory, names=self.__array_names),
+        }
+
+    def build(self, path, key=None):
+        directory, file = split_path(path)
+        handler = HistoricalDownloadFileHandler(directory=directory, file=file)
+        if not handler.is_valid_market():
+            return None
+
+        records = self._convert(records=handler.get_file_as_list())
+        try:
+            outcome = handler.get_outcome()
+        except:
+            outcome = None
+
+        arrays, header = make_record_arrays(
+            records=records, variables=self.__get_variables(records=records)
+        )
+        header.update(
+            {
+                "key": key or self.get_key(path=path),
+                "market_id": remove_file_extension(file),
+                "market_start_time": handler.get_market_start_time(),
+                "outcome": outcome,
+                "records": len(records),
+            }
+        )
+        self.__save(path=path, arrays=arrays, header=header)
+        return {"header": header, "arrays": arrays}
+
+    def get_key(self, path):
+        return "%s-%s" % (hash_file(path)[:32], self.get_code_version()[:16])
+
+    @classmethod
+    def get_code_version(cls):
+        # any change to the code that reconstructs and converts the records
+        # must not be able to load a cache written by the previous code
+        code_version = HistoricalCacheHandler.__code_versions.get(cls)
+        if code_version is None:
+            code_version = "%s-%s" % (
+                cls.__format_version,
+                hash_source(cls._get_sources()),
+            )
+            HistoricalCacheHandler.__code_versions[cls] = code_version
+        return code_version
+
+    @staticmethod
+    def _get_sources():
+        return [
+            HistoricalDownloadFileHandler,
+            HistoricalDownloadFileDataHandler,
+            RunnerState,
+            HistoricalDownloadFileRecordAdapter,
+            MetadataHandler,
+            utils,
+            record_array,
+        ]
+
+    def _convert(self, records):
+        adapter = HistoricalDownloadFileRecordAdapter()
+        return list(map(adapter.convert, records))
+
+    @staticmethod
+    def get_records(market):
+        return iterate_records(arrays=market.get("arrays"), header=market.get("header"))
+
+    def __save(self, path, arrays, header):
+        directory = self.__get_market_directory(path=path, key=header.get("key"))
+        temporary_directory = make_directory_if_required(
+            "%s.%s.tmp" % (directory, get_process_id())
+        )
+        save_arrays(directory=temporary_directory, arrays=arrays)
+        with open(
+            get_file_path(directory=temporary_directory, file="header.json"),
+            "w",
+            encoding="utf-8",
+        ) as file:
+            write_json_to(file=file, data=header)
+        # the complete cache is moved into place at once so that a concurrent
+        # backtest can never load a partially written market
+        try:
+            rename_path(temporary_directory, directory)
+        except OSError:
+            remove_tree(temporary_directory)
+
+    def __get_market_directory(self, path, key):
+        market_directory = make_directory_if_required(
+            get_file_path(
+                directory=self.__directory,
+                file=remove_file_extension(split_path(path)[1]),
+            )
+        )
+        return get_file_path(directory=market_directory, file=key)
+
+    @staticmethod
+    def __get_variables(records):
+        for record in records:
+            for item in record.get("items"):
+                return [
+                    variable
+                    for variable in item.keys()
+                    if variable not in ["id", "removal_date"]
+                ]
+        return []
@@ -0,0 +1,41 @@
+from app.colleague import Colleague
+from app.market.interface import ExternalAPIMarketInterface
+
+from infrastructure.storage.historical.cache.handler import HistoricalCacheHandler
+from infrastructure.storage.historical.orders.handler import HistoricalOrdersHandler
+
+
+class HistoricalCacheMarketHandler(
+    ExternalAPIMarketInterface, HistoricalOrdersHandler, Colleague
+):
+    def __init__(self, market, mediator=None):
+        self.__header = market.get("header")
+        self.__records = HistoricalCacheHandler.get_records(market=market)
+        self._exhausted = False
+        if mediator:
+            Colleague.__init__(self, mediator=mediator)
+
+    def is_exhausted(self):
+        return self._exhausted
+
+    def get_market_id(self):
+        return self.__header.get("market_id")
+
+    def get_market_start_time(self):
+        return self.__header.get("market_start_time")
+
+    def get_outcome(self):
+        return self.__header.get("outcome")
+
+    def get_market(self):
+        try:
+            data = next(self.__records)
+            return self._mediator.notify(event="external data fetched", data=data)
+        except StopIteration:
+            self._exhausted = True
+            return None
+        except:
+            return None
+
+    # the interface wants its methods named on the class itself
+    post_order = HistoricalOrdersHandler.post_order
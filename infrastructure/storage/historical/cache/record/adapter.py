@@ -0,0 +1,6 @@
+from app.market.data.interface import MarketDataRecordInterface
+
+
+class HistoricalCacheRecordAdapter(MarketDataRecordInterface):
+    def convert(self, data):
+        return data
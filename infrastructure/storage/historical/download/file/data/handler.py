@@ -1,30 +1,54 @@
 from infrastructure.built_in.adapter.date_time import DateTime
-from infrastructure.built_in.adapter.copy_utils import make_copy
+from infrastructure.storage.historical.download.file.data.state import RunnerState
 from infrastructure.third_party.adapter.numpy_utils import round_down
 
 
 class HistoricalDownloadFileDataHandler:
+    __ladder_attributes = [
+        ("atb", "ex"),
+        ("atl", "ex"),
+        ("trd", "ex"),
+        ("spb", "sp"),
+        ("spl", "sp"),
+    ]
+
     def __init__(self, items, market_start_time):
-        self._items = {
-            item.get("id"): {
-                "ex": {"atb": {}, "trd": {}, "atl": {}},
-                "sp": {
-                    "spn": None,
-                    "spb": {},
-                    "spl": {},
-                },
-            }
-            for item in items
-        }
+        self._items = {item.get("id"): RunnerState() for item in items}
         self._market_start_time = DateTime(market_start_time).get_epoch()
         self._existing_times = []
         self._record = {}
         self._closed_indicator = False
         self.__market_definition_change = None
+        self.__version = 0
+        self.__owned_items = {}
+        self.__owned_ladders = {}
 
     def set_record(self, record):
         self._record = record
 
+    def get_extract_time(self):
+        return self.__calc_extract_time()
+
+    def get_state(self):
+        return {
+            "items": [
+                self.__serialise_item(item_id=item_id, item=item)
+                for item_id, item in self._items.items()
+            ],
+            "existing_times": list(self._existing_times),
+            "closed_indicator": self._closed_indicator,
+        }
+
+    def set_state(self, state):
+        self._items = {
+            item.get("id"): self.__deserialise_item(item=item)
+            for item in state.get("items")
+        }
+        self._existing_times = list(state.get("existing_times"))
+        self._closed_indicator = state.get("closed_indicator")
+        # nothing is shared with a snapshot made before the state was restored
+        self.__version += 1
+
     def process(self, record):
         data = {}
         self.set_record(record)
@@ -38,11 +62,10 @@ class HistoricalDownloadFileDataHandler:
             # and append (_add) the new data to the object
             self._existing_times.append(extract_time)
             data["extract_time"] = extract_time
-            data["items"] = make_copy(self._items)
-            data["closed_indicator"] = make_copy(self._closed_indicator)
+            data["items"] = self.__make_snapshot()
+            data["closed_indicator"] = self._closed_indicator
 
-        self._add_exchange_data()
-        self._add_starting_price_data()
+        self.__add_item_changes()
 
         self.__set_market_definition_change()
         self._add_removal_data()
@@ -56,15 +79,22 @@ class HistoricalDownloadFileDataHandler:
     def __get_process_time(self):
         return DateTime(self._record.get("pt")).get_epoch()
 
-    def _add_exchange_data(self):
-        self._add_available_to_back()
-        self._add_available_to_lay()
-        self._add_traded_volume()
-
-    def _add_starting_price_data(self):
-        self._add_sp_back_taken()
-        self._add_sp_lay_taken()
-        self._add_sp_near_price()
+    def __add_item_changes(self):
+        # one pass over the changes, each ladder change is applied by position
+        for change in self._get_item_changes():
+            item_id = change.get("id")
+            if not item_id:
+                continue
+            for attribute, attribute_type in self.__ladder_attributes:
+                ladder_changes = change.get(attribute)
+                if ladder_changes:
+                    self.__get_writable_ladder(
+                        item_id=item_id,
+                        attribute_type=attribute_type,
+                        attribute=attribute,
+                    ).update(changes=ladder_changes)
+            if change.get("spn"):
+                self.__get_writable_item(item_id=item_id).spn = change.get("spn")
 
     def __set_market_definition_change(self):
         self.__market_definition_change = (
@@ -73,50 +103,71 @@ class HistoricalDownloadFileDataHandler:
 
     def _add_removal_data(self):
         for removal in self.__get_removed_items():
-            self._items[removal.get("id")]["removal_date"] = removal.get("removalDate")
+            item = self.__get_writable_item(item_id=removal.get("id"))
+            item.removal_date = removal.get("removalDate")
 
     def __set_closed_indictor(self):
         in_play = self.__market_definition_change.get("inPlay")
         if in_play is not None:
             self._closed_indicator = in_play
 
-    def _add_available_to_back(self):
-        return self.__add_attribute(attribute="atb", attribute_type="ex")
-
-    def _add_available_to_lay(self):
-        return self.__add_attribute(attribute="atl", attribute_type="ex")
-
-    def _add_traded_volume(self):
-        return self.__add_attribute(attribute="trd", attribute_type="ex")
-
-    def _add_sp_back_taken(self):
-        return self.__add_attribute(attribute="spb", attribute_type="sp")
-
-    def _add_sp_lay_taken(self):
-        return self.__add_attribute(attribute="spl", attribute_type="sp")
-
-    def _add_sp_near_price(self):
-        attribute = "spn"
-        for item in self.__get_attributes(attribute=attribute):
-            self._items[item.get("id")]["sp"][attribute] = item.get(attribute)
-
-    def __add_attribute(self, attribute, attribute_type):
-        for item in self.__get_attributes(attribute=attribute):
-            for change in item.get(attribute):
-                price = change[0]
-                size = change[1]
-                self._items[item.get("id")][attribute_type][attribute][price] = size
-
-                if not size:
-                    del self._items[item.get("id")][attribute_type][attribute][price]
-
-    def __get_attributes(self, attribute):
-        return list(
-            filter(
-                lambda item: item.get(attribute) and item.get("id"),
-                self._get_item_changes(),
+    def __make_snapshot(self):
+        # the snapshot shares every runner with the handler, any runner (or
+        # ladder) changed after this point is copied before it is written to
+        self.__version += 1
+        return dict(self._items)
+
+    def __get_writable_item(self, item_id):
+        if self.__owned_items.get(item_id) != self.__version:
+            self._items[item_id] = self._items[item_id].copy()
+            self.__owned_items[item_id] = self.__version
+        return self._items[item_id]
+
+    def __get_writable_ladder(self, item_id, attribute_type, attribute):
+        item = self.__get_writable_item(item_id=item_id)
+        if self.__owned_ladders.get((item_id, attribute)) != self.__version:
+            ladder = item.get_ladder(attribute).copy()
+            item.set_ladder(attribute, ladder)
+            self.__owned_ladders[(item_id, attribute)] = self.__version
+            return ladder
+        return item.get_ladder(attribute)
+
+    @staticmethod
+    def __serialise_item(item_id, item):
+        # prices are kept as pairs as the keys of a json object must be strings
+        serialised = {"id": item_id}
+        for key, value in item.to_dict().items():
+            serialised[key] = (
+                {
+                    attribute: (
+                        list(ladder.items()) if isinstance(ladder, dict) else ladder
+                    )
+                    for attribute, ladder in value.items()
+                }
+                if key in ["ex", "sp"]
+                else value
             )
-        )
+        return serialised
+
+    @staticmethod
+    def __deserialise_item(item):
+        deserialised = {}
+        for key, value in item.items():
+            if key == "id":
+                continue
+            deserialised[key] = (
+                {
+                    attribute: (
+                        {price: size for price, size in ladder}
+                        if isinstance(ladder, list)
+                        else ladder
+                    )
+                    for attribute, ladder in value.items()
+                }
+                if key in ["ex", "sp"]
+                else value
+            )
+        return RunnerState(state=deserialised)
 
     def _get_item_changes(self):
         return self._record.get("mc")[0].get("rc")
@@ -0,0 +1,265 @@
+from app.market.data.utils import get_tick_count, get_tick_indexes, get_ticks
+
+from infrastructure.built_in.adapter.array_utils import make_float_array
+
+
+class TickLadder:
+    # the sizes are held in a fixed array indexed by the position of the price
+    # on the exchange's ladder, any price which is not on the ladder is kept
+    # separately, the range of positions in use bounds every iteration
+    __slots__ = ("__sizes", "__low", "__high", "__other", "__totals")
+
+    __ticks = get_ticks()
+    __liability_factors = [tick - 1 for tick in get_ticks()]
+
+    def __init__(self, ladder=None, totals=False):
+        self.__sizes = make_float_array(get_tick_count())
+        self.__low = get_tick_count()
+        self.__high = -1
+        self.__other = None
+        # running sums of size, price x size and liability, size x (price - 1)
+        self.__totals = [0, 0, 0] if totals else None
+        self.update(changes=(ladder or {}).items())
+
+    def copy(self):
+        ladder = TickLadder.__new__(TickLadder)
+        ladder.__sizes = self.__sizes[:]
+        ladder.__low = self.__low
+        ladder.__high = self.__high
+        ladder.__other = dict(self.__other) if self.__other else None
+        ladder.__totals = list(self.__totals) if self.__totals else None
+        return ladder
+
+    def set(self, price, size):
+        self.update(changes=[(price, size)])
+
+    def update(self, changes):
+        # applied in one loop over local names as a replay makes a great many
+        sizes = self.__sizes
+        indexes = get_tick_indexes()
+        low = self.__low
+        high = self.__high
+        removed = False
+        totals = self.__totals
+        if totals:
+            ticks = self.__ticks
+            factors = self.__liability_factors
+            total_size, total_price_size, total_liability = totals
+        for price, size in changes:
+            index = indexes.get(price)
+            if index is None:
+                self.__set_other(price=price, size=size)
+                continue
+            if totals:
+                # only positive sizes count, as with the adapter's valid sizes
+                change = max(size, 0) - max(sizes[index], 0)
+                if change:
+                    total_size += change
+                    total_price_size += ticks[index] * change
+                    total_liability += factors[index] * change
+            sizes[index] = size
+            if size:
+                if index < low:
+                    low = index
+                if index > high:
+                    high = index
+            elif index in (low, high):
+                removed = True
+        self.__low = low
+        self.__high = high
+        if totals:
+            self.__totals = [total_size, total_price_size, total_liability]
+        if removed:
+            self.__shrink()
+
+    def get_totals(self):
+        # the totals only cover the prices on the tick ladder, see get_other
+        return tuple(self.__totals) if self.__totals else None
+
+    def get(self, price, default=None):
+        index = get_tick_indexes().get(price)
+        if index is None:
+            return (self.__other or {}).get(price, default)
+        return self.__sizes[index] or default
+
+    def get_max_price(self):
+        # the best offer is the end of the range in use, so needs no search
+        return self.__ticks[self.__high] if self.__high >= 0 else None
+
+    def get_min_price(self):
+        return self.__ticks[self.__low] if self.__high >= 0 else None
+
+    def get_other(self):
+        return self.__other or {}
+
+    def items(self):
+        low = self.__low
+        high = self.__high + 1
+        items = [
+            item
+            for item in zip(self.__ticks[low:high], self.__sizes[low:high])
+            if item[1]
+        ]
+        if self.__other:
+            items.extend(self.__other.items())
+        return items
+
+    def keys(self):
+        return [price for price, _ in self.items()]
+
+    def values(self):
+        return [size for _, size in self.items()]
+
+    def __getitem__(self, price):
+        size = self.get(price)
+        if size is None:
+            raise KeyError(price)
+        return size
+
+    def __contains__(self, price):
+        return self.get(price) is not None
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, TickLadder):
+            return self.items() == other.items()
+        if isinstance(other, dict):
+            return dict(self.items()) == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+    def __getstate__(self):
+        return {"ladder": dict(self.items()), "totals": self.__totals is not None}
+
+    def __setstate__(self, state):
+        self.__init__(ladder=state.get("ladder"), totals=state.get("totals"))
+
+    def __set_other(self, price, size):
+        if size:
+            self.__other = self.__other or {}
+            self.__other[price] = size
+        elif self.__other:
+            self.__other.pop(price, None)
+
+    def __shrink(self):
+        sizes = self.__sizes
+        low = self.__low
+        high = self.__high
+        while low <= high and not sizes[low]:
+            low += 1
+        while high >= low and not sizes[high]:
+            high -= 1
+        if low > high:
+            low = get_tick_count()
+            high = -1
+            if self.__totals:
+                # start again from exact zeros rather than any rounding left over
+                self.__totals = [0, 0, 0]
+        self.__low = low
+        self.__high = high
+
+
+class RunnerState:
+    # read through the same get("ex") / get("sp") interface as the dictionaries
+    # it replaces, so the record adapter does not need to know the difference
+    __slots__ = ("atb", "atl", "trd", "spb", "spl", "spn", "removal_date")
+
+    __exchange_attributes = ["atb", "trd", "atl"]
+    __starting_price_attributes = ["spn", "spb", "spl"]
+
+    def __init__(self, state=None):
+        state = state or {}
+        exchange = state.get("ex") or {}
+        starting_price = state.get("sp") or {}
+        self.atb = TickLadder(exchange.get("atb"))
+        self.atl = TickLadder(exchange.get("atl"))
+        self.trd = TickLadder(exchange.get("trd"), totals=True)
+        self.spb = TickLadder(starting_price.get("spb"))
+        self.spl = TickLadder(starting_price.get("spl"))
+        self.spn = starting_price.get("spn")
+        self.removal_date = state.get("removal_date")
+
+    def copy(self):
+        # the ladders are shared until they are replaced with a copy
+        state = RunnerState.__new__(RunnerState)
+        state.atb = self.atb
+        state.atl = self.atl
+        state.trd = self.trd
+        state.spb = self.spb
+        state.spl = self.spl
+        state.spn = self.spn
+        state.removal_date = self.removal_date
+        return state
+
+    def get_ladder(self, attribute):
+        return getattr(self, attribute)
+
+    def set_ladder(self, attribute, ladder):
+        setattr(self, attribute, ladder)
+
+    def get(self, key, default=None):
+        if key == "ex":
+            return {
+                attribute: getattr(self, attribute)
+                for attribute in self.__exchange_attributes
+            }
+        if key == "sp":
+            return {
+                attribute: getattr(self, attribute)
+                for attribute in self.__starting_price_attributes
+            }
+        if key == "removal_date" and self.removal_date:
+            return self.removal_date
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def to_dict(self):
+        state = {
+            "ex": {
+                attribute: dict(getattr(self, attribute).items())
+                for attribute in self.__exchange_attributes
+            },
+            "sp": {
+                attribute: (
+                    getattr(self, attribute)
+                    if attribute == "spn"
+                    else dict(getattr(self, attribute).items())
+                )
+                for attribute in self.__starting_price_attributes
+            },
+        }
+        if self.removal_date:
+            state["removal_date"] = self.removal_date
+        return state
+
+    def __eq__(self, other):
+        if isinstance(other, RunnerState):
+            return self.to_dict() == other.to_dict()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state):
+        self.__init__(state=state)
@@ -5,36 +5,61 @@ from infrastructure.storage.file.handler import FileHandler
 from infrastructure.storage.historical.download.file.data.handler import (
     HistoricalDownloadFileDataHandler,
 )
-from infrastructure.built_in.adapter.copy_utils import make_copy
+from infrastructure.storage.historical.orders.handler import HistoricalOrdersHandler
 
 
 class HistoricalDownloadFileHandler(
-    FileHandler, ExternalAPIHandler, ExternalAPIMarketInterface, Colleague
+    FileHandler,
+    ExternalAPIHandler,
+    ExternalAPIMarketInterface,
+    HistoricalOrdersHandler,
+    Colleague,
 ):
-    def __init__(self, directory, file, mediator=None):
+    def __init__(self, directory, file, mediator=None, keyframe=None):
         super().__init__(directory=directory, file=file)
 
         if mediator:
             Colleague.__init__(self, mediator=mediator)
 
+        # the file is opened once, the first record is taken from the stream
+        # (unless resuming from a keyframe) and the market definition is
+        # tracked as the records pass so the outcome needs no further reads
+        records = super().get_file_as_generator(
+            offset=keyframe.get("offset") if keyframe else 0
+        )
+        self._first_record = super().get_first_record() if keyframe else next(records)
         self._market_definition = self._get_market_definition()
-        if self.is_correct_type() and self.__ids_match(file):
-            self._file_data = super().get_file_as_generator()
+        self._last_market_definition = self._market_definition
+        self._exhausted = False
+        self._valid_market = self.is_correct_type() and self.__ids_match(file)
+        if self._valid_market:
+            self._file_data = self.__track_market_definition(
+                records=records if keyframe else self.__prepend(records=records)
+            )
             self._data = HistoricalDownloadFileDataHandler(
                 items=self._get_items_definition(),
                 market_start_time=self.get_market_start_time(),
             )
+            if keyframe:
+                self._data.set_state(keyframe.get("state"))
             market = filter(
                 lambda record: record,
                 map(self._data.process, self._file_data),
             )
             self._market = self._gap_fill(market=market)
         else:
+            records.close()
             self._market = iter([])
 
     def is_correct_type(self):
         return self._market_definition.get("marketType") == "WIN"
 
+    def is_valid_market(self):
+        return self._valid_market
+
+    def is_exhausted(self):
+        return self._exhausted
+
     def get_market_start_time(self):
         return self._market_definition.get("marketTime")
 
@@ -66,16 +91,16 @@ class HistoricalDownloadFileHandler(
         return market_id == file_id
 
     def __get_market_id(self):
-        return super().get_first_record().get("mc")[0].get("id")
+        return self._first_record.get("mc")[0].get("id")
 
     def __make_extra_records(self, frm, time_diff):
+        # the filled seconds carry the previous record forward, they share its
+        # (never modified) items so later stages can tell nothing has changed
         for seconds in range(1, time_diff):
-            record = make_copy(frm)
-            record["extract_time"] += seconds
-            yield record
+            yield {**frm, "extract_time": frm.get("extract_time") + seconds}
 
     def _get_market_definition(self):
-        return super().get_first_record().get("mc")[0].get("marketDefinition")
+        return self._first_record.get("mc")[0].get("marketDefinition")
 
     def _get_items_definition(self):
         return self._market_definition.get("runners")
@@ -84,6 +109,9 @@ class HistoricalDownloadFileHandler(
         try:
             data = next(self._market)
             return self._mediator.notify(event="external data fetched", data=data)
+        except StopIteration:
+            self._exhausted = True
+            return None
         except:
             return None
 
@@ -93,49 +121,29 @@ class HistoricalDownloadFileHandler(
                 lambda item: item.get("id"),
                 filter(
                     lambda item: item.get("status") == "WINNER",
-                    list(self._file_data)[-1]
-                    .get("mc")[0]
-                    .get("marketDefinition")
-                    .get("runners"),
+                    self.__get_last_market_definition().get("runners"),
                 ),
             )
         )
         return outcome
 
-    def post_order(self, orders):
-
-        valid_orders = self._validate_orders(orders=orders)
-
-        if valid_orders:
-            response = list(
-                map(
-                    lambda order: {
-                        "instruction": {"selectionId": order.get("id")},
-                        "status": "SUCCESS",
-                    },
-                    valid_orders,
-                )
-            )
-
-            return self._mediator.notify(
-                data={"response": response, "orders": orders}, event="orders posted"
-            )
+    def __prepend(self, records):
+        yield self._first_record
+        yield from records
 
-        else:
-            return self._mediator.notify(event="finished processing", data=None)
+    def __track_market_definition(self, records):
+        for record in records:
+            market_definition = record.get("mc")[0].get("marketDefinition")
+            if market_definition:
+                self._last_market_definition = market_definition
+            yield record
 
-    def _validate_orders(self, orders):
-        valid_orders = list(filter(lambda order: self.__is_valid(order=order), orders))
-        return valid_orders
+    def __get_last_market_definition(self):
+        # the settled definition follows the close, so read to the end of the
+        # stream that is already open
+        for _ in self._file_data:
+            pass
+        return self._last_market_definition
 
-    def __is_valid(self, order):
-        try:
-            is_valid = (
-                order.get("id") > 0
-                and order.get("type") in ["BUY", "SELL"]
-                and order.get("ex_price") > 0
-                and order.get("size") > 0
-            )
-        except:
-            is_valid = False
-        return is_valid
+    # the interface wants its methods named on the class itself
+    post_order = HistoricalOrdersHandler.post_order
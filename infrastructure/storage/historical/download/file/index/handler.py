@@ -0,0 +1,83 @@
+from infrastructure.storage.file.handler import FileHandler
+from infrastructure.storage.historical.download.file.data.handler import (
+    HistoricalDownloadFileDataHandler,
+)
+
+from infrastructure.built_in.adapter.json_utils import make_dict, write_json_to
+from infrastructure.built_in.adapter.os_utils import (
+    get_file_path,
+    get_file_size,
+    make_directory_if_required,
+    path_exists,
+)
+
+
+class HistoricalDownloadFileIndexHandler(FileHandler):
+    def __init__(self, directory, file, interval=300, index_directory=None):
+        super().__init__(directory=directory, file=file)
+        self.__path = get_file_path(directory=directory, file=file)
+        self.__index_path = get_file_path(
+            directory=make_directory_if_required(index_directory or directory),
+            file=file + ".index.json",
+        )
+        self.__interval = interval
+
+    def get_index(self):
+        return self.load() or self.save(index=self.build())
+
+    def get_keyframe(self, before=-(60 * 5)):
+        # the records from the keyframe onwards must be processed as normal
+        # so only a keyframe taken before the first required second can be used
+        keyframes = [
+            keyframe
+            for keyframe in self.get_index().get("keyframes")
+            if keyframe.get("extract_time") < before
+        ]
+        return keyframes[-1] if keyframes else None
+
+    def build(self):
+        market_definition = self.get_first_record().get("mc")[0].get("marketDefinition")
+        data = HistoricalDownloadFileDataHandler(
+            items=market_definition.get("runners"),
+            market_start_time=market_definition.get("marketTime"),
+        )
+        keyframes = []
+        previous_extract_time = None
+        for record in self.get_file_as_generator():
+            data.process(record)
+            extract_time = data.get_extract_time()
+            if (
+                previous_extract_time is None
+                or extract_time - previous_extract_time >= self.__interval
+            ):
+                keyframes.append(
+                    {
+                        "offset": self.get_bytes_read(),
+                        "pt": record.get("pt"),
+                        "extract_time": extract_time,
+                        "state": data.get_state(),
+                    }
+                )
+                previous_extract_time = extract_time
+        return {
+            "file_size": get_file_size(self.__path),
+            "interval": self.__interval,
+            "keyframes": keyframes,
+        }
+
+    def save(self, index):
+        with open(self.__index_path, "w", encoding="utf-8") as file:
+            write_json_to(file=file, data=index)
+        return index
+
+    def load(self):
+        if not path_exists(self.__index_path):
+            return None
+        with open(self.__index_path, "r", encoding="utf-8") as file:
+            index = make_dict(file.read())
+        # an index built for a different version of the file cannot be used
+        if not index or index.get("file_size") != get_file_size(self.__path):
+            return None
+        if index.get("interval") != self.__interval:
+            return None
+        return index
@@ -1,4 +1,5 @@
 from app.market.data.interface import MarketDataRecordInterface
+from app.market.metadata.handler import MetadataHandler
 from app.market.data.utils import (
     calc_inverse_price,
     calc_sell_liability,
@@ -6,40 +7,69 @@ from app.market.data.utils import (
     is_valid_size,
 )
 
+from infrastructure.storage.historical.download.file.data.state import TickLadder
 from infrastructure.third_party.adapter.numpy_utils import not_a_number
 
 
 class HistoricalDownloadFileRecordAdapter(MarketDataRecordInterface):
+    def __init__(self, metadata=MetadataHandler()):
+        self.__items = None
+        self.__adapted_items = None
+        self.__plan = self.__make_plan(metadata=metadata)
+
     def convert(self, data):
         adapted_data = {}
         adapted_data["extract_time"] = data["extract_time"]
         adapted_data["closed_indicator"] = data["closed_indicator"]
-        adapted_data["items"] = [
-            self.__make_item(id, dict) for id, dict in data.get("items").items()
-        ]
+        adapted_data["items"] = self.__adapt_items(items=data.get("items"))
         return adapted_data
 
-    def __make_item(self, id, dict):
-        item = {
-            "id": id,
-            "sp_back_size": self.__calc_sp_back_size(dict),
-            "ex_back_size": self.__calc_ex_back_size(dict),
-            "sp_back_price": self.__get_sp_back_price(dict),
-            "ex_average_back_price": self.__calc_ex_average_back_price(dict),
-            "ex_offered_back_price": self.__get_ex_offered_back_price(dict),
-            "sp_lay_size": self.__calc_sp_lay_size(dict),
-            "ex_lay_size": self.__calc_ex_lay_size(dict),
-            "sp_lay_price": self.__calc_sp_lay_price(dict),
-            "ex_average_lay_price": self.__calc_ex_average_lay_price(dict),
-            "ex_offered_lay_price": self.__get_ex_offered_lay_price(dict),
+    def __adapt_items(self, items):
+        # gap filled seconds share the items of the record they carry forward
+        if items is not self.__items:
+            self.__items = items
+            self.__adapted_items = [
+                self.__make_item(id, dict) for id, dict in items.items()
+            ]
+        return self.__adapted_items
+
+    def __make_plan(self, metadata):
+        # the variables are looked up once for the schema, the trade totals are
+        # only worked out if a variable uses them and the liabilities only if a
+        # lay variable does
+        required_variables = metadata.get_required_variables()
+        variables = [
+            (variable, extract)
+            for variable, extract in self.__extractors
+            if variable in required_variables
+        ]
+        return {
+            "variables": variables,
+            "trades": any(
+                variable in self.__trade_variables for variable, _ in variables
+            ),
+            "liabilities": any(
+                variable in self.__liability_variables for variable, _ in variables
+            ),
+            "removal_date": "removal_date" in required_variables,
         }
-        if dict.get("removal_date"):
+
+    def __make_item(self, id, dict):
+        plan = self.__plan
+        trades = (
+            self.__get_trade_totals(
+                dict.get("ex").get("trd"), liabilities=plan.get("liabilities")
+            )
+            if plan.get("trades")
+            else None
+        )
+        item = {"id": id}
+        for variable, extract in plan.get("variables"):
+            item[variable] = extract(self, dict, trades)
+        if plan.get("removal_date") and dict.get("removal_date"):
             item["removal_date"] = dict.get("removal_date")
         return item
 
-    def __calc_ex_back_size(self, dict):
-        return self._sum_valid_sizes(dict.get("ex").get("trd"))
-
     def __calc_sp_back_size(self, dict):
         return self._sum_valid_sizes(dict.get("sp").get("spb"))
 
@@ -49,39 +79,49 @@ class HistoricalDownloadFileRecordAdapter(MarketDataRecordInterface):
     def __get_sp_back_price(self, dict):
         return dict.get("sp").get("spn")
 
-    def __calc_ex_average_back_price(self, dict):
-        valid_trades = self.__get_valid_entries(dict.get("ex").get("trd"))
-        total_size = sum(valid_trades.values())
-        return (
-            sum([price * size for price, size in valid_trades.items()]) / total_size
-            if total_size
-            else not_a_number()
+    def __get_trade_totals(self, trades, liabilities=True):
+        # a tick ladder keeps its own running totals, so only the prices which
+        # are not on the tick ladder need to be summed here
+        ladder_totals = trades.get_totals() if isinstance(trades, TickLadder) else None
+        valid_trades = self.__get_valid_entries(
+            trades.get_other() if ladder_totals else trades
         )
-
-    def __calc_ex_lay_size(self, dict):
-        return sum(self.__calc_lay_liabilities(dict.get("ex").get("trd")))
-
-    def __calc_lay_liabilities(self, dict):
-        return [
-            calc_sell_liability(price=price, size=size)
-            for price, size in self.__get_valid_entries(dict).items()
-        ]
+        totals = {
+            "size": sum(valid_trades.values()),
+            "price_size": sum([price * size for price, size in valid_trades.items()]),
+        }
+        if liabilities:
+            trade_liabilities = [
+                calc_sell_liability(price=price, size=size)
+                for price, size in valid_trades.items()
+            ]
+            totals["liability"] = sum(trade_liabilities)
+            totals["inverse_price_liability"] = sum(
+                calc_inverse_price(buy_price) * liability
+                for buy_price, liability in zip(valid_trades.keys(), trade_liabilities)
+            )
+        if ladder_totals:
+            size, price_size, liability = ladder_totals
+            totals["size"] += size
+            totals["price_size"] += price_size
+            if liabilities:
+                totals["liability"] += liability
+                # price / (price - 1) x size x (price - 1) is simply price x size
+                totals["inverse_price_liability"] += price_size
+        return totals
+
+    def __calc_ex_average_back_price(self, trades):
+        total_size = trades.get("size")
+        return trades.get("price_size") / total_size if total_size else not_a_number()
 
     def __calc_sp_lay_price(self, dict):
         sp_back_price = self.__get_sp_back_price(dict)
         return calc_inverse_price(sp_back_price)
 
-    def __calc_ex_average_lay_price(self, dict):
-        trades = dict.get("ex").get("trd")
-        valid_trades = self.__get_valid_entries(trades)
-        liabilities = self.__calc_lay_liabilities(trades)
-        total_liability = sum(liabilities)
+    def __calc_ex_average_lay_price(self, trades):
+        total_liability = trades.get("liability")
         return (
-            sum(
-                calc_inverse_price(buy_price) * liability
-                for buy_price, liability in zip(valid_trades.keys(), liabilities)
-            )
-            / total_liability
+            trades.get("inverse_price_liability") / total_liability
             if total_liability
             else not_a_number()
         )
@@ -93,13 +133,29 @@ class HistoricalDownloadFileRecordAdapter(MarketDataRecordInterface):
         return self._get_min_valid_price(dict.get("ex").get("atl"))
 
     def _get_max_valid_price(self, dict):
-        valid_prices = self.__get_valid_prices(dict)
+        valid_prices = (
+            self.__get_best_prices(dict, dict.get_max_price())
+            if isinstance(dict, TickLadder)
+            else self.__get_valid_prices(dict)
+        )
         return max(valid_prices) if valid_prices else not_a_number()
 
     def _get_min_valid_price(self, dict):
-        valid_prices = self.__get_valid_prices(dict)
+        valid_prices = (
+            self.__get_best_prices(dict, dict.get_min_price())
+            if isinstance(dict, TickLadder)
+            else self.__get_valid_prices(dict)
+        )
         return min(valid_prices) if valid_prices else not_a_number()
 
+    def __get_best_prices(self, ladder, best_price):
+        # every price on the tick ladder is valid, so only the best one and
+        # any prices which are not on the ladder need to be considered
+        valid_prices = self.__get_valid_prices(ladder.get_other())
+        if best_price is not None:
+            valid_prices.append(best_price)
+        return valid_prices
+
     def __get_valid_prices(self, dict):
         return [price for price in dict.keys() if is_valid_price(price)]
 
@@ -112,3 +168,36 @@ class HistoricalDownloadFileRecordAdapter(MarketDataRecordInterface):
             for price, size in dict.items()
             if is_valid_price(price) and is_valid_size(size)
         }
+
+    # in the order the variables are added to each item
+    __extractors = [
+        ("sp_back_size", lambda self, dict, trades: self.__calc_sp_back_size(dict)),
+        ("ex_back_size", lambda self, dict, trades: trades.get("size")),
+        ("sp_back_price", lambda self, dict, trades: self.__get_sp_back_price(dict)),
+        (
+            "ex_average_back_price",
+            lambda self, dict, trades: self.__calc_ex_average_back_price(trades),
+        ),
+        (
+            "ex_offered_back_price",
+            lambda self, dict, trades: self.__get_ex_offered_back_price(dict),
+        ),
+        ("sp_lay_size", lambda self, dict, trades: self.__calc_sp_lay_size(dict)),
+        ("ex_lay_size", lambda self, dict, trades: trades.get("liability")),
+        ("sp_lay_price", lambda self, dict, trades: self.__calc_sp_lay_price(dict)),
+        (
+            "ex_average_lay_price",
+            lambda self, dict, trades: self.__calc_ex_average_lay_price(trades),
+        ),
+        (
+            "ex_offered_lay_price",
+            lambda self, dict, trades: self.__get_ex_offered_lay_price(dict),
+        ),
+    ]
+    __trade_variables = [
+        "ex_back_size",
+        "ex_average_back_price",
+        "ex_lay_size",
+        "ex_average_lay_price",
+    ]
+    __liability_variables = ["ex_lay_size", "ex_average_lay_price"]
@@ -0,0 +1,77 @@
+from app.market.data.transform.handler import TransformHandler
+from app.market.data.transform.price.handler import PriceHandler
+from app.market.data.transform.probability.handler import ProbabilityHandler
+from app.market.metadata.schema import FeatureSchema
+from app.market.runner.handler import RunnerHandler
+
+from infrastructure.storage.historical.cache.handler import HistoricalCacheHandler
+
+
+class HistoricalFeatureStoreHandler(HistoricalCacheHandler):
+    # the records are stored as the transform makes them, so a backtest from
+    # the store skips the extraction and the transform, the transform's code
+    # is part of the key as well as the extraction's
+    def __init__(self, directory):
+        HistoricalCacheHandler.__init__(self, directory=directory)
+        schema = FeatureSchema()
+        self.__required_variables = [
+            variable for variable, _ in schema.get_required_slots()
+        ]
+        self.__variables = [
+            variable
+            for variable in schema.get_runner_variables()
+            if variable not in self.__required_variables
+        ]
+
+    @staticmethod
+    def _get_sources():
+        return HistoricalCacheHandler._get_sources() + [
+            TransformHandler,
+            PriceHandler,
+            ProbabilityHandler,
+            FeatureSchema,
+        ]
+
+    def _convert(self, records):
+        # no probabilities are fixed, the stored transform puts right the
+        # compositional data of a backtest which fixes them
+        transformer = TransformHandler(runners=RunnerHandler())
+        return [
+            self.__make_feature_record(
+                record=record,
+                transformed_data=self.__transform(
+                    transformer=transformer, record=record
+                ),
+            )
+            for record in HistoricalCacheHandler._convert(self, records=records)
+        ]
+
+    @staticmethod
+    def __transform(transformer, record):
+        # a record the transform fails on is skipped by a backtest, only its
+        # required variables are stored so the stored transform fails on it too
+        try:
+            return transformer.process(record)
+        except:
+            return {}
+
+    def __make_feature_record(self, record, transformed_data):
+        return {
+            "extract_time": record.get("extract_time"),
+            "closed_indicator": record.get("closed_indicator"),
+            "items": [
+                self.__make_feature_item(item=item, transformed_data=transformed_data)
+                for item in record.get("items")
+            ],
+        }
+
+    def __make_feature_item(self, item, transformed_data):
+        runner_id = item.get("id")
+        feature_item = {
+            variable: item.get(variable) for variable in self.__required_variables
+        }
+        for variable in self.__variables:
+            feature_item[variable] = (
+                transformed_data.get((variable, runner_id)) or [None]
+            )[0]
+        return feature_item
@@ -0,0 +1,40 @@
+class HistoricalOrdersHandler:
+    # every valid order is taken as matched when a historical market is
+    # replayed, shared by each of the handlers which replay one
+    def post_order(self, orders):
+
+        valid_orders = self._validate_orders(orders=orders)
+
+        if valid_orders:
+            response = list(
+                map(
+                    lambda order: {
+                        "instruction": {"selectionId": order.get("id")},
+                        "status": "SUCCESS",
+                    },
+                    valid_orders,
+                )
+            )
+
+            return self._mediator.notify(
+                data={"response": response, "orders": orders}, event="orders posted"
+            )
+
+        else:
+            return self._mediator.notify(event="finished processing", data=None)
+
+    def _validate_orders(self, orders):
+        valid_orders = list(filter(lambda order: self.__is_valid(order=order), orders))
+        return valid_orders
+
+    def __is_valid(self, order):
+        try:
+            is_valid = (
+                order.get("id") > 0
+                and order.get("type") in ["BUY", "SELL"]
+                and order.get("ex_price") > 0
+                and order.get("size") > 0
+            )
+        except:
+            is_valid = False
+        return is_valid
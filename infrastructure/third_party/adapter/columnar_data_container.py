@@ -0,0 +1,249 @@
+from numpy import (
+    array,
+    dtype as data_type,
+    empty,
+    full,
+    generic,
+    nan,
+    nan_to_num,
+    result_type,
+)
+
+from infrastructure.third_party.adapter.numpy_utils import make_native_type
+from app.market.data.interface import DataContainerInterface
+
+
+class ColumnarDataContainer(DataContainerInterface):
+    def __init__(self, data=None, capacity=64):
+        self.__capacity = capacity
+        self.__row_count = 0
+        self.__index = self.__allocate(dtype=float, capacity=capacity)
+        self.__columns = {}
+        self.__column_names = []
+        self.__group_names = None
+        self.__group_values = {}
+        if data:
+            self.__add_data(data)
+
+    def new(self, data=None):
+        return ColumnarDataContainer(data)
+
+    def add_rows(self, container):
+        rows = container.get_row_count()
+        if not rows:
+            return None
+
+        start = self.__row_count
+        self.__reserve(start + rows)
+
+        self.__index = self.__write(
+            column=self.__index, start=start, values=container.get_index()
+        )
+
+        incoming = container._get_columns()
+        new_names = [name for name in incoming if name not in self.__columns]
+        for name in new_names:
+            self.__columns[name] = self.__allocate(
+                dtype=float, capacity=self.__capacity
+            )
+
+        for name, column in self.__columns.items():
+            values = incoming.get(name)
+            self.__columns[name] = (
+                self.__write(column=column, start=start, values=values)
+                if values is not None
+                else self.__fill_missing(column=column, start=start, rows=rows)
+            )
+
+        self.__row_count = start + rows
+
+        if new_names:
+            self.__set_column_names(names=self.__column_names + new_names, sort=True)
+        if container._get_group_names():
+            self.__group_names = container._get_group_names()
+            self.__group_values = {}
+
+    def get_column_group_values(self, name):
+        if name not in self.__group_values:
+            self.__group_values[name] = self.__get_unique_level_values(name)
+        return list(self.__group_values[name])
+
+    def set_column_group_name(self, name=None, names=None, level=None):
+        group_names = list(self.__group_names or [None] * self.__get_level_count())
+        if names is not None:
+            group_names = list(names)
+        elif level is None:
+            group_names = [name]
+        else:
+            group_names[level] = name
+        self.__group_names = group_names
+        self.__group_values = {}
+
+    def sum_columns(self, output, columns):
+        total = sum(
+            nan_to_num(self.get_column(name=column).astype(float)) for column in columns
+        )
+        if output not in self.__columns:
+            self.__columns[output] = self.__allocate(
+                dtype=float, capacity=self.__capacity
+            )
+            self.__set_column_names(names=self.__column_names + [output])
+        self.__columns[output] = self.__write(
+            column=self.__columns[output], start=0, values=total
+        )
+
+    def get_column(self, name):
+        return self.__view(self.__columns[name])
+
+    def has_column(self, name):
+        return name in self.__columns
+
+    def get_row_count(self):
+        return self.__row_count
+
+    def get_column_count(self):
+        return len(self.__columns)
+
+    def set_index(self, columns):
+        names = columns if isinstance(columns, list) else [columns]
+        values = [self.__view(self.__columns.pop(name)) for name in names]
+        self.__index = self.__write(
+            column=self.__index,
+            start=0,
+            values=values[0] if len(values) == 1 else self.__make_tuples(values),
+        )
+        self.__set_column_names(
+            names=[name for name in self.__column_names if name in self.__columns]
+        )
+
+    def get_last_column_entry(self, name):
+        value = self.__columns[name][self.__row_count - 1]
+        return make_native_type(value) if isinstance(value, generic) else value
+
+    def get_index(self):
+        return self.__view(self.__index)
+
+    def _get_columns(self):
+        return {name: self.get_column(name) for name in self.__column_names}
+
+    def _get_group_names(self):
+        return self.__group_names
+
+    def __add_data(self, data):
+        columns = {name: self.__make_array(values) for name, values in data.items()}
+        self.__row_count = max(len(values) for values in columns.values())
+        self.__reserve(self.__row_count)
+        self.__index = self.__write(
+            column=self.__index, start=0, values=range(self.__row_count)
+        )
+        for name, values in columns.items():
+            column = self.__allocate(dtype=float, capacity=self.__capacity)
+            column = self.__write(column=column, start=0, values=values)
+            self.__columns[name] = self.__fill_missing(
+                column=column,
+                start=len(values),
+                rows=self.__row_count - len(values),
+            )
+        self.__set_column_names(names=list(columns.keys()))
+
+    def __set_column_names(self, names, sort=False):
+        if sort:
+            try:
+                names = sorted(names)
+            except TypeError:
+                pass
+        self.__column_names = names
+        self.__columns = {name: self.__columns[name] for name in names}
+        self.__group_values = {}
+
+    def __get_level_count(self):
+        first = next(iter(self.__column_names), None)
+        return len(first) if isinstance(first, tuple) else 1
+
+    def __get_unique_level_values(self, name):
+        level = (self.__group_names or []).index(name)
+        values = (
+            (column[level] if isinstance(column, tuple) else column)
+            for column in self.__column_names
+        )
+        return list(dict.fromkeys(values))
+
+    def __reserve(self, rows):
+        if rows <= self.__capacity:
+            return None
+
+        capacity = self.__capacity
+        while capacity < rows:
+            capacity *= 2
+        self.__capacity = capacity
+
+        self.__index = self.__convert(column=self.__index, dtype=self.__index.dtype)
+        for name, column in self.__columns.items():
+            self.__columns[name] = self.__convert(column=column, dtype=column.dtype)
+
+    def __write(self, column, start, values):
+        values = self.__make_array(values)
+        dtype = (
+            values.dtype if not start else self.__promote(column.dtype, values.dtype)
+        )
+        if dtype != column.dtype:
+            column = self.__convert(column=column, dtype=dtype, rows=start)
+        column[start : start + len(values)] = values
+        return column
+
+    def __fill_missing(self, column, start, rows):
+        if rows <= 0:
+            return column
+        if column.dtype.kind not in "fcO":
+            column = self.__convert(
+                column=column,
+                dtype=float if column.dtype.kind in "iu" else object,
+                rows=start,
+            )
+        column[start : start + rows] = nan
+        return column
+
+    def __convert(self, column, dtype, rows=None):
+        rows = self.__row_count if rows is None else rows
+        converted = self.__allocate(dtype=dtype, capacity=self.__capacity)
+        converted[:rows] = column[:rows]
+        return converted
+
+    def __view(self, column):
+        view = column[: self.__row_count]
+        view.flags.writeable = False
+        return view
+
+    @staticmethod
+    def __allocate(dtype, capacity):
+        return (
+            full(capacity, nan, dtype=dtype)
+            if data_type(dtype).kind in "fcO"
+            else empty(capacity, dtype=dtype)
+        )
+
+    @staticmethod
+    def __make_array(values):
+        converted = array(values)
+        if converted.dtype.kind in "USO" or converted.ndim != 1:
+            converted = ColumnarDataContainer.__make_object_array(values)
+        return converted
+
+    @staticmethod
+    def __make_tuples(values):
+        return ColumnarDataContainer.__make_object_array(list(zip(*values)))
+
+    @staticmethod
+    def __make_object_array(values):
+        converted = empty(len(values), dtype=object)
+        for position, value in enumerate(values):
+            converted[position] = value
+        return converted
+
+    @staticmethod
+    def __promote(current, incoming):
+        if current == incoming:
+            return current
+        if current.kind in "iuf" and incoming.kind in "iuf":
+            return result_type(current, incoming)
+        return object
@@ -1,4 +1,4 @@
-from numpy import isnan, nan, log, nan_to_num, floor
+from numpy import isnan, nan, log, nan_to_num, floor, full, vstack
 
 
 def calculate_log(expression):
@@ -23,3 +23,13 @@ def make_native_type(value):
 
 def round_down(value):
     return int(floor(value))
+
+
+def stack_arrays(rows):
+    return vstack(rows).astype(float)
+
+
+def calculate_log_returns(values):
+    returns = full(values.shape, nan)
+    returns[..., 1:] = log(values[..., 1:] / values[..., :-1])
+    return returns
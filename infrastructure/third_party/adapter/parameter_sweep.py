@@ -0,0 +1,316 @@
+from numpy import (
+    argwhere,
+    array,
+    errstate,
+    full,
+    isfinite,
+    isnan,
+    log,
+    maximum,
+    minimum,
+    nan,
+    ones,
+    round as round_array,
+    where,
+    zeros,
+)
+
+
+class BatchParameterSweep:
+    # the decisions of the models and the orders handler for every point of a
+    # grid of parameters at once, each row of the arrays is one grid point and
+    # each column one runner, only what follows from the orders already made is
+    # carried from one tick to the next
+    def __init__(self, grid, bank=5000, event_country="AU", min_size=5):
+        self.__grid_size = len(grid)
+        self.__parameters = {
+            name: array([point.get(name) for point in grid], dtype=float)[:, None]
+            for name in (grid[0] if grid else {})
+        }
+        self.__bank = bank
+        self.__event_country = event_country
+        self.__min_size = min_size
+        self.__orders = None
+
+    def run(self, ticks):
+        self.__orders = [[] for _ in range(self.__grid_size)]
+        if not (ticks and self.__grid_size):
+            return
+        ids, features = self.__make_features(ticks=ticks)
+        state = self.__make_state(runner_count=len(ids), features=features)
+        previous = None
+        with errstate(divide="ignore", invalid="ignore", over="ignore"):
+            for index, tick in enumerate(features):
+                placed = self.__run_tick(tick=tick, previous=previous, state=state)
+                if placed is not None:
+                    self.__add_orders(ids=ids, index=index, placed=placed)
+                    state["ordered"] |= placed.get("placed")
+                previous = tick
+
+    def get_orders(self):
+        return self.__orders
+
+    @staticmethod
+    def __make_features(ticks):
+        # every runner seen in the market has a column, those missing from a
+        # tick are not present and have no values
+        ids = sorted({runner_id for tick in ticks for runner_id in tick.get("id")})
+        columns = {runner_id: column for column, runner_id in enumerate(ids)}
+        features = []
+        for tick in ticks:
+            indexes = [columns[runner_id] for runner_id in tick.get("id")]
+            values = {
+                "present": zeros(len(ids), dtype=bool),
+                "inverse": full((len(ids), 2, 2), nan),
+                "origin": float(tick.get("origin")),
+                "extract_time": float(tick.get("extract_time")),
+            }
+            values["present"][indexes] = True
+            values["inverse"][indexes] = tick.get("inverse")
+            for name, feature in BatchParameterSweep.__features.items():
+                values[name] = full(len(ids), nan)
+                values[name][indexes] = array(tick.get(feature), dtype=float)
+            features.append(values)
+        return ids, features
+
+    def __make_state(self, runner_count, features):
+        return {
+            "ordered": zeros((self.__grid_size, runner_count), dtype=bool),
+            "product": ones(self.__grid_size),
+            "zeros": zeros(self.__grid_size),
+            "fixed_probability": zeros((self.__grid_size, 1)),
+            "sp_scale": ones((self.__grid_size, 1)),
+            "wy": zeros((self.__grid_size, runner_count)),
+            "wxy": zeros((self.__grid_size, runner_count)),
+            "x_origin": features[0].get("extract_time"),
+        }
+
+    def __run_tick(self, tick, previous, state):
+        # a runner with an order has a fixed probability so is no longer given
+        # to the models, nor counted in the back size of the market
+        present = tick.get("present") & ~state.get("ordered")
+        sp_scale = self.__calc_scale(
+            probability=tick.get("sp_probability"), present=present, state=state
+        )
+        self.__add_scale_change(
+            tick=tick, previous=previous, sp_scale=sp_scale, state=state
+        )
+        if not present.any():
+            return None
+
+        parameters = self.__parameters
+        back_size = tick.get("back_size")
+        price = tick.get("price")
+        returns_price = tick.get("returns_price")
+
+        market_back_size = where(present, back_size, 0).sum(axis=1, keepdims=True)
+        share = back_size / market_back_size
+
+        sp_probability = sp_scale * tick.get("sp_probability")
+        ex_average_probability = self.__calc_scale(
+            probability=tick.get("ex_average_probability"),
+            present=present,
+            state=state,
+        ) * tick.get("ex_average_probability")
+        alpha, Beta = self.__correct_regression(tick=tick, state=state)
+
+        wlr = (
+            present
+            & (Beta < 0)
+            & (alpha < parameters.get("alpha"))
+            & (
+                (
+                    (back_size >= parameters.get("wlr_back_size"))
+                    & (self.__event_country != "GB")
+                )
+                | (back_size >= parameters.get("wlr_gb_back_size"))
+            )
+            & (sp_probability > (1 / returns_price))
+        )
+        high = (
+            (price > parameters.get("back_price"))
+            & (share >= parameters.get("back_size_share"))
+            & (back_size >= parameters.get("high_back_size"))
+        )
+        low = (
+            (price <= parameters.get("back_price"))
+            & (share >= maximum(parameters.get("back_size_share"), 1 / price))
+            & (back_size >= parameters.get("low_back_size"))
+        )
+        back_size_model = (
+            present
+            & ~wlr
+            & (self.__event_country == "AU")
+            & (high | low)
+            & (ex_average_probability > (1 / returns_price))
+        )
+        signal = wlr | back_size_model
+        if not signal.any():
+            return None
+
+        probability = where(wlr, sp_probability, ex_average_probability)
+        risk_percentage = self.__calc_risk_percentage(
+            probability=probability, price=returns_price
+        )
+        candidate = (
+            signal
+            & (risk_percentage > 0)
+            & (self.__min_size / self.__bank < risk_percentage)
+        )
+        reduced_risk_percentage = self.__calc_reduced_risk_percentage(
+            risk_percentage=risk_percentage, candidate=candidate, state=state
+        )
+        size = round_array(maximum(reduced_risk_percentage, 0) * self.__bank, 2)
+        placed = (
+            candidate
+            & (size > self.__min_size)
+            & (probability > 0)
+            & (probability < 1)
+            & (price > 0)
+            & (self.__min_size / self.__bank < reduced_risk_percentage)
+        )
+        if not placed.any():
+            return None
+
+        self.__add_risk(
+            state=state, factors=where(placed, 1 - reduced_risk_percentage, 1)
+        )
+        state["fixed_probability"] = state.get("fixed_probability") + where(
+            placed, probability, 0
+        ).sum(axis=1, keepdims=True)
+        return {
+            "placed": placed,
+            "wlr": wlr,
+            "high": high,
+            "probability": probability,
+            "risk_percentage": reduced_risk_percentage,
+            "size": size,
+            "price": price,
+            "returns_price": returns_price,
+        }
+
+    @staticmethod
+    def __calc_scale(probability, present, state):
+        # the probability of a runner with an order is fixed and the others
+        # share what remains, in proportion to their probabilities in the replay
+        fixed_probability = state.get("fixed_probability")
+        counted = present & ~isnan(probability)
+        return where(
+            fixed_probability > 0,
+            (1 - fixed_probability)
+            / where(counted, probability, 0).sum(axis=1, keepdims=True),
+            1,
+        )
+
+    @staticmethod
+    def __add_scale_change(tick, previous, sp_scale, state):
+        # a change of scale is a change to the log return of every runner's sp
+        # price, added to the sums of the regression with the weight it is given
+        change = log(state.get("sp_scale")) - log(sp_scale)
+        state["sp_scale"] = sp_scale
+        if previous is None or not change.any():
+            return
+        change = where(isfinite(change), change, 0)
+        back_size = tick.get("back_size")
+        kept = (
+            ~isnan(tick.get("sp_probability"))
+            & ~isnan(previous.get("sp_probability"))
+            & ~isnan(back_size)
+        )
+        weight = where(kept, log(maximum(back_size, 1)), 0)
+        x = tick.get("extract_time") - state.get("x_origin")
+        state["wy"] = state.get("wy") + weight * change
+        state["wxy"] = state.get("wxy") + weight * x * change
+
+    @staticmethod
+    def __correct_regression(tick, state):
+        alpha = tick.get("alpha")
+        Beta = tick.get("Beta")
+        if not state.get("fixed_probability").any():
+            return alpha, Beta
+        inverse = tick.get("inverse")
+        origin = tick.get("origin")
+        wy = state.get("wy")
+        wxy = state.get("wxy") - (origin - state.get("x_origin")) * wy
+        alpha_change = inverse[:, 1, 0] * wy + inverse[:, 1, 1] * wxy
+        Beta_change = inverse[:, 0, 0] * wy + inverse[:, 0, 1] * wxy
+        return (
+            alpha + alpha_change,
+            Beta + Beta_change - alpha_change * origin,
+        )
+
+    def __calc_risk_percentage(self, probability, price):
+        kelly_fraction = self.__parameters.get("kelly_fraction")
+        returns = (price * probability) ** kelly_fraction
+        risk_percentage = minimum(
+            maximum(
+                (returns - (1 - probability) ** kelly_fraction)
+                / (returns + (price * (1 - probability)) ** kelly_fraction),
+                0,
+            ),
+            self.__parameters.get("cap"),
+        )
+        can_calculate = (
+            ((probability * price) - 1 > 0) & (price > 0) & (probability > 0)
+        )
+        return where(can_calculate, risk_percentage, 0)
+
+    @staticmethod
+    def __calc_reduced_risk_percentage(risk_percentage, candidate, state):
+        # as the orders handler, each risk is reduced by (1 - risk) of every
+        # other runner and of the orders already made, but only when there is
+        # more than one new order, none of the runners have an order yet
+        factors = where(candidate, 1 - risk_percentage, 1)
+        is_zero = factors == 0
+        factors = where(is_zero, 1, factors)
+        total_product = state.get("product") * factors.prod(axis=1)
+        total_zeros = state.get("zeros") + is_zero.sum(axis=1)
+        excluded = where(
+            total_zeros[:, None] > is_zero, 0, total_product[:, None] / factors
+        )
+        multiple = candidate.sum(axis=1, keepdims=True) > 1
+        return where(multiple, risk_percentage * excluded, risk_percentage)
+
+    @staticmethod
+    def __add_risk(state, factors):
+        is_zero = factors == 0
+        state["product"] = state.get("product") * where(is_zero, 1, factors).prod(
+            axis=1
+        )
+        state["zeros"] = state.get("zeros") + is_zero.sum(axis=1)
+
+    def __add_orders(self, ids, index, placed):
+        for point, column in argwhere(placed.get("placed")):
+            self.__orders[point].append(
+                {
+                    "id": ids[column],
+                    "tick": index,
+                    "model_id": self.__get_model_id(
+                        placed=placed, point=point, column=column
+                    ),
+                    "probability": placed.get("probability")[point, column].item(),
+                    "type": "BUY",
+                    "ex_price": placed.get("price")[column].item(),
+                    "returns_price": placed.get("returns_price")[column].item(),
+                    "risk_percentage": placed.get("risk_percentage")[
+                        point, column
+                    ].item(),
+                    "size": placed.get("size")[point, column].item(),
+                }
+            )
+
+    @staticmethod
+    def __get_model_id(placed, point, column):
+        if placed.get("wlr")[point, column]:
+            return "SPMB"
+        return "MBG2" if placed.get("high")[point, column] else "MBL2"
+
+    __features = {
+        "back_size": "combined_back_size_pit",
+        "price": "ex_offered_back_price_pit",
+        "returns_price": "ex_offered_back_price_mc_pit",
+        "sp_probability": "compositional_sp_probability_pit",
+        "ex_average_probability": "compositional_ex_average_probability_pit",
+        "alpha": "alpha",
+        "Beta": "Beta",
+    }
@@ -0,0 +1,128 @@
+from numpy import array, array_equal, full, load, nan, save, zeros
+
+from infrastructure.built_in.adapter.os_utils import get_file_path
+
+
+def make_record_arrays(records, variables):
+    ids = []
+    positions = {}
+    for record in records:
+        for item in record.get("items"):
+            if item.get("id") not in positions:
+                positions[item.get("id")] = len(ids)
+                ids.append(item.get("id"))
+
+    shape = (len(ids), len(records))
+    values = full(shape + (len(variables),), nan)
+    present = zeros(shape, dtype=bool)
+    missing = zeros(shape + (len(variables),), dtype=bool)
+    removal_dates = {}
+    previous_removal_dates = {}
+
+    for second, record in enumerate(records):
+        for item in record.get("items"):
+            runner = positions.get(item.get("id"))
+            present[runner, second] = True
+            for variable, name in enumerate(variables):
+                value = item.get(name)
+                if value is None:
+                    missing[runner, second, variable] = True
+                else:
+                    values[runner, second, variable] = value
+            # a removal date is only stored when it changes
+            removal_date = item.get("removal_date")
+            if removal_date != previous_removal_dates.get(runner):
+                removal_dates.setdefault(str(runner), []).append([second, removal_date])
+                previous_removal_dates[runner] = removal_date
+
+    arrays = {
+        "values": values,
+        "present": present,
+        "missing": missing,
+        "extract_time": array(
+            [record.get("extract_time") for record in records], dtype="int64"
+        ),
+        "closed_indicator": array(
+            [bool(record.get("closed_indicator")) for record in records], dtype=bool
+        ),
+    }
+    header = {"ids": ids, "variables": variables, "removal_dates": removal_dates}
+    return arrays, header
+
+
+def iterate_records(arrays, header):
+    ids = header.get("ids")
+    variables = header.get("variables")
+    removal_dates = {
+        int(runner): dict(changes)
+        for runner, changes in header.get("removal_dates").items()
+    }
+    current_removal_dates = {}
+    values = arrays.get("values")
+    present = arrays.get("present")
+    missing = arrays.get("missing")
+    has_missing = bool(missing.any())
+    removal_seconds = {
+        second for changes in removal_dates.values() for second in changes
+    }
+    items = None
+
+    for second, extract_time in enumerate(arrays.get("extract_time").tolist()):
+        # an unchanged second keeps the items of the one before so the
+        # transform can carry its output forward as it does for downloads
+        if (
+            items is None
+            or second in removal_seconds
+            or not __is_unchanged(arrays=arrays, second=second, has_missing=has_missing)
+        ):
+            rows = values[:, second, :].tolist()
+            present_runners = present[:, second].tolist()
+            items = []
+            for runner, runner_id in enumerate(ids):
+                if second in removal_dates.get(runner, {}):
+                    current_removal_dates[runner] = removal_dates.get(runner).get(
+                        second
+                    )
+                if not present_runners[runner]:
+                    continue
+                item = {"id": runner_id}
+                item.update(zip(variables, rows[runner]))
+                if has_missing:
+                    for variable in missing[runner, second, :].nonzero()[0].tolist():
+                        item[variables[variable]] = None
+                if current_removal_dates.get(runner):
+                    item["removal_date"] = current_removal_dates.get(runner)
+                items.append(item)
+        yield {
+            "extract_time": extract_time,
+            "closed_indicator": bool(arrays.get("closed_indicator")[second]),
+            "items": items,
+        }
+
+
+def __is_unchanged(arrays, second, has_missing):
+    names = ["values", "present"] + (["missing"] if has_missing else [])
+    return all(
+        array_equal(
+            arrays.get(name)[:, second],
+            arrays.get(name)[:, second - 1],
+            equal_nan=name == "values",
+        )
+        for name in names
+    )
+
+
+def save_arrays(directory, arrays):
+    for name, values in arrays.items():
+        save(get_file_path(directory=directory, file=name + ".npy"), values)
+    return directory
+
+
+def load_arrays(directory, names, memory_map=True):
+    return {
+        name: load(
+            get_file_path(directory=directory, file=name + ".npy"),
+            mmap_mode="r" if memory_map else None,
+        )
+        for name in names
+    }
@@ -1,3 +1,5 @@
+from numpy import array, full, isnan, log, maximum, nanmean, stack, where
+from numpy.linalg import pinv
 from statsmodels.api import WLS, add_constant
 
 from app.market.model.interface import WeightedLinearRegressionInterface
@@ -10,15 +12,20 @@ from infrastructure.third_party.adapter.numpy_utils import (
 
 
 class WeightedLinearRegression(WeightedLinearRegressionInterface):
-    def __init__(self):
+    def __init__(self, incremental=False):
         self.__y = None
         self.__x = None
         self.__weights = None
         self.__alpha = None
         self.__Beta = None
         self.__data = None
+        self.__incremental = incremental
+        self.__statistics = {}
+
+    def run(self, y, x, weights, key=None):
+        if self.__incremental and key is not None:
+            return self.__run_incremental(y=y, x=x, weights=weights, key=key)
 
-    def run(self, y, x, weights):
         self.__y = y
         self.__x = x
         self.__weights = self.__calc_log_weights(weights=weights)
@@ -30,12 +37,37 @@ class WeightedLinearRegression(WeightedLinearRegressionInterface):
                 self.__run_model()
         self.__data = {"alpha": self.__alpha, "Beta": self.__Beta}
 
+    def add(self, y, x, weights, key):
+        # only the observations made since the last call for the key are given,
+        # so the cost of a call does not grow with the length of the series
+        self.__alpha = not_a_number()
+        self.__Beta = not_a_number()
+        if len(y) == len(x) and len(y) == len(weights):
+            statistics = self.__statistics.get(key)
+            if statistics is None:
+                statistics = self.__make_statistics()
+                self.__statistics[key] = statistics
+            self.__add_observations(statistics=statistics, y=y, x=x, weights=weights)
+            statistics["observations"] += len(y)
+            if statistics.get("valid_records") >= 3:
+                self.__solve_statistics(statistics=statistics)
+        self.__data = {"alpha": self.__alpha, "Beta": self.__Beta}
+
     def get_alpha(self):
         return self.__data.get("alpha")
 
     def get_Beta(self):
         return self.__data.get("Beta")
 
+    def is_incremental(self):
+        return self.__incremental
+
+    def reset(self, key=None):
+        if key is None:
+            self.__statistics = {}
+        else:
+            self.__statistics.pop(key, None)
+
     def __run_model(self):
 
         X = add_constant(self.__x)
@@ -64,3 +96,142 @@ class WeightedLinearRegression(WeightedLinearRegressionInterface):
             ):
                 valid_records += 1
         return valid_records
+
+    def __run_incremental(self, y, x, weights, key):
+        self.__alpha = not_a_number()
+        self.__Beta = not_a_number()
+        if len(y) == len(x) and len(y) == len(weights):
+            statistics = self.__update_statistics(y=y, x=x, weights=weights, key=key)
+            if statistics.get("valid_records") >= 3:
+                self.__solve_statistics(statistics=statistics)
+        self.__data = {"alpha": self.__alpha, "Beta": self.__Beta}
+
+    def __update_statistics(self, y, x, weights, key):
+        statistics = self.__statistics.get(key)
+        if statistics is None or statistics.get("observations") > len(y):
+            statistics = self.__make_statistics()
+            self.__statistics[key] = statistics
+
+        start = statistics.get("observations")
+        if start == len(y):
+            return statistics
+
+        self.__add_observations(
+            statistics=statistics, y=y[start:], x=x[start:], weights=weights[start:]
+        )
+        statistics["observations"] = len(y)
+        return statistics
+
+    @staticmethod
+    def __add_observations(statistics, y, x, weights):
+        new_y = array(y, dtype=float)
+        new_x = array(x, dtype=float)
+        new_weights = log(maximum(array(weights, dtype=float), 1))
+
+        # rows with any missing value are dropped, as with missing="drop"
+        keep = ~(isnan(new_y) | isnan(new_x) | isnan(new_weights))
+        new_y = new_y[keep]
+        new_x = new_x[keep]
+        new_weights = new_weights[keep]
+
+        if statistics.get("origin") is None and len(new_x):
+            statistics["origin"] = new_x[0]
+        new_x = new_x - (statistics.get("origin") or 0)
+
+        statistics["valid_records"] += int((new_weights > 0).sum())
+        statistics["w"] += new_weights.sum()
+        statistics["wx"] += (new_weights * new_x).sum()
+        statistics["wy"] += (new_weights * new_y).sum()
+        statistics["wxx"] += (new_weights * new_x * new_x).sum()
+        statistics["wxy"] += (new_weights * new_x * new_y).sum()
+
+    def __solve_statistics(self, statistics):
+        # solve the 2x2 normal equations with the same pseudo-inverse used by WLS
+        Beta, alpha = pinv(
+            array(
+                [
+                    [statistics.get("w"), statistics.get("wx")],
+                    [statistics.get("wx"), statistics.get("wxx")],
+                ]
+            )
+        ).dot(array([statistics.get("wy"), statistics.get("wxy")]))
+        self.__alpha = alpha
+        self.__Beta = Beta - alpha * statistics.get("origin")
+
+    @staticmethod
+    def __make_statistics():
+        return {
+            "observations": 0,
+            "valid_records": 0,
+            "origin": None,
+            "w": 0.0,
+            "wx": 0.0,
+            "wy": 0.0,
+            "wxx": 0.0,
+            "wxy": 0.0,
+        }
+
+
+class BatchWeightedLinearRegression(WeightedLinearRegressionInterface):
+    def __init__(self):
+        self.__data = None
+
+    def run(self, y, x, weights):
+        y = array(y, dtype=float, ndmin=2)
+        x = array(x, dtype=float)
+        weights = log(maximum(array(weights, dtype=float, ndmin=2), 1))
+        self.__data = {
+            "alpha": full(len(y), not_a_number()),
+            "Beta": full(len(y), not_a_number()),
+            "inverse": full((len(y), 2, 2), not_a_number()),
+            "origin": not_a_number(),
+        }
+        if y.shape == weights.shape and y.shape[1] == len(x):
+            self.__run_model(y=y, x=x, weights=weights)
+
+    def get_alpha(self):
+        return self.__data.get("alpha")
+
+    def get_Beta(self):
+        return self.__data.get("Beta")
+
+    def get_inverse(self):
+        # the fit is linear in y, so with these a change to y can be applied
+        # to alpha and Beta without fitting again
+        return self.__data.get("inverse")
+
+    def get_origin(self):
+        return self.__data.get("origin")
+
+    def __run_model(self, y, x, weights):
+        # rows with any missing value are dropped, as with missing="drop"
+        keep = ~(isnan(y) | isnan(x) | isnan(weights))
+        valid_records = (keep & (weights > 0)).sum(axis=1)
+
+        origin = nanmean(x) if (~isnan(x)).any() else 0
+        x = where(keep, x - origin, 0)
+        y = where(keep, y, 0)
+        weights = where(keep, weights, 0)
+
+        w = weights.sum(axis=1)
+        wx = (weights * x).sum(axis=1)
+        wy = (weights * y).sum(axis=1)
+        wxx = (weights * x * x).sum(axis=1)
+        wxy = (weights * x * y).sum(axis=1)
+
+        # solve every runner's 2x2 normal equations in one stacked pseudo-inverse
+        params = pinv(
+            stack([stack([w, wx], axis=-1), stack([wx, wxx], axis=-1)], axis=1)
+        )
+        Beta = params[:, 0, 0] * wy + params[:, 0, 1] * wxy
+        alpha = params[:, 1, 0] * wy + params[:, 1, 1] * wxy
+
+        enough = valid_records >= 3
+        alpha = where(enough, alpha, not_a_number())
+        Beta = where(enough, Beta - alpha * origin, not_a_number())
+        self.__data = {
+            "alpha": alpha,
+            "Beta": Beta,
+            "inverse": params,
+            "origin": origin,
+        }
@@ -0,0 +1,182 @@
+from bz2 import open as open_bz2
+from json import dumps
+
+from pytest import mark
+
+from tests.utils import (
+    GIVEN,
+    WHEN,
+    THEN,
+    get_test_file_path,
+    cleanup_test_directory,
+)
+
+from app.backtest.handler import BacktestHandler, run_market
+
+from benchmarks.generator import MarketGenerator
+
+from infrastructure.built_in.adapter.os_utils import remove_file, remove_tree
+
+
+def test_get_paths():
+    GIVEN("a directory containing historical files and another file")
+    names = ["1.163093692.bz2", "1.156749791.bz2", "notes.txt"]
+    paths = [get_test_file_path(name=name) for name in names]
+    for path in paths:
+        open(path, "w+", encoding="utf-8").close()
+
+    WHEN("we create a backtest handler for the directory")
+    handler = BacktestHandler(path=paths[0].replace(names[0], ""), processes=1)
+    THEN("only the historical files are going to be run")
+    assert handler.get_paths() == [paths[1], paths[0]]
+
+    WHEN("we create a backtest handler for a pattern")
+    handler = BacktestHandler(path=paths[0].replace(names[0], "*.txt"), processes=1)
+    THEN("only the files matching the pattern are going to be run")
+    assert handler.get_paths() == [paths[2]]
+
+    for path in paths:
+        remove_file(path=path)
+    cleanup_test_directory()
+
+
+def test_aggregate():
+    GIVEN("the results of two markets and a backtest handler")
+    markets = [
+        {"path": "./b.bz2", "orders": [{"id": 1}, {"id": 2}], "records": 300},
+        {"path": "./a.bz2", "orders": [], "records": 301},
+    ]
+    handler = BacktestHandler(path="./non_existent_directory", processes=1)
+    WHEN("we aggregate the results")
+    results = handler._aggregate(markets=markets, seconds=36)
+    THEN("the markets are ordered by their path")
+    assert [market.get("path") for market in results.get("markets")] == [
+        "./a.bz2",
+        "./b.bz2",
+    ]
+    THEN("the totals are correct")
+    assert results.get("market_count") == 2
+    assert results.get("order_count") == 2
+    assert results.get("record_count") == 601
+    assert results.get("seconds") == 36
+    assert results.get("markets_per_hour") == 200
+
+
+@mark.slow
+def test_run_market():
+    GIVEN("a historical file with the correct market type")
+    path = "./dev/1.163093692.bz2"
+    WHEN("we run the market")
+    result = run_market(path=path)
+    THEN("the market has been run to completion without exiting")
+    assert result.get("market_id") == "1.163093692"
+    assert result.get("path") == path
+    assert result.get("records") > 200
+    assert result.get("seconds") > 0
+    THEN("the outcome of the market is included")
+    assert result.get("outcome") == 19795432
+    THEN("the orders made are included")
+    assert isinstance(result.get("orders"), list)
+
+
+def test_run_market_incorrect_type():
+    GIVEN("a historical file with the incorrect market type")
+    path = "./dev/1.156749791.bz2"
+    WHEN("we run the market")
+    result = run_market(path=path)
+    THEN("no result is returned")
+    assert result is None
+
+
+def test_run_malformed_file():
+    GIVEN("a directory with a malformed historical file among valid ones")
+    paths = [
+        get_test_file_path(name=name)
+        for name in ["1.999999997.bz2", "1.999999998.bz2", "1.999999999.bz2"]
+    ]
+    for path, market_id in [(paths[0], "1.999999997"), (paths[2], "1.999999999")]:
+        generator = MarketGenerator(duration=20, market_id=market_id)
+        with open_bz2(path, "wt", encoding="utf-8") as file:
+            for record in generator.get_stream_records():
+                file.write(dumps(record) + "\n")
+    with open(paths[1], "w", encoding="utf-8") as file:
+        file.write("not a compressed file")
+    handler = BacktestHandler(path=paths[0].replace("1.999999997.bz2", ""), processes=1)
+
+    WHEN("we run the malformed market on its own")
+    THEN("no result is returned")
+    assert run_market(path=paths[1]) is None
+
+    WHEN("we run the backtest")
+    results = handler.run()
+    THEN("the valid markets still have results")
+    assert [market.get("market_id") for market in results.get("markets")] == [
+        "1.999999997",
+        "1.999999999",
+    ]
+
+    for path in paths:
+        remove_file(path=path)
+    cleanup_test_directory()
+
+
+@mark.slow
+def test_run():
+    GIVEN("a backtest handler for a directory of historical files")
+    handler = BacktestHandler(path="./dev", processes=2)
+    WHEN("we run the backtest")
+    results = handler.run()
+    THEN("only the markets with the correct type have results")
+    assert [market.get("market_id") for market in results.get("markets")] == [
+        "1.163093692"
+    ]
+    assert results.get("market_count") == 1
+    assert results.get("markets_per_hour") > 0
+
+
+def test_run_market_from_cache():
+    GIVEN("a historical file and a cache directory")
+    path = get_test_file_path(name="1.999999999.bz2")
+    with open_bz2(path, "wt", encoding="utf-8") as file:
+        for record in MarketGenerator(duration=60).get_stream_records():
+            file.write(dumps(record) + "\n")
+    cache_directory = get_test_file_path(name="cache")
+    WHEN("we run the market without and then twice with the cache")
+    expected = run_market(path=path)
+    built = run_market(path=path, cache_directory=cache_directory)
+    loaded = run_market(path=path, cache_directory=cache_directory)
+    THEN("the results are the same each time")
+    for result in [built, loaded]:
+        assert result.get("market_id") == expected.get("market_id")
+        assert result.get("orders") == expected.get("orders")
+        assert result.get("outcome") == expected.get("outcome")
+        assert result.get("records") == expected.get("records")
+    remove_file(path=path)
+    remove_tree(path=cache_directory)
+    cleanup_test_directory()
+
+
+def test_run_market_feature_store():
+    GIVEN("a historical file and a feature store")
+    path = get_test_file_path(name="1.999999999.bz2")
+    generator = MarketGenerator(runners=6, duration=90, seed=3)
+    with open_bz2(path, "wt", encoding="utf-8") as file:
+        for record in generator.get_stream_records():
+            file.write(dumps(record) + "\n")
+    feature_directory = get_test_file_path(name="features")
+
+    WHEN("we run the market from the file and twice from the store")
+    expected = run_market(path=path)
+    built = run_market(path=path, feature_directory=feature_directory)
+    loaded = run_market(path=path, feature_directory=feature_directory)
+
+    THEN("the same orders are made each time")
+    assert expected.get("orders")
+    for result in [built, loaded]:
+        assert result.get("market_id") == expected.get("market_id")
+        assert result.get("outcome") == expected.get("outcome")
+        assert result.get("orders") == expected.get("orders")
+
+    remove_file(path=path)
+    remove_tree(path=feature_directory)
+    cleanup_test_directory()
@@ -0,0 +1,158 @@
+from bz2 import open as open_bz2
+from json import dumps
+
+from tests.utils import GIVEN, WHEN, THEN, get_test_file_path, cleanup_test_directory
+
+from app.backtest.handler import run_market
+from app.backtest.sweep.handler import SweepHandler, sweep_market
+from app.market.model.handler import ModelHandler
+
+from benchmarks.generator import MarketGenerator
+
+from infrastructure.built_in.adapter.os_utils import remove_file
+from infrastructure.third_party.adapter.stats_model import (
+    BatchWeightedLinearRegression,
+    WeightedLinearRegression,
+)
+
+
+def test_make_grid():
+    GIVEN("values for two of the parameters")
+    parameters = {"alpha": [-0.00001, -0.0001], "cap": [0.02, 0.05, 0.1]}
+    WHEN("we make the grid")
+    grid = SweepHandler.make_grid(parameters=parameters)
+    THEN("there is a point for every combination of the values")
+    assert len(grid) == 6
+    assert [(point.get("alpha"), point.get("cap")) for point in grid] == [
+        (-0.00001, 0.02),
+        (-0.00001, 0.05),
+        (-0.00001, 0.1),
+        (-0.0001, 0.02),
+        (-0.0001, 0.05),
+        (-0.0001, 0.1),
+    ]
+    THEN("the other parameters keep their default values")
+    for point in grid:
+        assert point.get("wlr_back_size") == 5000
+        assert point.get("back_size_share") == 0.6
+        assert point.get("kelly_fraction") == 1
+
+    WHEN("we make the grid without any values")
+    grid = SweepHandler.make_grid(parameters={})
+    THEN("there is a single point with the default values")
+    assert len(grid) == 1
+
+
+def test_aggregate():
+    GIVEN("a sweep handler with two grid points and the results of two markets")
+    handler = SweepHandler(
+        path="./non_existent_directory",
+        parameters={"cap": [0.05, 0.1]},
+        processes=1,
+    )
+    markets = [
+        {
+            "path": "./b.bz2",
+            "outcome": 1,
+            "records": 300,
+            "orders": [
+                [{"id": 1, "size": 10, "returns_price": 3.5}],
+                [
+                    {"id": 1, "size": 20, "returns_price": 3.5},
+                    {"id": 2, "size": 10, "returns_price": 2.0},
+                ],
+            ],
+        },
+        {
+            "path": "./a.bz2",
+            "outcome": None,
+            "records": 301,
+            "orders": [[], [{"id": 3, "size": 15, "returns_price": 4.0}]],
+        },
+    ]
+    WHEN("we aggregate the results")
+    results = handler._aggregate(markets=markets, seconds=36)
+    THEN("there are results for each grid point")
+    points = results.get("points")
+    assert [point.get("parameters").get("cap") for point in points] == [0.05, 0.1]
+    THEN("the orders of each point are totalled")
+    assert points[0].get("market_count") == 1
+    assert points[0].get("order_count") == 1
+    assert points[0].get("stake") == 10
+    assert points[0].get("profit") == 25
+    assert points[1].get("market_count") == 2
+    assert points[1].get("order_count") == 3
+    assert points[1].get("stake") == 45
+    THEN("only the orders of settled markets count towards the profit")
+    assert points[1].get("settled_stake") == 30
+    assert points[1].get("profit") == 40
+    THEN("the totals of the markets are correct")
+    assert results.get("market_count") == 2
+    assert results.get("record_count") == 601
+    assert results.get("markets_per_hour") == 200
+
+
+def test_sweep_market_matches_backtest():
+    GIVEN("a historical file and a grid of two values of the alpha threshold")
+    path = get_test_file_path(name="1.999999999.bz2")
+    with open_bz2(path, "wt", encoding="utf-8") as file:
+        for record in MarketGenerator(
+            runners=6, duration=90, seed=3
+        ).get_stream_records():
+            file.write(dumps(record) + "\n")
+    grid = SweepHandler.make_grid(parameters={"alpha": [-0.00001, -0.0001]})
+
+    WHEN("we sweep the market and run a backtest for each grid point")
+    result = sweep_market(path=path, grid=grid)
+    expected = [
+        run_market(
+            path=path,
+            models=ModelHandler(
+                mediator=None,
+                wls_model=WeightedLinearRegression(),
+                batch_wls_model=BatchWeightedLinearRegression(),
+                thresholds={"alpha": point.get("alpha")},
+            ),
+        )
+        for point in grid
+    ]
+
+    THEN("the market is the one that was backtested")
+    assert result.get("market_id") == expected[0].get("market_id")
+    assert result.get("outcome") == expected[0].get("outcome")
+    assert result.get("records") == expected[0].get("records")
+    THEN("the orders of each grid point are those of its backtest")
+    assert len(expected[0].get("orders")) > len(expected[1].get("orders")) > 0
+    for orders, market in zip(result.get("orders"), expected):
+        assert [
+            (order.get("id"), order.get("model_id"), order.get("size"))
+            for order in orders
+        ] == [
+            (order.get("id"), order.get("model_id"), order.get("size"))
+            for order in market.get("orders")
+        ]
+    remove_file(path=path)
+    cleanup_test_directory()
+
+
+def test_run():
+    GIVEN("a directory with a historical file and a sweep handler for it")
+    path = get_test_file_path(name="1.999999999.bz2")
+    with open_bz2(path, "wt", encoding="utf-8") as file:
+        for record in MarketGenerator(duration=60).get_stream_records():
+            file.write(dumps(record) + "\n")
+    handler = SweepHandler(
+        path=path.replace("1.999999999.bz2", ""),
+        parameters={"cap": [0.05, 0.1]},
+        processes=1,
+    )
+    WHEN("we run the sweep")
+    results = handler.run()
+    THEN("there are results for each grid point from the one market")
+    assert [point.get("parameters") for point in results.get("points")] == (
+        handler.get_grid()
+    )
+    assert results.get("market_count") == 1
+    assert results.get("record_count") > 60
+    remove_file(path=path)
+    cleanup_test_directory()
@@ -0,0 +1,53 @@
+from tests.utils import GIVEN, WHEN, THEN
+
+from app.backtest.sweep.recorder import FeatureRecorder
+
+from benchmarks.mediator import RecordingMediator
+
+from infrastructure.third_party.adapter.stats_model import (
+    BatchWeightedLinearRegression,
+)
+
+
+def test_run_models():
+    GIVEN("a feature recorder and the model data for two ticks")
+    mediator = RecordingMediator()
+    recorder = FeatureRecorder(
+        mediator=mediator, batch_wls_model=BatchWeightedLinearRegression()
+    )
+    items = [__get_item(item_id=1, back_size=100), __get_item(item_id=2, back_size=50)]
+
+    WHEN("we run the models for each tick and for a tick without data")
+    recorder.run_models(items=items)
+    recorder.run_models(items=items[:1])
+    recorder.run_models(items=[])
+
+    THEN("processing is finished each time without any results")
+    assert mediator.get_data(event="finished processing") == [None, None, None]
+    assert not mediator.get_data(event="models have results")
+    THEN("the features of each tick with data are kept")
+    ticks = recorder.get_ticks()
+    assert len(ticks) == 2
+    assert ticks[0].get("id") == [1, 2]
+    assert ticks[0].get("combined_back_size_pit") == [100, 50]
+    assert ticks[1].get("id") == [1]
+    THEN("the regression for each runner is kept along with its inverse")
+    assert len(ticks[0].get("alpha")) == 2
+    assert len(ticks[0].get("Beta")) == 2
+    assert ticks[0].get("inverse").shape == (2, 2, 2)
+    assert ticks[0].get("origin") == -2
+    assert ticks[0].get("extract_time") == 0
+
+
+def __get_item(item_id, back_size):
+    return {
+        "id": item_id,
+        "extract_time_ts": [-4.0, -3.0, -2.0, -1.0, 0.0],
+        "combined_back_size_pit": back_size,
+        "compositional_sp_probability_pit": 0.25,
+        "compositional_ex_average_probability_pit": 0.2,
+        "ex_offered_back_price_pit": 4.2,
+        "ex_offered_back_price_mc_pit": 4.0,
+        "compositional_sp_back_price_ts": [4.4, 4.3, 4.2, 4.2, 4.0],
+        "combined_back_size_ts": [back_size] * 5,
+    }
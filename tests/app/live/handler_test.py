@@ -0,0 +1,237 @@
+from time import sleep
+from unittest.mock import patch
+
+from tests.utils import GIVEN, WHEN, THEN
+
+from app.live.handler import LiveHandler
+
+from infrastructure.external_api.market.batch.handler import (
+    ExternalAPIMarketBatchHandler,
+)
+from infrastructure.built_in.adapter.async_utils import (
+    run_coroutine,
+    run_together,
+    wait_for_seconds,
+)
+from infrastructure.built_in.adapter.time_utils import get_time, get_elapsed_time
+
+
+class FakeExternalAPI:
+    def __init__(self, market, latency):
+        self.__market = market
+        self.__latency = latency
+
+    def fetch_market(self):
+        sleep(self.__latency)
+        return {"marketId": self.__market.get_market_id()}
+
+    def process_market(self, data):
+        return self.__market.process(data=data)
+
+
+class FakeMarket:
+    def __init__(self, market_id, ticks, latency=0.05):
+        self.__market_id = market_id
+        self.__ticks = ticks
+        self.__processed = []
+        self.external_api = FakeExternalAPI(market=self, latency=latency)
+
+    def get_market_id(self):
+        return self.__market_id
+
+    def process(self, data):
+        if float(data.get("marketId")) != self.__market_id:
+            raise ValueError("data passed to the wrong market")
+        self.__processed.append(data)
+
+    def get_processed_count(self):
+        return len(self.__processed)
+
+    def is_closed(self):
+        return len(self.__processed) >= self.__ticks
+
+
+class FakeSchedule:
+    def __init__(self, schedules):
+        self.__schedules = schedules
+        self.created = []
+
+    def get_schedule(self):
+        return self.__schedules.pop(0) if self.__schedules else []
+
+    def create_new_markets(self, schedule, exit_on_close=True):
+        assert exit_on_close is False
+        markets = [
+            FakeMarket(market_id=float(market.get("marketId")), ticks=2)
+            for market in schedule
+        ]
+        self.created.extend(markets)
+        return markets
+
+
+def test_markets_are_polled_concurrently():
+    GIVEN("a live handler and many markets which each take time to respond")
+    handler = LiveHandler(interval=0.05)
+    markets = [FakeMarket(market_id=index, ticks=3, latency=0.1) for index in range(50)]
+    for market in markets:
+        assert handler.add_market(market=market)
+    THEN("adding the same market again is ignored")
+    assert not handler.add_market(market=markets[0])
+
+    WHEN("we run the handler until every market has closed")
+    start_time = get_time()
+    run_coroutine(handler.run())
+    elapsed = get_elapsed_time(start_time)
+    THEN("every market has processed each of its responses")
+    for market in markets:
+        assert market.get_processed_count() == 3
+    THEN("the network latency has not been serialised")
+    assert elapsed < 50 * 3 * 0.1 / 5
+    THEN("every market has finished without an error")
+    assert handler.get_market_ids() == []
+    assert sorted(handler.get_finished_market_ids()) == list(range(50))
+    assert handler.get_errors() == {}
+
+
+def test_errors_are_kept_per_market():
+    GIVEN("a live handler with a market that raises an error")
+    handler = LiveHandler(interval=0.01)
+    healthy = FakeMarket(market_id=1, ticks=2, latency=0.01)
+    broken = FakeMarket(market_id=2, ticks=2, latency=0.01)
+    broken.external_api.process_market = lambda data: healthy.process(data)
+    handler.add_market(market=healthy)
+    handler.add_market(market=broken)
+    WHEN("we run the handler")
+    run_coroutine(handler.run())
+    THEN("the error is recorded against the broken market")
+    assert list(handler.get_errors().keys()) == [2]
+    THEN("the healthy market still runs until it closes")
+    assert healthy.is_closed()
+
+
+def test_schedule_changes():
+    GIVEN("a live handler with a schedule which adds a market on each refresh")
+    schedule = FakeSchedule(
+        schedules=[
+            [{"marketId": "1.1"}],
+            [{"marketId": "1.1"}, {"marketId": "1.2"}],
+        ]
+    )
+    handler = LiveHandler(schedule=schedule, interval=0.01, schedule_interval=0.05)
+
+    async def run_then_stop():
+        async def stop():
+            await wait_for_seconds(0.5)
+            handler.stop()
+
+        await run_together(handler.run(), stop())
+
+    WHEN("we run the handler for long enough to refresh the schedule")
+    run_coroutine(run_then_stop())
+    THEN("each scheduled market was created once and has been polled until closed")
+    assert [market.get_market_id() for market in schedule.created] == [1.1, 1.2]
+    for market in schedule.created:
+        assert market.get_processed_count() == 2
+    assert sorted(handler.get_finished_market_ids()) == [1.1, 1.2]
+
+
+def test_remove_market():
+    GIVEN("a live handler with a market which never closes")
+    handler = LiveHandler(interval=0.01)
+    market = FakeMarket(market_id=1, ticks=10**6, latency=0.01)
+    handler.add_market(market=market)
+
+    async def run_then_remove():
+        async def remove():
+            await wait_for_seconds(0.1)
+            handler.remove_market(market_id=1)
+
+        await run_together(handler.run(), remove())
+
+    WHEN("we remove the market whilst the handler is running")
+    run_coroutine(run_then_remove())
+    THEN("the market is no longer polled and the handler finishes")
+    assert handler.get_market_ids() == []
+    assert 0 < market.get_processed_count() < 10**6
+
+
+class FakeBatchExternalAPI:
+    def __init__(self, market):
+        self.__market = market
+
+    def get_market_id(self):
+        return self.__market.get_market_id()
+
+    def process_market(self, data):
+        return self.__market.process(data=data)
+
+
+@patch("infrastructure.external_api.handler.ExternalAPIHandler._call_exchange")
+def test_markets_are_polled_in_batches(mock_call_exchange):
+    GIVEN("a live handler using a batch handler and forty markets")
+
+    def call_exchange(request):
+        sleep(0.05)
+        return [
+            {"marketId": str(market_id)}
+            for market_id in market_ids
+            if str(market_id) in request
+        ]
+
+    mock_call_exchange.side_effect = call_exchange
+    market_ids = [float("1.%d" % (100 + index)) for index in range(40)]
+    markets = [FakeMarket(market_id=market_id, ticks=3) for market_id in market_ids]
+    for market in markets:
+        market.external_api = FakeBatchExternalAPI(market=market)
+    batch_handler = ExternalAPIMarketBatchHandler(headers={}, environment="Dev")
+    handler = LiveHandler(interval=0.05, batch_handler=batch_handler)
+    for market in markets:
+        handler.add_market(market=market)
+
+    WHEN("we run the handler until every market has closed")
+    run_coroutine(handler.run())
+    THEN("every market has processed each of its responses")
+    for market in markets:
+        assert market.get_processed_count() == 3
+    THEN("one request was made per batch on each tick")
+    assert mock_call_exchange.call_count == 3 * 7
+    THEN("every market has finished and been removed from the batch handler")
+    assert handler.get_market_ids() == []
+    assert batch_handler.get_market_ids() == []
+    assert handler.get_errors() == {}
+
+
+@patch("infrastructure.external_api.handler.ExternalAPIHandler._call_exchange")
+def test_batch_errors_are_recovered(mock_call_exchange):
+    GIVEN("a live handler using a batch handler whose first request fails")
+    calls = []
+
+    def call_exchange(request):
+        calls.append(request)
+        if len(calls) == 1:
+            raise TimeoutError("the request timed out")
+        return [
+            {"marketId": str(market_id)}
+            for market_id in market_ids
+            if str(market_id) in request
+        ]
+
+    mock_call_exchange.side_effect = call_exchange
+    market_ids = [float("1.%d" % (100 + index)) for index in range(3)]
+    markets = [FakeMarket(market_id=market_id, ticks=3) for market_id in market_ids]
+    for market in markets:
+        market.external_api = FakeBatchExternalAPI(market=market)
+    batch_handler = ExternalAPIMarketBatchHandler(headers={}, environment="Dev")
+    handler = LiveHandler(interval=0.01, batch_handler=batch_handler)
+    for market in markets:
+        handler.add_market(market=market)
+
+    WHEN("we run the handler until every market has closed")
+    run_coroutine(handler.run())
+    THEN("the markets are polled again after the failed request")
+    for market in markets:
+        assert market.get_processed_count() == 3
+    assert len(calls) == 4
+    THEN("the error of the failed request has been kept")
+    assert [type(error) for error in handler.get_batch_errors()] == [TimeoutError]
+    assert handler.get_errors() == {}
@@ -3,6 +3,10 @@ from infrastructure.third_party.adapter.numpy_utils import not_a_number, is_not_
 from infrastructure.built_in.adapter.copy_utils import make_copy
 from app.market.data.transform.handler import TransformHandler
 from app.market.data.transform.price.handler import PriceHandler
+from benchmarks.generator import MarketGenerator
+from infrastructure.external_api.market.record.adapter import (
+    ExternalAPIMarketRecordAdapter,
+)
 
 
 def test_no_items():
@@ -211,3 +215,33 @@ def __calc_compositional_data(items, correct_probability):
         item["compositional_price"] = pricer.calc_price(compositional_probability)
 
     return expected_data
+
+
+def test_carried_forward_record():
+    GIVEN("a transformed record and a handler")
+    extracted_data = ExternalAPIMarketRecordAdapter(
+        market_start_time=MarketGenerator().get_market_start_time()
+    ).convert(MarketGenerator().get_market_books()[0])
+    handler = TransformHandler()
+    first = handler.process(extracted_data)
+
+    WHEN("the next second carries the same items forward")
+    carried_forward = handler.process(
+        {**extracted_data, "extract_time": extracted_data.get("extract_time") + 1}
+    )
+    THEN("the row is reused with only the time updated")
+    assert carried_forward.get(("extract_time", "")) == [
+        extracted_data.get("extract_time") + 1
+    ]
+    assert {
+        key: value for key, value in carried_forward.items() if key[0] != "extract_time"
+    } == {key: value for key, value in first.items() if key[0] != "extract_time"}
+
+    WHEN("a probability is fixed and the same items are carried forward again")
+    handler.set_probability(runner_id=1000, probability=0.5)
+    fixed = handler.process(
+        {**extracted_data, "extract_time": extracted_data.get("extract_time") + 2}
+    )
+    THEN("the row is recalculated without the fixed runner")
+    assert ("sp_back_price", 1000) not in fixed
+    assert ("sp_back_price", 1000) in carried_forward
@@ -0,0 +1,120 @@
+from bz2 import open as open_bz2
+from json import dumps
+
+from tests.utils import GIVEN, WHEN, THEN, get_test_file_path, cleanup_test_directory
+
+from app.market.data.transform.handler import TransformHandler
+from app.market.data.transform.stored.handler import StoredTransformHandler
+
+from benchmarks.generator import MarketGenerator
+
+from infrastructure.storage.historical.cache.handler import HistoricalCacheHandler
+from infrastructure.storage.historical.feature.handler import (
+    HistoricalFeatureStoreHandler,
+)
+from infrastructure.built_in.adapter.os_utils import remove_file, remove_tree
+from infrastructure.third_party.adapter.numpy_utils import is_not_a_number
+
+
+def test_no_items():
+    GIVEN("a stored transform handler")
+    handler = StoredTransformHandler()
+    WHEN("we call process with no data")
+    transformed_data = handler.process()
+    THEN("an empty dictionary is returned")
+    assert not transformed_data
+
+
+def test_process():
+    GIVEN("the stored and the cached records of a market")
+    stored, cached = __get_records()
+    transformer = TransformHandler()
+    handler = StoredTransformHandler()
+
+    for stored_record, cached_record in zip(stored, cached):
+        WHEN("we process the stored record")
+        transformed_data = __process(handler=handler, record=stored_record)
+        THEN("the data is that which the transform makes of the record")
+        __assert_same(
+            transformed_data, __process(handler=transformer, record=cached_record)
+        )
+
+    cleanup_test_directory()
+
+
+def test_process_fixed_probabilities():
+    GIVEN("the stored and the cached records of a market")
+    stored, cached = __get_records()
+    transformer = TransformHandler()
+    handler = StoredTransformHandler()
+
+    for index, (stored_record, cached_record) in enumerate(zip(stored, cached)):
+        if index == len(stored) // 2:
+            WHEN("a runner's probability is fixed part way through the market")
+            runner_id = stored_record.get("items")[0].get("id")
+            transformer.set_probability(runner_id=runner_id, probability=0.2)
+            handler.set_probability(runner_id=runner_id, probability=0.2)
+
+        WHEN("we process the stored record")
+        transformed_data = __process(handler=handler, record=stored_record)
+        THEN("the data is that which the transform makes of the record")
+        __assert_same(
+            transformed_data, __process(handler=transformer, record=cached_record)
+        )
+
+    cleanup_test_directory()
+
+
+def __process(handler, record):
+    # the transform fails on some of the records, which a backtest skips
+    try:
+        return handler.process(record)
+    except TypeError:
+        return None
+
+
+def __assert_same(transformed_data, expected):
+    if expected is None:
+        assert transformed_data is None
+        return
+    assert list(transformed_data.keys()) == list(expected.keys())
+    for column, values in expected.items():
+        value = values[0]
+        stored_value = transformed_data.get(column)[0]
+        assert (
+            stored_value == value
+            or (value is None and stored_value is None)
+            or (
+                isinstance(value, float)
+                and is_not_a_number(value)
+                and is_not_a_number(stored_value)
+            )
+        )
+
+
+def __get_records():
+    path = get_test_file_path(name="1.999999999.bz2")
+    generator = MarketGenerator(duration=20)
+    with open_bz2(path, "wt", encoding="utf-8") as file:
+        for record in generator.get_stream_records():
+            file.write(dumps(record) + "\n")
+    feature_directory = get_test_file_path(name="features")
+    cache_directory = get_test_file_path(name="cache")
+    stored = list(
+        HistoricalFeatureStoreHandler.get_records(
+            market=HistoricalFeatureStoreHandler(
+                directory=feature_directory
+            ).get_market(path=path)
+        )
+    )
+    cached = list(
+        HistoricalCacheHandler.get_records(
+            market=HistoricalCacheHandler(directory=cache_directory).get_market(
+                path=path
+            )
+        )
+    )
+    remove_file(path=path)
+    remove_tree(path=feature_directory)
+    remove_tree(path=cache_directory)
+    return stored, cached
@@ -12,6 +12,7 @@ from tests.utils import (
 
 from tests.mock.mediator import MockMediator
 from app.market.handler import MarketHandler
+from app.market.latency.handler import LatencyHandler
 
 from infrastructure.storage.historical.external_api.file.handler import (
     HistoricalExternalAPIFileHander,
@@ -247,6 +248,76 @@ def test_exit_run_on_closed(mock_open_url):
     assert system_exit.value.code == 0
 
 
+@patch("infrastructure.external_api.handler.open_url")
+def test_close_without_exit(mock_open_url):
+    GIVEN("a handler that should not exit when the market closes")
+    external_api = ExternalAPIMarketHandler(
+        environment="Dev", headers={}, market_id=123456
+    )
+    handler = MarketHandler(
+        market_id=123456,
+        external_api=external_api,
+        market_start_time="2019-01-13T04:19:00.000Z",
+        exit_on_close=False,
+    )
+    external_api.set_mediator(mediator=handler)
+    closed_market_dict = __get_closed_market_dict()
+    mock_open_url.return_value = closed_market_dict
+    THEN("the market is not closed")
+    assert not handler.is_closed()
+    WHEN("we call run but the market has closed")
+    try:
+        with freeze_time(closed_market_dict.get("process_time"), tz_offset=11):
+            handler.run()
+    except SystemExit:
+        fail("Unexpected SystemExit")
+    THEN("the handler has recorded that the market is closed")
+    assert handler.is_closed()
+
+
+@patch("infrastructure.external_api.handler.open_url")
+def test_latency_dumped_on_close(mock_open_url):
+    GIVEN("a handler with latency instrumentation")
+    latency = LatencyHandler()
+    external_api = ExternalAPIMarketHandler(
+        environment="Dev", headers={}, market_id=123456
+    )
+    handler = MarketHandler(
+        market_id=123456,
+        external_api=external_api,
+        market_start_time="2019-01-13T04:19:00.000Z",
+        exit_on_close=False,
+        latency=latency,
+    )
+    external_api.set_mediator(mediator=handler)
+    closed_market_dict = __get_closed_market_dict()
+    mock_open_url.return_value = closed_market_dict
+    WHEN("we call run but the market has closed")
+    dumped = []
+    with patch.object(
+        latency,
+        "dump",
+        side_effect=lambda: dumped.append(latency.get_summary()),
+    ) as mock_dump:
+        with freeze_time(closed_market_dict.get("process_time"), tz_offset=11):
+            handler.run()
+    THEN("the latencies are dumped once when the market closes")
+    mock_dump.assert_called_once()
+    THEN("the latencies are recorded against the market")
+    summary = latency.get_summary()
+    assert summary.get("market_id") == 123456
+    THEN("each event which was dispatched has been timed")
+    assert sorted(summary.get("events").keys()) == [
+        "external data fetched",
+        "market closed",
+    ]
+    assert (
+        summary.get("events").get("external data fetched").get("wall").get("count") == 1
+    )
+    THEN("the latencies dumped include the outermost event")
+    assert dumped == [summary]
+
+
 @patch("infrastructure.external_api.handler.ExternalAPIHandler._call_exchange")
 def test_exit_run_on_no_data(mock_call_exchange):
     GIVEN("a handler")
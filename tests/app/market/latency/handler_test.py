@@ -0,0 +1,154 @@
+from tests.utils import (
+    GIVEN,
+    WHEN,
+    THEN,
+    cleanup_test_file,
+    get_test_directory,
+    get_test_file_path,
+)
+
+from app.market.latency.handler import LatencyHandler, LatencyHistogram
+
+from infrastructure.built_in.adapter.json_utils import make_dict
+
+
+def test_histogram_percentiles():
+    GIVEN("a histogram and a thousand latencies between 1ms and 1s")
+    histogram = LatencyHistogram()
+    values = [index / 1000 for index in range(1, 1001)]
+    WHEN("we add the latencies in a random order")
+    for value in reversed(values):
+        histogram.add(value)
+    THEN("the exact statistics are correct")
+    summary = histogram.get_summary()
+    assert summary.get("count") == 1000
+    assert summary.get("min") == 0.001
+    assert summary.get("max") == 1
+    assert round(summary.get("mean"), 10) == 0.5005
+    THEN("the percentiles are within the precision of the buckets")
+    for percentile, expected in [("p50", 0.5), ("p95", 0.95), ("p99", 0.99)]:
+        assert expected <= summary.get(percentile) <= expected * (2 ** (1 / 16))
+
+
+def test_histogram_edges():
+    GIVEN("an empty histogram")
+    histogram = LatencyHistogram()
+    THEN("there are no percentiles")
+    assert histogram.get_percentile(50) is None
+    WHEN("we add a single zero latency")
+    histogram.add(0)
+    THEN("every percentile is zero")
+    assert histogram.get_percentile(50) == 0
+    assert histogram.get_percentile(99) == 0
+
+
+def test_histogram_non_positive():
+    GIVEN("a histogram with zero and positive latencies")
+    histogram = LatencyHistogram()
+    for value in [0.0] * 60 + [0.5] * 40:
+        histogram.add(value)
+    WHEN("we get the summary")
+    summary = histogram.get_summary()
+    THEN("the zero latencies are counted below every positive latency")
+    assert summary.get("count") == 100
+    assert summary.get("p50") == 0
+    assert 0.5 <= summary.get("p95") <= 0.5 * (2 ** (1 / 16))
+
+
+def test_wrap_zero_cost_recipient():
+    GIVEN("a latency handler and a recipient which does no work")
+    handler = LatencyHandler(market_id="1.234")
+    timed_recipient = handler.wrap(event="finished processing", recipient=bool)
+    WHEN("we dispatch the event many times")
+    for _ in range(100000):
+        timed_recipient(None)
+    THEN("the latencies can be summarised")
+    summary = handler.get_summary().get("events").get("finished processing")
+    assert summary.get("cpu").get("count") == 100000
+    assert summary.get("cpu").get("p50") is not None
+    assert summary.get("wall").get("p99") is not None
+
+
+def test_close_after_outermost_event():
+    GIVEN("a latency handler and a nested event which closes it")
+    handler = LatencyHandler(market_id="1.234")
+    dumped = []
+    handler.dump = lambda: dumped.append(handler.get_summary())
+    inner = handler.wrap(event="market closed", recipient=lambda data: handler.close())
+    outer = handler.wrap(event="external data fetched", recipient=inner)
+    WHEN("we dispatch the outer event")
+    outer(None)
+    THEN("the latencies are dumped once, after the outer event has been timed")
+    assert len(dumped) == 1
+    assert sorted(dumped[0].get("events").keys()) == [
+        "external data fetched",
+        "market closed",
+    ]
+
+    WHEN("the handler is closed outside of any event")
+    handler.close()
+    THEN("the latencies are dumped straight away")
+    assert len(dumped) == 2
+
+
+def test_wrap_records_exclusive_time():
+    GIVEN("a latency handler and a recipient which dispatches a nested event")
+    handler = LatencyHandler(market_id="1.234")
+
+    def inner_recipient(data):
+        return sum(range(20000))
+
+    inner = handler.wrap(event="inner", recipient=inner_recipient)
+
+    def outer_recipient(data):
+        inner(data)
+        return data
+
+    outer = handler.wrap(event="outer", recipient=outer_recipient)
+    WHEN("we dispatch the outer event")
+    result = outer("data")
+    THEN("the result of the recipient is returned")
+    assert result == "data"
+    THEN("both events are timed once")
+    events = handler.get_summary().get("events")
+    assert events.get("outer").get("wall").get("count") == 1
+    assert events.get("inner").get("wall").get("count") == 1
+    THEN("the time of the nested event is not counted against the outer event")
+    assert events.get("outer").get("wall").get("total") < (
+        events.get("inner").get("wall").get("total")
+    )
+
+
+def test_wrap_records_exceptions():
+    GIVEN("a latency handler and a recipient which raises")
+    handler = LatencyHandler()
+
+    def recipient(data):
+        raise SystemExit(0)
+
+    timed_recipient = handler.wrap(event="market closed", recipient=recipient)
+    WHEN("we dispatch the event")
+    try:
+        timed_recipient(None)
+    except SystemExit:
+        pass
+    THEN("the event is still timed")
+    events = handler.get_summary().get("events")
+    assert events.get("market closed").get("cpu").get("count") == 1
+
+
+def test_dump():
+    GIVEN("a latency handler with a directory and a timed event")
+    handler = LatencyHandler(market_id="1.234", directory=get_test_directory())
+    handler.wrap(event="new orders", recipient=lambda data: data)([])
+    WHEN("we dump the latencies")
+    summary = handler.dump()
+    THEN("the latencies are written to a file named after the market")
+    with open(get_test_file_path(name="1.234.latency.json"), "r") as file:
+        assert make_dict(file.read()) == summary
+    cleanup_test_file(name="1.234.latency.json")
+
+    GIVEN("a latency handler without a directory")
+    handler = LatencyHandler(market_id="1.234")
+    THEN("dumping only returns the latencies")
+    assert handler.dump() == {"market_id": "1.234", "events": {}}
@@ -0,0 +1,85 @@
+from tests.utils import GIVEN, WHEN, THEN
+from app.market.metadata.handler import MetadataHandler
+from app.market.metadata.schema import FeatureSchema
+
+
+def test_singleton():
+    GIVEN("a feature schema")
+    schema = FeatureSchema()
+
+    WHEN("we ask for the schema again")
+    same_schema = FeatureSchema()
+
+    THEN("the same schema is returned")
+    assert same_schema is schema
+
+
+def test_slots():
+    GIVEN("a feature schema and the metadata it was built from")
+    schema = FeatureSchema()
+    metadata = MetadataHandler()
+
+    WHEN("we get the runner variables")
+    variables = schema.get_runner_variables()
+
+    THEN("each variable has its own slot, the position of the variable")
+    assert len(set(variables)) == len(variables)
+    for slot, variable in enumerate(variables):
+        assert schema.get_slot(variable) == slot
+
+    THEN("the required variables come first, in the order of the metadata")
+    assert [variable for variable, _ in schema.get_required_slots()] == (
+        metadata.get_required_variables()
+    )
+    assert [slot for _, slot in schema.get_required_slots()] == list(
+        range(len(metadata.get_required_variables()))
+    )
+
+    THEN("the back prices less commission have slots of their own")
+    for variable, slot in schema.get_minus_commission_slots():
+        assert variables[slot] == variable + metadata.get_minus_commission_suffix()
+
+    THEN("the compositional variables have slots of their own")
+    assert [
+        variables[slot] for slot in schema.get_compositional_slots("ex_average")
+    ] == [
+        "compositional_ex_average_probability",
+        "compositional_ex_average_back_price",
+    ]
+
+
+def test_model_features():
+    GIVEN("a feature schema and the metadata it was built from")
+    schema = FeatureSchema()
+    metadata = MetadataHandler()
+    variables = schema.get_runner_variables()
+
+    WHEN("we get the model features")
+    point_in_time_features = schema.get_point_in_time_features()
+    time_series_features = schema.get_time_series_features()
+
+    THEN("each feature is the variable's name and suffix and the variable's slot")
+    assert [
+        (variable + metadata.get_point_in_time_suffix(), variables.index(variable))
+        for variable in metadata.get_point_in_time_model_variables()
+    ] == list(point_in_time_features)
+    assert [
+        (variable + metadata.get_time_series_suffix(), variables.index(variable))
+        for variable in metadata.get_time_series_model_variables()
+    ] == list(time_series_features)
+    assert schema.get_index_feature() == "extract_time_ts"
+
+
+def test_runner_columns():
+    GIVEN("a feature schema")
+    schema = FeatureSchema()
+
+    WHEN("we make the columns of a runner")
+    columns = schema.make_runner_columns(runner_id=123)
+
+    THEN("each slot holds the container column of the runner's variable")
+    assert columns[schema.get_slot("combined_back_size")] == (
+        "combined_back_size",
+        123,
+    )
+    assert len(columns) == len(schema.get_runner_variables())
@@ -2,12 +2,18 @@
 
 from unittest.mock import patch
 
-from tests.utils import GIVEN, WHEN, THEN
+from tests.utils import GIVEN, WHEN, THEN, almost_equal
 from tests.mock.mediator import MockMediator
 
 from app.market.model.handler import ModelHandler
 
-from infrastructure.third_party.adapter.stats_model import WeightedLinearRegression
+from infrastructure.third_party.adapter.stats_model import (
+    WeightedLinearRegression,
+    BatchWeightedLinearRegression,
+)
+from infrastructure.third_party.adapter.columnar_data_container import (
+    ColumnarDataContainer,
+)
 from infrastructure.third_party.adapter.numpy_utils import (
     is_not_a_number,
     calculate_log,
@@ -33,6 +39,26 @@ def test_get_log_returns():
             assert log_returns[i] == calculate_log(cpit / lpit)
 
 
+def test_get_log_returns_from_container_column():
+    GIVEN("a columnar data container holding compositional data and the model handler")
+    item = __get_model_data_item(item_id=16397186)
+    mediator = MockMediator()
+    handler = ModelHandler(mediator=mediator, wls_model=WeightedLinearRegression())
+    compositional_sp_back_price_ts = item.get("compositional_sp_back_price_ts")
+    container = ColumnarDataContainer(
+        {"compositional_sp_back_price": compositional_sp_back_price_ts}
+    )
+    WHEN("we get the log returns of the column view")
+    log_returns = handler._get_log_returns(
+        container.get_column(name="compositional_sp_back_price")
+    )
+    THEN("the log returns match those calculated from the list")
+    expected = handler._get_log_returns(compositional_sp_back_price_ts)
+    assert len(log_returns) == len(expected)
+    assert is_not_a_number(log_returns[0])
+    assert log_returns[1:] == expected[1:]
+
+
 def test_meets_wlr_criteria():
     GIVEN("model data and an instance of the model handler")
     mediator = MockMediator()
@@ -53,6 +79,62 @@ def test_meets_wlr_criteria():
             assert not result
 
 
+def test_meets_wlr_criteria_incremental():
+    GIVEN("model data and model handlers with batch and incremental regressions")
+    mediator = MockMediator()
+    handler = ModelHandler(mediator=mediator, wls_model=WeightedLinearRegression())
+    incremental_handler = ModelHandler(
+        mediator=mediator, wls_model=WeightedLinearRegression(incremental=True)
+    )
+    model_data = __get_model_data()
+    WHEN("we run the weighted linear regression component for each item")
+    for item in model_data:
+        THEN("both regressions agree on whether the criteria are met")
+        assert incremental_handler._meets_wlr_criteria(
+            item=item
+        ) == handler._meets_wlr_criteria(item=item)
+
+
+def test_meets_wlr_criteria_incremental_per_tick():
+    GIVEN("an item and a model handler with an incremental regression")
+    item = __get_model_data_item(item_id=16397186)
+    handler = ModelHandler(
+        mediator=MockMediator(), wls_model=WeightedLinearRegression(incremental=True)
+    )
+    full_handler = ModelHandler(
+        mediator=MockMediator(), wls_model=WeightedLinearRegression()
+    )
+    added = []
+    add = handler.wls_model.add
+
+    def counted_add(y, x, weights, key):
+        added.append(len(y))
+        return add(y=y, x=x, weights=weights, key=key)
+
+    handler.wls_model.add = counted_add
+    WHEN("we run the regression on every tick as the series grow")
+    with patch(
+        "app.market.model.handler.calculate_log", wraps=calculate_log
+    ) as mock_log:
+        for end in range(1, len(item.get("extract_time_ts")) + 1):
+            tick = {
+                name: (value[:end] if name.endswith("_ts") else value)
+                for name, value in item.items()
+            }
+            calls = mock_log.call_count
+            result = handler._meets_wlr_criteria(item=tick)
+            THEN("only the newest log return is made and added to the model")
+            assert mock_log.call_count - calls == 1
+            assert added[-1] == 1
+            THEN("the criteria are the same as from the whole series")
+            assert result == full_handler._meets_wlr_criteria(item=tick)
+            alpha = handler.wls_model.get_alpha()
+            expected_alpha = full_handler.wls_model.get_alpha()
+            assert (
+                is_not_a_number(alpha) and is_not_a_number(expected_alpha)
+            ) or almost_equal(alpha, expected_alpha)
+
+
 @patch("tests.mock.mediator.MockMediator.notify")
 def test_run_models_with_results(mock_notify):
     GIVEN("model data and an instance of the model handler")
@@ -85,6 +167,66 @@ def test_run_models_with_results(mock_notify):
     }
 
 
+def test_meets_wlr_criteria_batch():
+    GIVEN("model data and model handlers with single and batch regressions")
+    mediator = MockMediator()
+    handler = ModelHandler(mediator=mediator, wls_model=WeightedLinearRegression())
+    batch_handler = ModelHandler(
+        mediator=mediator,
+        wls_model=WeightedLinearRegression(),
+        batch_wls_model=BatchWeightedLinearRegression(),
+    )
+    model_data = __get_model_data()
+    WHEN("we evaluate the criteria for all of the items at once")
+    mask = batch_handler._meets_wlr_criteria_batch(items=model_data)
+    THEN("there is a criteria result for each item")
+    assert len(mask) == len(model_data)
+    THEN("each result matches the single regression")
+    for i, item in enumerate(model_data):
+        assert mask[i] == handler._meets_wlr_criteria(item=item)
+
+
+@patch("tests.mock.mediator.MockMediator.notify")
+def test_run_models_batch(mock_notify):
+    GIVEN("model data and an instance of the model handler with a batch regression")
+    mediator = MockMediator()
+    handler = ModelHandler(
+        mediator=mediator,
+        wls_model=WeightedLinearRegression(),
+        batch_wls_model=BatchWeightedLinearRegression(),
+    )
+    model_data = __get_model_data()
+    WHEN("we run the models")
+    handler.run_models(items=model_data)
+    THEN("the mediator's notify method was called with a single result")
+    args, kwargs = mock_notify.call_args
+    assert kwargs.get("event") == "models have results"
+    results = kwargs.get("data")
+    assert len(results) == 1
+    assert results[0].get("id") == 16397186
+    assert results[0].get("model_id") == "SPMB"
+
+
+@patch("tests.mock.mediator.MockMediator.notify")
+def test_run_models_thresholds(mock_notify):
+    GIVEN("model data and a model handler with a higher back size threshold")
+    mediator = MockMediator()
+    handler = ModelHandler(
+        mediator=mediator,
+        wls_model=WeightedLinearRegression(),
+        batch_wls_model=BatchWeightedLinearRegression(),
+        thresholds={"wlr_back_size": 10**9, "wlr_gb_back_size": 10**9},
+    )
+    model_data = __get_model_data()
+    WHEN("we run the models")
+    handler.run_models(items=model_data)
+    THEN("the runner which met the default threshold no longer has a result")
+    args, kwargs = mock_notify.call_args
+    assert kwargs.get("event") == "finished processing"
+    THEN("the thresholds which were not given keep their default values")
+    assert ModelHandler.get_default_thresholds().get("alpha") == -0.00001
+
+
 @patch("tests.mock.mediator.MockMediator.notify")
 def test_run_models_no_results(mock_notify):
     GIVEN("model data and an instance of the model handler")
@@ -132,6 +132,49 @@ def test_calc_reduced_risk_percentage():
     assert reduced_risk_percentages.get(999) is None
 
 
+def test_calc_reduced_risk_percentage_large_field():
+    GIVEN("a large field of risk percentages and many existing orders")
+    items = [
+        {"id": runner_id, "risk_percentage": (runner_id % 7) / 100}
+        for runner_id in range(1, 41)
+    ]
+    existing_orders = [
+        {
+            "id": runner_id,
+            "probability": 0.26,
+            "type": "BUY",
+            "ex_price": 5,
+            "min_size": 5,
+            "size": 10,
+            "risk_percentage": (runner_id % 5) / 100,
+        }
+        for runner_id in range(30, 60)
+    ]
+    handler = OrdersHandler(mediator=MockMediator(), bank=5000)
+    handler.prevent_reorder(existing_orders)
+
+    WHEN("we calculate the reduced risk percentages")
+    reduced_risk_percentages = handler._calc_reduced_risk_percentage(
+        initial_risk_percentage=items
+    )
+
+    THEN("each risk is reduced by the risk of every other runner")
+    for item in items:
+        expected = item.get("risk_percentage")
+        for another_item in items + existing_orders:
+            if another_item.get("id") != item.get("id"):
+                expected *= 1 - another_item.get("risk_percentage")
+        assert almost_equal(reduced_risk_percentages.get(item.get("id")), expected)
+
+    WHEN("another runner has a risk of one")
+    reduced_risk_percentages = handler._calc_reduced_risk_percentage(
+        initial_risk_percentage=items + [{"id": 1000, "risk_percentage": 1}]
+    )
+    THEN("every other risk is reduced to zero")
+    assert reduced_risk_percentages.get(1000) > 0
+    assert not any(reduced_risk_percentages.get(item.get("id")) for item in items)
+
+
 def test_calc_order_size():
     GIVEN("a handler and a list of items with risk_percentages")
     bank = 1000
@@ -192,6 +235,26 @@ def test_calc_risk_percentage():
     )
 
 
+def test_calc_risk_percentage_sizing():
+    GIVEN("a handler with a higher cap, a probability and price")
+    mediator = MockMediator()
+    handler = OrdersHandler(mediator=mediator, bank=1, sizing={"cap": 0.1})
+    probability = 0.6
+    price = 2
+
+    WHEN("we calculate the risk percentage without a cap or kelly fraction")
+    risk = handler._calc_risk_percentage(probability=probability, price=price)
+    THEN("the risk percentage is capped by the handler's cap")
+    assert risk == 0.1
+
+    WHEN("we calculate the risk percentage with the default cap")
+    default_risk = OrdersHandler(mediator=mediator, bank=1)._calc_risk_percentage(
+        probability=probability, price=price
+    )
+    THEN("the risk percentage is capped by the default cap")
+    assert default_risk == OrdersHandler.get_default_sizing().get("cap")
+
+
 def test_calc_no_risk_percentage():
     GIVEN("a handler, a probability and an equal price")
     mediator = MockMediator()
@@ -0,0 +1,74 @@
+from tests.utils import GIVEN, WHEN, THEN
+from tests.mock.mediator import MockMediator
+
+from app.market.data.transform.handler import TransformHandler
+from app.market.orders.handler import OrdersHandler
+from app.market.runner.handler import RunnerHandler
+
+
+def test_add_runners():
+    GIVEN("a runner handler and some items")
+    handler = RunnerHandler()
+    items = [
+        {"id": 456},
+        {"id": 123},
+        {"id": ""},
+        {"id": 789, "removal_date": "2020-01-01T10:00:00.000Z"},
+    ]
+
+    WHEN("we add the runners")
+    handler.add_runners(items=items)
+    THEN("the ids of the runners are returned in order")
+    assert handler.get_ids() == [123, 456, 789]
+    THEN("the removed runner is not active")
+    assert handler.is_removed(789)
+    assert handler.get_active_ids() == [123, 456]
+
+    WHEN("we add the same runners again")
+    handler.add_runners(items=items)
+    THEN("they are not duplicated")
+    assert handler.get_ids() == [123, 456, 789]
+
+
+def test_fixed_probabilities():
+    GIVEN("a runner handler with some runners")
+    handler = RunnerHandler()
+    handler.add_runners(items=[{"id": 123}, {"id": 456}])
+
+    WHEN("we fix the probability of a runner twice")
+    handler.set_probability(runner_id=123, probability=0.2)
+    handler.set_probability(runner_id=123, probability=0.3)
+    THEN("the latest probability is used")
+    assert handler.has_fixed_probability(123)
+    assert not handler.has_fixed_probability(456)
+    assert handler.get_fixed_probability_ids() == [123]
+    assert handler.get_fixed_probability_total() == 0.3
+    assert handler.get_active_ids() == [456]
+
+
+def test_shared_runners():
+    GIVEN("a transform handler and an orders handler sharing a runner handler")
+    runners = RunnerHandler()
+    transformer = TransformHandler(runners=runners)
+    orders = OrdersHandler(mediator=MockMediator(), runners=runners)
+
+    WHEN("an order is placed and the probability of the runner is fixed")
+    order = {
+        "id": 123,
+        "probability": 0.26,
+        "type": "BUY",
+        "ex_price": 5,
+        "min_size": 5,
+        "size": 10,
+        "risk_percentage": 0.03,
+    }
+    orders.prevent_reorder(orders=[order])
+    transformer.set_probability(runner_id=123, probability=0.26)
+
+    THEN("both are recorded against the runner")
+    assert runners.has_order(123)
+    assert runners.has_fixed_probability(123)
+    THEN("the runner is excluded from the transform")
+    assert transformer._exclude_fixed_items(items=[{"id": 123}, {"id": 456}]) == [
+        {"id": 456}
+    ]
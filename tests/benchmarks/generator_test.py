@@ -0,0 +1,82 @@
+from tests.utils import GIVEN, WHEN, THEN
+
+from benchmarks.generator import MarketGenerator
+
+from infrastructure.external_api.market.record.adapter import (
+    ExternalAPIMarketRecordAdapter,
+)
+from infrastructure.storage.historical.download.file.data.handler import (
+    HistoricalDownloadFileDataHandler,
+)
+
+
+def test_generator_is_deterministic():
+    GIVEN("two generators with the same parameters")
+    first = MarketGenerator(runners=4, duration=20, seed=7)
+    second = MarketGenerator(runners=4, duration=20, seed=7)
+    WHEN("we generate the market books and stream records")
+    THEN("the generated data is identical")
+    assert first.get_market_books() == second.get_market_books()
+    assert first.get_stream_records() == second.get_stream_records()
+
+    GIVEN("a generator with a different seed")
+    third = MarketGenerator(runners=4, duration=20, seed=8)
+    THEN("the generated data is different")
+    assert first.get_market_books() != third.get_market_books()
+
+
+def test_market_books():
+    GIVEN("a generator")
+    generator = MarketGenerator(runners=5, depth=2, duration=30)
+    WHEN("we generate the market books")
+    books = generator.get_market_books()
+    THEN("there is a book for every second of the market")
+    assert len(books) == 32
+    THEN("every book has all of the runners with ladders of the correct depth")
+    for book in books:
+        assert [runner.get("selectionId") for runner in book.get("runners")] == (
+            generator.get_runner_ids()
+        )
+        for runner in book.get("runners"):
+            assert len(runner.get("ex").get("availableToBack")) == 2
+            assert len(runner.get("ex").get("availableToLay")) == 2
+
+    WHEN("we convert the books with the live record adapter")
+    adapter = ExternalAPIMarketRecordAdapter(
+        market_start_time=generator.get_market_start_time()
+    )
+    records = [adapter.convert(book) for book in books]
+    THEN("every book is converted into a record with all of the runners")
+    for record in records:
+        assert len(record.get("items")) == 5
+
+
+def test_stream_records():
+    GIVEN("a generator and a historical data handler")
+    generator = MarketGenerator(runners=3, duration=10)
+    handler = HistoricalDownloadFileDataHandler(
+        items=generator.get_items_definition(),
+        market_start_time=generator.get_market_start_time(),
+    )
+    WHEN("we process all of the stream records")
+    data = list(filter(None, map(handler.process, generator.get_stream_records())))
+    THEN("a snapshot is made for the definition, every second and the settlement")
+    assert [record.get("extract_time") for record in data] == (
+        [-70] + list(range(-10, 2)) + [61]
+    )
+    THEN("only the snapshots after the market goes in play at the off are closed")
+    # a snapshot holds the state before its record, the in play definition is
+    # sent with the record at the off so the next second is the first closed
+    assert [record.get("closed_indicator") for record in data] == (
+        [False] * 12 + [True, True]
+    )
+
+
+def test_ticks():
+    GIVEN("the ticks of the ladder")
+    ticks = MarketGenerator.get_ticks()
+    THEN("there are the correct number of increasing ticks")
+    assert len(ticks) == 350
+    assert ticks[0] == 1.01
+    assert ticks[-1] == 1000
+    assert ticks == sorted(ticks)
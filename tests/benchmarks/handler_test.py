@@ -0,0 +1,54 @@
+from tests.utils import GIVEN, WHEN, THEN
+
+from benchmarks.generator import MarketGenerator
+from benchmarks.handler import BenchmarkHandler
+
+
+def test_run():
+    GIVEN("a benchmark handler for a small synthetic market")
+    generator = MarketGenerator(runners=3, duration=10)
+    handler = BenchmarkHandler(generator=generator, repeat=2)
+    WHEN("we run the benchmark")
+    report = handler.run()
+    THEN("the report contains the parameters used")
+    assert report.get("parameters") == dict(generator.get_parameters(), repeat=2)
+    THEN("every stage has been timed")
+    assert sorted(report.get("stages").keys()) == [
+        "data_handler",
+        "external_api_record_adapter",
+        "historical_data_handler",
+        "historical_record_adapter",
+        "item_adapter",
+        "market_handler_tick",
+        "model_handler",
+        "orders_handler",
+        "transform_handler",
+    ]
+    THEN("each stage is timed once per input for each repeat")
+    assert report.get("stages").get("external_api_record_adapter").get("calls") == 24
+    assert report.get("stages").get("item_adapter").get("calls") == 72
+    THEN("the statistics are consistent")
+    for result in report.get("stages").values():
+        assert result.get("calls") > 0
+        assert 0 <= result.get("p50_seconds") <= result.get("p95_seconds")
+        assert result.get("p95_seconds") <= result.get("max_seconds")
+
+
+def test_summarise():
+    GIVEN("a set of durations")
+    durations = [0.5, 0.1, 0.4, 0.2, 0.3]
+    WHEN("we summarise the durations")
+    result = BenchmarkHandler._summarise(durations)
+    THEN("the summary is correct")
+    assert result.get("calls") == 5
+    assert round(result.get("total_seconds"), 10) == 1.5
+    assert round(result.get("mean_seconds"), 10) == 0.3
+    assert result.get("p50_seconds") == 0.3
+    assert result.get("p95_seconds") == 0.5
+    assert result.get("max_seconds") == 0.5
+
+    WHEN("we summarise no durations")
+    result = BenchmarkHandler._summarise([])
+    THEN("there are no calls")
+    assert result.get("calls") == 0
+    assert result.get("mean_seconds") is None
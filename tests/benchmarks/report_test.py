@@ -0,0 +1,45 @@
+from tests.utils import GIVEN, WHEN, THEN, get_test_file_path, cleanup_test_file
+
+from benchmarks.report import compare_reports, read_report, write_report
+
+
+def test_write_and_read_report():
+    GIVEN("a report and a file path")
+    report = {"parameters": {"runners": 2}, "stages": {"a": {"mean_seconds": 0.5}}}
+    path = get_test_file_path(name="benchmark.json")
+    WHEN("we write the report and read it back")
+    write_report(report=report, path=path)
+    THEN("the report is unchanged")
+    assert read_report(path=path) == report
+    cleanup_test_file(name="benchmark.json")
+
+
+def test_compare_reports():
+    GIVEN("a report and a baseline")
+    baseline = {
+        "stages": {
+            "faster": {"mean_seconds": 2},
+            "slower": {"mean_seconds": 1},
+            "similar": {"mean_seconds": 1},
+            "removed": {"mean_seconds": 1},
+        }
+    }
+    report = {
+        "stages": {
+            "faster": {"mean_seconds": 1},
+            "slower": {"mean_seconds": 1.5},
+            "similar": {"mean_seconds": 1.05},
+            "added": {"mean_seconds": 1},
+        }
+    }
+    WHEN("we compare the report to the baseline")
+    comparison = compare_reports(report=report, baseline=baseline, tolerance=0.1)
+    THEN("only the stages in both reports are compared")
+    assert sorted(comparison.keys()) == ["faster", "similar", "slower"]
+    THEN("the ratios are correct")
+    assert comparison.get("faster").get("ratio") == 0.5
+    assert comparison.get("slower").get("ratio") == 1.5
+    THEN("only the stage which is slower than the tolerance is a regression")
+    assert comparison.get("slower").get("regression") is True
+    assert comparison.get("similar").get("regression") is False
+    assert comparison.get("faster").get("regression") is False
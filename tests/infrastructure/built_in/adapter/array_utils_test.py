@@ -0,0 +1,18 @@
+from tests.utils import GIVEN, WHEN, THEN
+from infrastructure.built_in.adapter.array_utils import make_float_array
+
+
+def test_make_float_array():
+    GIVEN("a length")
+    length = 350
+    WHEN("we make a float array")
+    array = make_float_array(length)
+    THEN("it has the correct length and every value is zero")
+    assert len(array) == length
+    assert not any(array)
+    WHEN("we set a value on a copy of the array")
+    copy = array[:]
+    copy[10] = 2.5
+    THEN("the original array is unchanged")
+    assert copy[10] == 2.5
+    assert array[10] == 0
@@ -0,0 +1,51 @@
+from time import sleep
+
+from tests.utils import GIVEN, WHEN, THEN
+
+from infrastructure.built_in.adapter.async_utils import (
+    make_thread_pool,
+    run_coroutine,
+    run_in_thread,
+    run_together,
+    start_task,
+    wait_for_seconds,
+)
+from infrastructure.built_in.adapter.time_utils import get_time, get_elapsed_time
+
+
+def test_run_in_thread():
+    GIVEN("a thread pool and a blocking function")
+    pool = make_thread_pool(threads=10)
+
+    def blocking(value):
+        sleep(0.1)
+        return value
+
+    async def run_all():
+        return await run_together(
+            *[run_in_thread(pool, blocking, value) for value in range(10)]
+        )
+
+    WHEN("we run the blocking function ten times together")
+    start_time = get_time()
+    results = run_coroutine(run_all())
+    THEN("the results are returned in order")
+    assert results == list(range(10))
+    THEN("the calls were not made one after another")
+    assert get_elapsed_time(start_time) < 0.5
+
+
+def test_start_task():
+    GIVEN("a coroutine which waits before returning")
+
+    async def delayed(value):
+        await wait_for_seconds(0.01)
+        return value
+
+    async def run_task():
+        task = start_task(delayed(1))
+        return await task
+
+    WHEN("we start it as a task and wait for it")
+    THEN("the result of the coroutine is returned")
+    assert run_coroutine(run_task()) == 1
@@ -0,0 +1,34 @@
+from tests.utils import GIVEN, WHEN, THEN
+from infrastructure.built_in.adapter.iter_utils import get_differences, get_product
+
+
+def test_get_product():
+    GIVEN("two lists of values")
+    iterables = [[1, 2], ["a", "b", "c"]]
+    WHEN("we get their product")
+    combinations = list(get_product(iterables))
+    THEN("every combination is included with the last list varying fastest")
+    assert combinations == [
+        (1, "a"),
+        (1, "b"),
+        (1, "c"),
+        (2, "a"),
+        (2, "b"),
+        (2, "c"),
+    ]
+
+
+def test_get_differences():
+    GIVEN("two lists of different lengths")
+    first = [1, 2, 3, 4, 5, 6]
+    second = [1, 0, 3, 4, 0]
+    WHEN("we get the differences from the start of each")
+    differences = list(get_differences(first=first, second=second))
+    THEN("the offsets of the differing items up to the shorter list are given")
+    assert differences == [1, 4]
+    WHEN("we get the differences from a later start in each")
+    differences = list(
+        get_differences(first=first, second=second, first_start=3, second_start=3)
+    )
+    THEN("the offsets are from those starts")
+    assert differences == [1]
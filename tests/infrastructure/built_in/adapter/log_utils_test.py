@@ -0,0 +1,14 @@
+from tests.utils import GIVEN, WHEN, THEN
+from infrastructure.built_in.adapter.log_utils import log_exception
+
+
+def test_log_exception(caplog):
+    GIVEN("an exception being handled")
+    WHEN("we log it")
+    try:
+        raise ValueError("a bad value")
+    except ValueError:
+        log_exception("market %s could not be run", "./1.234.bz2")
+    THEN("the message and the traceback of the exception are logged")
+    assert caplog.records[-1].getMessage() == "market ./1.234.bz2 could not be run"
+    assert "ValueError: a bad value" in caplog.text
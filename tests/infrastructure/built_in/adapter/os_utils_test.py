@@ -9,6 +9,9 @@ from infrastructure.built_in.adapter.os_utils import (
     make_directory_if_required,
     remove_directory,
     remove_file,
+    remove_file_extension,
+    split_path,
+    get_matching_paths,
 )
 
 
@@ -148,3 +151,43 @@ def test_get_extension():
     extension = get_file_extension(path)
     THEN("we get some wacky results")
     assert extension == ".160904847"
+
+
+def test_split_path():
+    GIVEN("a file path")
+    path = "./data/dev/1.160904847.bz2"
+    WHEN("we split the path and remove the extension from the file")
+    directory, file = split_path(path)
+    name = remove_file_extension(file)
+    THEN("the directory, file and name are correct")
+    assert directory == "./data/dev"
+    assert file == "1.160904847.bz2"
+    assert name == "1.160904847"
+
+
+def test_get_matching_paths():
+    GIVEN("a directory containing files with different extensions")
+    names = ["1.2.bz2", "1.1.bz2", "1.3.txt"]
+    paths = [get_test_file_path(name=name) for name in names]
+    for path in paths:
+        open(path, "w+", encoding="utf-8").close()
+    directory, _ = split_path(paths[0])
+
+    WHEN("we get the paths in the directory with an extension")
+    matching_paths = get_matching_paths(path=directory, extension=".bz2")
+    THEN("only the files with the extension are returned in order")
+    assert matching_paths == [paths[1], paths[0]]
+
+    WHEN("we get the paths matching a pattern")
+    matching_paths = get_matching_paths(path=get_file_path(directory, "*.txt"))
+    THEN("only the files matching the pattern are returned")
+    assert matching_paths == [paths[2]]
+
+    WHEN("we get the paths in the directory without an extension")
+    matching_paths = get_matching_paths(path=directory)
+    THEN("all of the files are returned")
+    assert len(matching_paths) == len(names)
+
+    for path in paths:
+        remove_file(path=path)
+    cleanup_test_directory()
@@ -0,0 +1,22 @@
+from tests.utils import GIVEN, WHEN, THEN, lists_are_equal
+from infrastructure.built_in.adapter.process_utils import (
+    get_processor_count,
+    map_in_processes,
+)
+
+
+def test_get_processor_count():
+    GIVEN("the current machine")
+    WHEN("we get the number of processors")
+    count = get_processor_count()
+    THEN("there is at least one")
+    assert count >= 1
+
+
+def test_map_in_processes():
+    GIVEN("a list of values")
+    values = [-1, 2, -3, 4, -5]
+    WHEN("we map a function over the values in two processes")
+    results = list(map_in_processes(function=abs, iterable=values, processes=2))
+    THEN("every value has been processed")
+    assert lists_are_equal(results, [1, 2, 3, 4, 5])
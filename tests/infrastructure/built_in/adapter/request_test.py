@@ -4,12 +4,17 @@ from pytest import mark
 
 
 from tests.utils import GIVEN, WHEN, THEN
+from tests.mock.server import MockServer
 
 from infrastructure.built_in.adapter.request import (
+    ConnectionPool,
+    get_shared_connection_pool,
     post_data,
     open_url,
     get_ok_status,
+    set_shared_connection_pool,
 )
+from infrastructure.built_in.adapter.async_utils import make_thread_pool
 from infrastructure.built_in.adapter.json_utils import make_json
 
 
@@ -57,3 +62,92 @@ def test_error_handling(mock_urlopen):
 
     THEN("no information is returned")
     assert none is None
+
+
+def test_connection_pool_reuses_connections():
+    GIVEN("a connection pool and a local server")
+    pool = ConnectionPool(pool_size=2)
+    with MockServer() as server:
+        WHEN("we make several requests to the server through the pool")
+        responses = [
+            open_url(url=server.get_url("/market"), request=f"{index}", pool=pool)
+            for index in range(5)
+        ]
+        THEN("every response is returned with an ok status")
+        for index, response in enumerate(responses):
+            assert response.get("status_code") == get_ok_status()
+            assert response.get("result") == [{"path": "/market", "body": f"{index}"}]
+        THEN("all of the requests were sent over the same connection")
+        assert len(server.get_requests()) == 5
+        assert server.get_connection_count() == 1
+
+        WHEN("the server responds with an error status")
+        response = open_url(url=server.get_url("/error"), request="", pool=pool)
+        THEN("an empty dictionary is returned")
+        assert response == {}
+
+        WHEN("we post data through the pool")
+        response = post_data(url=server.get_url("/login"), data="a=b", pool=pool)
+        THEN("the response is returned with an ok status")
+        assert response.get("status_code") == get_ok_status()
+        assert response.get("result") == [{"path": "/login", "body": "a=b"}]
+
+    THEN("the latency of each endpoint is recorded")
+    statistics = pool.get_statistics()
+    assert statistics.get(server.get_url("/market")).get("calls") == 5
+    assert statistics.get(server.get_url("/market")).get("errors") == 0
+    assert statistics.get(server.get_url("/market")).get("mean_seconds") > 0
+    assert statistics.get(server.get_url("/error")).get("calls") == 1
+    assert statistics.get(server.get_url("/login")).get("calls") == 1
+    pool.close()
+
+
+def test_connection_pool_statistics_from_threads():
+    GIVEN("a connection pool shared by many threads and a local server")
+    pool = ConnectionPool(pool_size=16)
+    threads = make_thread_pool(threads=16)
+    with MockServer() as server:
+        url = server.get_url("/market")
+        WHEN("every thread makes requests through the pool at the same time")
+        responses = list(
+            threads.map(
+                lambda index: open_url(url=url, request=f"{index}", pool=pool),
+                range(400),
+            )
+        )
+    threads.shutdown()
+    THEN("every response is returned")
+    assert all(response.get("status_code") == get_ok_status() for response in responses)
+    THEN("every request is counted in the statistics")
+    statistics = pool.get_statistics().get(url)
+    assert statistics.get("calls") == 400
+    assert statistics.get("errors") == 0
+    assert 0 < statistics.get("max_seconds") <= statistics.get("total_seconds")
+    pool.close()
+
+
+def test_connection_pool_error_handling():
+    GIVEN("a connection pool with short timeouts and a server which has stopped")
+    pool = ConnectionPool(connect_timeout=0.5, read_timeout=0.5)
+    with MockServer() as server:
+        url = server.get_url("/market")
+    WHEN("we make a request")
+    response = open_url(url=url, request="", pool=pool)
+    THEN("no information is returned")
+    assert response is None
+    THEN("the failed request is recorded")
+    assert pool.get_statistics().get(url).get("errors") == 1
+    pool.close()
+
+
+def test_shared_connection_pool():
+    GIVEN("the shared connection pool")
+    original = get_shared_connection_pool()
+    THEN("the same pool is returned each time")
+    assert get_shared_connection_pool() is original
+    WHEN("we replace the shared pool")
+    pool = ConnectionPool(pool_size=1)
+    set_shared_connection_pool(pool)
+    THEN("the new pool is shared")
+    assert get_shared_connection_pool() is pool
+    set_shared_connection_pool(original)
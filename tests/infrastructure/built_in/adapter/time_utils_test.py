@@ -0,0 +1,28 @@
+from tests.utils import GIVEN, WHEN, THEN
+from infrastructure.built_in.adapter.time_utils import (
+    get_cpu_time,
+    get_elapsed_cpu_time,
+    get_elapsed_time,
+    get_time,
+)
+
+
+def test_elapsed_time():
+    GIVEN("a start time")
+    start = get_time()
+    WHEN("we get the time elapsed since the start")
+    elapsed = get_elapsed_time(start)
+    THEN("the elapsed time is not negative")
+    assert elapsed >= 0
+    THEN("a later time is not before the start")
+    assert get_time() >= start
+
+
+def test_elapsed_cpu_time():
+    GIVEN("a start cpu time")
+    start = get_cpu_time()
+    WHEN("we do some work and get the cpu time elapsed since the start")
+    sum(range(10000))
+    elapsed = get_elapsed_cpu_time(start)
+    THEN("the elapsed cpu time is not negative")
+    assert elapsed >= 0
@@ -0,0 +1,81 @@
+from unittest.mock import patch
+
+from tests.utils import GIVEN, WHEN, THEN
+from tests.mock.mediator import MockMediator
+
+from infrastructure.external_api.market.batch.handler import (
+    ExternalAPIMarketBatchHandler,
+)
+from infrastructure.external_api.market.handler import ExternalAPIMarketHandler
+
+
+def test_batches():
+    GIVEN("a batch handler and forty markets")
+    handler = ExternalAPIMarketBatchHandler(headers={}, environment="Dev")
+    for market_id in __get_market_ids(count=40):
+        handler.add_market(external_api=__get_market_handler(market_id=market_id))
+    WHEN("we split the markets into batches")
+    batches = handler.get_batches()
+    THEN("each batch is within the maximum request weight")
+    assert handler.get_batch_size() == 6
+    assert all(len(batch) <= 6 for batch in batches)
+    THEN("every market is in exactly one batch")
+    assert len(batches) == 7
+    assert sorted(sum(batches, [])) == sorted(__get_market_ids(count=40))
+
+    WHEN("we remove a market")
+    handler.remove_market(market_id="1.100")
+    THEN("it is no longer in a batch")
+    assert 1.1 not in sum(handler.get_batches(), [])
+
+    GIVEN("a batch handler with a lower maximum weight")
+    handler = ExternalAPIMarketBatchHandler(headers={}, max_weight=10)
+    THEN("there is still at least one market in each batch")
+    assert handler.get_batch_size() == 1
+
+
+@patch("tests.mock.mediator.MockMediator.notify")
+@patch("infrastructure.external_api.handler.ExternalAPIHandler._call_exchange")
+def test_get_markets(mock_call_exchange, mock_notify):
+    GIVEN("a batch handler with forty markets and an exchange missing one market")
+    market_ids = __get_market_ids(count=40)
+    missing_market_id = market_ids[-1]
+
+    def call_exchange(request):
+        return [
+            {"marketId": str(market_id), "runners": []}
+            for market_id in market_ids
+            if str(market_id) in request and market_id != missing_market_id
+        ]
+
+    mock_call_exchange.side_effect = call_exchange
+    handler = ExternalAPIMarketBatchHandler(headers={}, environment="Dev")
+    for market_id in market_ids:
+        handler.add_market(external_api=__get_market_handler(market_id=market_id))
+
+    WHEN("we get the markets")
+    handler.get_markets()
+    THEN("one request is made for each batch rather than each market")
+    assert mock_call_exchange.call_count == 7
+    THEN("every market has been passed its own book")
+    assert mock_notify.call_count == 40
+    books = [kwargs.get("data") for args, kwargs in mock_notify.call_args_list]
+    for call, book in zip(mock_notify.call_args_list, books):
+        assert call.kwargs.get("event") == "external data fetched"
+    assert sorted(
+        float(book.get("marketId")) for book in books if book.get("marketId")
+    ) == (sorted(market_ids[:-1]))
+    THEN("the missing market is given an empty book")
+    assert len([book for book in books if not book.get("marketId")]) == 1
+    THEN("every book has the same process time")
+    assert len({book.get("process_time") for book in books}) == 1
+
+
+def __get_market_ids(count):
+    return [float("1.%d" % (100 + index)) for index in range(count)]
+
+
+def __get_market_handler(market_id):
+    return ExternalAPIMarketHandler(
+        mediator=MockMediator(), environment="Dev", headers={}, market_id=market_id
+    )
@@ -186,3 +186,25 @@ def get_expected_request():
         },
         "id": 1,
     }
+
+
+@patch("tests.mock.mediator.MockMediator.notify")
+@patch("infrastructure.external_api.handler.ExternalAPIHandler._call_exchange")
+def test_fetch_and_process_market(mock_call_exchange, mock_notify):
+    GIVEN("a market handler and a response from the exchange")
+    mock_call_exchange.return_value = [{"marketId": "1.123", "runners": []}]
+    market_handler = ExternalAPIMarketHandler(
+        mediator=MockMediator(), environment="Dev", headers={}, market_id=1.123
+    )
+    WHEN("we fetch the market")
+    data = market_handler.fetch_market()
+    THEN("the data is returned with a process time and the mediator is not notified")
+    assert data.get("marketId") == "1.123"
+    assert isinstance(data.get("process_time"), str)
+    assert not mock_notify.called
+    WHEN("we process the fetched data")
+    market_handler.process_market(data=data)
+    THEN("the mediator is notified with the data")
+    args, kwargs = mock_notify.call_args
+    assert kwargs.get("event") == "external data fetched"
+    assert kwargs.get("data") == data
@@ -162,6 +162,30 @@ def test_reduced_metadata(required_variables):
     assert len(adapted_item_data.keys()) == 3
 
 
+@patch(
+    "infrastructure.external_api.market.record.item.adapter.MetadataHandler.get_required_variables"
+)
+def test_plan(required_variables):
+    GIVEN("a plan made for a reduced schema and a dictionary with all the information")
+    required_variables.return_value = ["id", "ex_average_back_price", "sp_lay_price"]
+    plan = ItemAdapter.make_plan(metadata=MetadataHandler())
+    item_data = __get_data()
+    required_variables.return_value = all_variables
+
+    WHEN("we instantiate the item handler object with the plan")
+    adapted_item_data = ItemAdapter(item_data, plan=plan).get_adapted_data()
+
+    THEN("the object has only the variables in the plan, in the order of the schema")
+    assert list(adapted_item_data.keys()) == [
+        "id",
+        "sp_lay_price",
+        "ex_average_back_price",
+    ]
+    assert adapted_item_data.get("ex_average_back_price") == ItemAdapter(
+        item_data
+    ).get_adapted_data().get("ex_average_back_price")
+
+
 @patch(
     "infrastructure.external_api.market.record.item.adapter.MetadataHandler.get_required_variables"
 )
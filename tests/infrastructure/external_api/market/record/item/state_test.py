@@ -0,0 +1,138 @@
+from pytest import approx
+
+from tests.utils import GIVEN, WHEN, THEN
+from infrastructure.external_api.market.record.item.state import ItemState
+
+
+def test_unchanged_record():
+    GIVEN("an item state which has been given a record and its data")
+    record = __get_record(price_sizes=[{"price": 2.0, "size": 10.0}])
+    data = {"id": 1}
+    state = ItemState()
+    state.set_data(record=record, data=data)
+
+    WHEN("we check an identical copy of the record and a changed record")
+    unchanged = state.is_unchanged(
+        record=__get_record(price_sizes=[{"price": 2.0, "size": 10.0}])
+    )
+    changed = state.is_unchanged(
+        record=__get_record(price_sizes=[{"price": 2.0, "size": 12.0}])
+    )
+
+    THEN("only the identical record is unchanged and its data is kept")
+    assert unchanged
+    assert not changed
+    assert state.get_data() is data
+
+
+def test_new_state():
+    GIVEN("an item state which has not been given a record")
+    state = ItemState()
+
+    WHEN("we check an empty record")
+    unchanged = state.is_unchanged(record={})
+
+    THEN("the record is not unchanged")
+    assert not unchanged
+
+
+def test_get_totals():
+    GIVEN("an item state and a traded volume which grows between polls")
+    state = ItemState()
+    polls = [
+        [],
+        [{"price": 2.0, "size": 10.0}],
+        [{"price": 2.0, "size": 15.0}],
+        [{"price": 1.5, "size": 1.0}, {"price": 2.0, "size": 15.0}],
+        [{"price": 1.5, "size": 1.0}, {"price": 2.0, "size": 15.0}],
+        [
+            {"price": 1.5, "size": 3.0},
+            {"price": 2.0, "size": 15.0},
+            {"price": 2.5, "size": 4.0},
+            {"price": 3.0, "size": 8.0},
+        ],
+        [
+            {"price": 1.2, "size": 6.0},
+            {"price": 1.5, "size": 3.0},
+            {"price": 2.0, "size": 20.0},
+            {"price": 2.5, "size": 4.0},
+            {"price": 2.75, "size": 1.0},
+            {"price": 3.0, "size": 9.0},
+        ],
+    ]
+
+    for price_sizes in polls:
+        WHEN("we get the totals for the poll")
+        totals = state.get_totals(
+            name="tradedVolume",
+            price_sizes=price_sizes,
+            calculate=__calculate,
+            count=2,
+        )
+
+        THEN("the totals are the sums over all of the levels")
+        assert totals == approx(__sum(price_sizes=price_sizes))
+
+
+def test_get_totals_removed_level():
+    GIVEN("an item state which has totals for a traded volume")
+    state = ItemState()
+    state.get_totals(
+        name="tradedVolume",
+        price_sizes=[{"price": 2.0, "size": 10.0}, {"price": 3.0, "size": 5.0}],
+        calculate=__calculate,
+        count=2,
+    )
+
+    WHEN("we get the totals for a poll where a level has gone")
+    price_sizes = [{"price": 3.0, "size": 5.0}, {"price": 4.0, "size": 1.0}]
+    totals = state.get_totals(
+        name="tradedVolume", price_sizes=price_sizes, calculate=__calculate, count=2
+    )
+
+    THEN("the totals are the sums over the levels in the poll")
+    assert totals == approx(__sum(price_sizes=price_sizes))
+
+
+def test_get_totals_changed_levels_only():
+    GIVEN("an item state which has totals for a traded volume")
+    state = ItemState()
+    calculated = []
+
+    def calculate(price, size):
+        calculated.append(price)
+        return __calculate(price=price, size=size)
+
+    price_sizes = [{"price": 1.0 + index / 10, "size": 10.0} for index in range(50)]
+    state.get_totals(
+        name="tradedVolume", price_sizes=price_sizes, calculate=calculate, count=2
+    )
+    calculated.clear()
+
+    WHEN("we get the totals for a poll where one level has changed")
+    price_sizes = [dict(price_size) for price_size in price_sizes]
+    price_sizes[20]["size"] = 12.0
+    state.get_totals(
+        name="tradedVolume", price_sizes=price_sizes, calculate=calculate, count=2
+    )
+
+    THEN("only the changed level is calculated")
+    assert calculated == [price_sizes[20].get("price")]
+
+
+def __calculate(price, size):
+    return (size, size * price)
+
+
+def __sum(price_sizes):
+    return [
+        sum(price_size.get("size") for price_size in price_sizes),
+        sum(
+            price_size.get("size") * price_size.get("price")
+            for price_size in price_sizes
+        ),
+    ]
+
+
+def __get_record(price_sizes):
+    return {"selectionId": 1, "ex": {"tradedVolume": price_sizes}}
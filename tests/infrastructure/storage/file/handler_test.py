@@ -1,3 +1,4 @@
+import bz2
 from types import GeneratorType
 from pytest import mark
 
@@ -7,6 +8,7 @@ from tests.utils import (
     WHEN,
     THEN,
     get_test_directory,
+    get_test_file_path,
     cleanup_test_file,
 )
 from infrastructure.storage.file.handler import FileHandler
@@ -63,6 +65,38 @@ def test_handler_test_file():
     cleanup_test_file(name=test_file)
 
 
+def test_stream_bz2_file():
+    GIVEN("a bz2 file containing records, a blank line and invalid json")
+    test_file = "test_file_handler.bz2"
+    lines = [b'{"pt": 1}\n', b"\n", b'{"pt": 2}\n', b"not json\n", b'{"pt": 3}\n']
+    with bz2.open(get_test_file_path(name=test_file), "wb") as file:
+        file.writelines(lines)
+    file_handler = FileHandler(directory=get_test_directory(), file=test_file)
+
+    WHEN("we start to stream the file")
+    generator = file_handler.get_file_as_generator()
+    first_record = next(generator)
+    THEN("the first record is returned and only its line has been read")
+    assert first_record == {"pt": 1}
+    assert file_handler.get_records_read() == 1
+    assert file_handler.get_bytes_read() == len(lines[0])
+
+    WHEN("we read the rest of the file")
+    records = list(generator)
+    THEN("only the valid records are returned")
+    assert records == [{"pt": 2}, {"pt": 3}]
+    THEN("the counters cover the whole file")
+    assert file_handler.get_records_read() == 3
+    assert file_handler.get_bytes_read() == sum(len(line) for line in lines)
+    assert file_handler.get_records_per_second() > 0
+
+    THEN("the file can be read again as a list")
+    assert file_handler.get_file_as_list() == [{"pt": 1}, {"pt": 2}, {"pt": 3}]
+    assert file_handler.get_first_record() == {"pt": 1}
+
+    cleanup_test_file(name=test_file)
+
+
 @mark.slow
 def test_handler_download_file():
     GIVEN("a file and a directory with the correct market type")
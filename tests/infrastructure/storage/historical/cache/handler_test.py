@@ -0,0 +1,111 @@
+from bz2 import open as open_bz2
+from json import dumps
+
+from pytest import mark
+
+from tests.utils import GIVEN, WHEN, THEN, get_test_file_path, cleanup_test_directory
+
+from benchmarks.generator import MarketGenerator
+
+from infrastructure.storage.historical.cache.handler import HistoricalCacheHandler
+from infrastructure.storage.historical.download.file.handler import (
+    HistoricalDownloadFileHandler,
+)
+from infrastructure.storage.historical.download.file.record.adapter import (
+    HistoricalDownloadFileRecordAdapter,
+)
+from infrastructure.built_in.adapter.os_utils import remove_file, remove_tree
+from infrastructure.third_party.adapter.numpy_utils import is_not_a_number
+
+
+def test_build_and_load():
+    GIVEN("a historical file and a cache handler")
+    path = __make_market_file(name="1.999999999.bz2")
+    cache_directory = get_test_file_path(name="cache")
+    handler = HistoricalCacheHandler(directory=cache_directory)
+    THEN("the market is not in the cache")
+    assert handler.load(path=path) is None
+
+    WHEN("we get the market")
+    built = handler.get_market(path=path)
+    THEN("the header describes the market")
+    header = built.get("header")
+    assert header.get("market_id") == "1.999999999"
+    assert header.get("market_start_time") == "2019-09-30T10:42:00.000Z"
+    assert header.get("outcome") == MarketGenerator(duration=20).get_winner_id()
+    assert header.get("key") == handler.get_key(path=path)
+
+    WHEN("we load the market from the cache")
+    loaded = handler.load(path=path)
+    THEN("the cached records are the same as the converted records")
+    expected = __get_converted_records(path=path)
+    records = list(HistoricalCacheHandler.get_records(market=loaded))
+    assert loaded.get("header") == header
+    assert len(records) == len(expected)
+    for record, expected_record in zip(records, expected):
+        assert record.get("extract_time") == expected_record.get("extract_time")
+        assert record.get("closed_indicator") == expected_record.get("closed_indicator")
+        for item, expected_item in zip(
+            record.get("items"), expected_record.get("items")
+        ):
+            assert item.keys() == expected_item.keys()
+            for key, value in expected_item.items():
+                assert (
+                    item.get(key) == value
+                    or (value is None and item.get(key) is None)
+                    or (
+                        isinstance(value, float)
+                        and is_not_a_number(value)
+                        and is_not_a_number(item.get(key))
+                    )
+                )
+
+    WHEN("the file changes")
+    remove_file(path=path)
+    path = __make_market_file(name="1.999999999.bz2", duration=30)
+    THEN("the cached market is no longer used")
+    assert handler.load(path=path) is None
+    assert HistoricalCacheHandler(directory=cache_directory).load(path=path) is None
+
+    remove_file(path=path)
+    remove_tree(path=cache_directory)
+    cleanup_test_directory()
+
+
+def test_code_version():
+    GIVEN("the code version of the cache")
+    version = HistoricalCacheHandler.get_code_version()
+    THEN("it is stable between calls")
+    assert version == HistoricalCacheHandler.get_code_version()
+
+
+@mark.slow
+def test_historical_file():
+    GIVEN("a historical file and a cache handler")
+    path = "./dev/1.163093692.bz2"
+    cache_directory = get_test_file_path(name="cache")
+    handler = HistoricalCacheHandler(directory=cache_directory)
+    WHEN("we get the market twice")
+    built = handler.get_market(path=path)
+    loaded = handler.get_market(path=path)
+    THEN("the market is loaded from the cache the second time")
+    assert loaded.get("header") == built.get("header")
+    assert loaded.get("header").get("outcome") == 19795432
+    remove_tree(path=cache_directory)
+    cleanup_test_directory()
+
+
+def __make_market_file(name, duration=20):
+    path = get_test_file_path(name=name)
+    generator = MarketGenerator(duration=duration)
+    with open_bz2(path, "wt", encoding="utf-8") as file:
+        for record in generator.get_stream_records():
+            file.write(dumps(record) + "\n")
+    return path
+
+
+def __get_converted_records(path):
+    directory, file = path.rsplit("/", 1)
+    handler = HistoricalDownloadFileHandler(directory=directory, file=file)
+    adapter = HistoricalDownloadFileRecordAdapter()
+    return list(map(adapter.convert, handler.get_file_as_list()))
@@ -138,8 +138,38 @@ def test_process():
     assert handler._items == fourth_items
 
 
+def test_process_shares_unchanged_items():
+    GIVEN("a handler that has returned the state of the market for a second")
+    items = __get_default_items()
+    handler = HistoricalDownloadFileDataHandler(
+        items=items, market_start_time="1970-01-01T00:00:00.000Z"
+    )
+    first_record = __get_test_ex_record()
+    first_record["pt"] = -300 * 1000
+    first_dict = handler.process(first_record)
+    first_items = make_copy(first_dict.get("items"))
+
+    WHEN("we process a record for the next second which changes some of the items")
+    second_record = __get_test_ex_record()
+    second_record["pt"] = -299 * 1000
+    second_dict = handler.process(second_record)
+
+    THEN("the items returned for the first second have not changed")
+    assert first_dict.get("items") == first_items
+    THEN("the changed items are not shared with the first second")
+    changed_ids = set(__get_from_list("id", __get_rc(second_record)))
+    for changed_id in changed_ids:
+        assert (
+            second_dict.get("items")[changed_id]
+            is not first_dict.get("items")[changed_id]
+        )
+    THEN("the unchanged items are shared with the first second")
+    for item_id in set(__get_from_list("id", items)) - changed_ids:
+        assert second_dict.get("items")[item_id] is first_dict.get("items")[item_id]
+
+
 def test_ex_record():
-    GIVEN("a set of default items and a data record")
+    GIVEN("a set of default items and a record of exchange changes")
 
     record = __get_test_ex_record()
     items = __get_default_items()
@@ -148,41 +178,21 @@ def test_ex_record():
     handler = HistoricalDownloadFileDataHandler(
         items=items, market_start_time="2020-01-01T00:00:00.000Z"
     )
-    handler.set_record(record=record)
     default_dict = __get_default_dict()
 
     THEN("the handler contains the correct items")
     assert handler._items == default_dict
 
-    WHEN("we add the available to back")
-    handler._add_available_to_back()
+    WHEN("we process the record")
+    handler.process(record)
 
-    THEN("the correct items exist in the object")
-    dict_atb = __add_atb(default_dict)
-    assert handler._items == dict_atb
-
-    WHEN("we add the available to lay data")
-    handler._add_available_to_lay()
-
-    THEN("the correct items exist in the object")
-    dict_atb_atl = __add_atl(dict_atb)
-    assert handler._items == dict_atb_atl
-
-    WHEN("we add the traded volume data")
-    handler._add_traded_volume()
-
-    THEN("the correct items exist in the object")
-    assert handler._items == __add_trd(dict_atb_atl)
-
-    GIVEN("another instantiated handler")
-    another_handler = HistoricalDownloadFileDataHandler(
-        items=__get_default_items(), market_start_time="2020-01-01T00:00:00.000Z"
-    )
-    WHEN("we add all of the exchange data")
-    another_handler.set_record(record=record)
-    another_handler._add_exchange_data()
-    THEN("the correct items exist in the new handler")
-    assert another_handler._items == handler._items
+    THEN("the ladders of the runners hold the available and traded volume")
+    assert handler._items == __add_trd(__add_atl(__add_atb(default_dict)))
+    THEN("the traded volume ladders keep their running totals")
+    for item_id, item in handler._items.items():
+        assert item.get_ladder("trd").get_totals() == (
+            __get_totals(__add_trd(default_dict)[item_id]["ex"]["trd"])
+        )
 
 
 def test_sp_records():
@@ -202,26 +212,22 @@ def test_sp_records():
     default_dict = __get_default_dict()
     assert handler._items == default_dict
 
-    WHEN("we add the sp back taken")
-    handler.set_record(record=spb_record)
-    handler._add_sp_back_taken()
+    WHEN("we process the sp back taken")
+    handler.process(spb_record)
     THEN("the correct items exist within the handler")
-    dict_spb = __add_spb(default_dict)
+    dict_spb = __add_all(default_dict, spb_record)
     assert handler._items == dict_spb
 
-    WHEN("we add the sp lay taken")
-    handler.set_record(record=spl_record)
-    handler._add_sp_lay_taken()
+    WHEN("we process the sp lay taken")
+    handler.process(spl_record)
     THEN("the correct items exist within the handler")
-    dict_spb_spl = __add_spl(dict_spb)
+    dict_spb_spl = __add_all(dict_spb, spl_record)
     assert handler._items == dict_spb_spl
 
-    WHEN("we add the sp near price")
-    handler.set_record(record=spn_record)
-    handler._add_sp_near_price()
+    WHEN("we process the sp near price")
+    handler.process(spn_record)
     THEN("the correct items exist within the handler")
-    dict_sp = __add_spn(dict_spb_spl)
-    assert handler._items == __add_spn(dict_sp)
+    assert handler._items == __add_all(dict_spb_spl, spn_record)
 
 
 def test_removal_date():
@@ -679,6 +685,17 @@ def __add_spn(original_data, record=__get_test_spn_record()):
     return data
 
 
+def __get_totals(ladder):
+    sizes = [size for size in ladder.values() if size > 0]
+    if not sizes:
+        return (0, 0, 0)
+    return (
+        sum(sizes),
+        sum(price * size for price, size in ladder.items() if size > 0),
+        sum((price - 1) * size for price, size in ladder.items() if size > 0),
+    )
+
+
 def __get_default_items():
     return [
         {
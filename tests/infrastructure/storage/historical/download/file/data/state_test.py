@@ -0,0 +1,121 @@
+from tests.utils import GIVEN, WHEN, THEN, almost_equal
+from infrastructure.built_in.adapter.copy_utils import make_copy
+from infrastructure.storage.historical.download.file.data.state import (
+    RunnerState,
+    TickLadder,
+)
+
+
+def test_tick_ladder():
+    GIVEN("an empty ladder")
+    ladder = TickLadder()
+    THEN("it is equal to an empty dictionary")
+    assert ladder == {}
+    assert not ladder
+
+    WHEN("we apply some changes including a price which is not on the ladder")
+    ladder.update(changes=[[2.5, 10], [1.01, 5.5], [3.33, 2], [990, 1]])
+    THEN("the ladder has the sizes in price order")
+    assert ladder.items() == [(1.01, 5.5), (2.5, 10), (990, 1), (3.33, 2)]
+    assert ladder == {2.5: 10, 1.01: 5.5, 3.33: 2, 990: 1}
+    assert ladder.get(2.5) == 10
+    assert ladder.get(2.52) is None
+    assert 3.33 in ladder
+    assert len(ladder) == 4
+
+    WHEN("we remove the lowest and highest prices")
+    ladder.update(changes=[[1.01, 0], [990, 0], [3.33, 0]])
+    THEN("only the remaining price is left")
+    assert ladder == {2.5: 10}
+    assert list(ladder) == [2.5]
+
+
+def test_tick_ladder_copy():
+    GIVEN("a ladder and a copy of it")
+    ladder = TickLadder({1.5: 20})
+    copy = ladder.copy()
+    WHEN("we change the copy")
+    copy.set(price=1.5, size=0)
+    copy.set(price=1.6, size=2)
+    THEN("the original ladder is unchanged")
+    assert ladder == {1.5: 20}
+    assert copy == {1.6: 2}
+
+
+def test_runner_state():
+    GIVEN("the state of a runner")
+    state = {
+        "ex": {"atb": {1.5: 20}, "trd": {1.5: 100}, "atl": {1.6: 5}},
+        "sp": {"spn": 1.55, "spb": {1.01: 2}, "spl": {}},
+    }
+    WHEN("we make a runner state from it")
+    runner = RunnerState(state=state)
+    THEN("it can be read and compared as the dictionary it was made from")
+    assert runner == state
+    assert runner.get("ex").get("trd") == {1.5: 100}
+    assert runner.get("sp").get("spn") == 1.55
+    assert runner.get("removal_date") is None
+    assert runner.to_dict() == state
+
+    WHEN("we copy the runner and change a ladder and the removal date of the copy")
+    copy = runner.copy()
+    ladder = copy.get_ladder("atb").copy()
+    ladder.set(price=1.5, size=0)
+    copy.set_ladder("atb", ladder)
+    copy.removal_date = "2020-01-01T10:00:00.000Z"
+    THEN("the original runner is unchanged and the unchanged ladders are shared")
+    assert runner == state
+    assert copy.get("ex").get("atb") == {}
+    assert copy.get("removal_date") == "2020-01-01T10:00:00.000Z"
+    assert copy.get_ladder("trd") is runner.get_ladder("trd")
+
+    WHEN("we deep copy the runner")
+    deep_copy = make_copy(runner)
+    THEN("the copy is equal to the runner but shares nothing with it")
+    assert deep_copy == runner
+    assert deep_copy.get_ladder("trd") is not runner.get_ladder("trd")
+
+
+def test_tick_ladder_best_prices():
+    GIVEN("a ladder")
+    ladder = TickLadder({2.5: 10, 1.5: 3, 4.1: 7})
+    THEN("the best prices are the lowest and highest prices with a size")
+    assert ladder.get_min_price() == 1.5
+    assert ladder.get_max_price() == 4.1
+
+    WHEN("the best prices are taken")
+    ladder.update(changes=[[1.5, 0], [4.1, 0]])
+    THEN("the next prices become the best prices")
+    assert ladder.get_min_price() == 2.5
+    assert ladder.get_max_price() == 2.5
+
+    WHEN("the last price is taken")
+    ladder.set(price=2.5, size=0)
+    THEN("there are no best prices")
+    assert ladder.get_min_price() is None
+    assert ladder.get_max_price() is None
+
+
+def test_tick_ladder_totals():
+    GIVEN("a ladder which keeps running totals")
+    ladder = TickLadder({2.5: 10, 4.1: 7}, totals=True)
+    THEN("the totals are the sums of the sizes, price x size and liabilities")
+    size, price_size, liability = ladder.get_totals()
+    assert size == 17
+    assert almost_equal(price_size, (2.5 * 10) + (4.1 * 7))
+    assert almost_equal(liability, (1.5 * 10) + (3.1 * 7))
+
+    WHEN("a size changes and a copy of the ladder has a new price")
+    ladder.set(price=2.5, size=12)
+    copy = ladder.copy()
+    copy.set(price=1.5, size=4)
+    THEN("the totals of each ladder are updated separately")
+    assert ladder.get_totals()[0] == 19
+    assert copy.get_totals()[0] == 23
+
+    WHEN("every price is removed")
+    ladder.update(changes=[[2.5, 0], [4.1, 0]])
+    THEN("the totals are zero")
+    assert ladder.get_totals() == (0, 0, 0)
+    THEN("a ladder without totals does not keep any")
+    assert TickLadder({2.5: 10}).get_totals() is None
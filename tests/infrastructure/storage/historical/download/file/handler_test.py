@@ -1,9 +1,13 @@
+from bz2 import open as open_bz2
+from json import dumps
 from unittest.mock import patch
 from pytest import mark
 
-from tests.utils import GIVEN, WHEN, THEN
+from tests.utils import GIVEN, WHEN, THEN, get_test_file_path, cleanup_test_file
 from tests.mock.mediator import MockMediator
 
+from benchmarks.generator import MarketGenerator
+
 from infrastructure.storage.historical.download.file.handler import (
     HistoricalDownloadFileHandler,
 )
@@ -170,6 +174,12 @@ def test_gap_fill(mock_handler_init):
     THEN("the final record has the correct properties")
     assert market[-1] == initial_market_list[2]
 
+    THEN("the filled records share the data of the record they carry forward")
+    assert all(
+        record.get("stuff") is initial_market_list[0].get("stuff")
+        for record in market[0:288]
+    )
+
 
 @mark.slow
 @patch("tests.mock.mediator.MockMediator.notify")
@@ -196,6 +206,38 @@ def test_post_order(mock_notify):
     assert data.get("orders") == orders
 
 
+def test_single_pass():
+    GIVEN("a generated market file and a handler")
+    generator = MarketGenerator(duration=120)
+    path = get_test_file_path(name=generator.get_market_id() + ".bz2")
+    with open_bz2(path, "wt", encoding="utf-8") as file:
+        for record in generator.get_stream_records():
+            file.write(dumps(record) + "\n")
+    directory, file = path.rsplit("/", 1)
+
+    with patch(
+        "infrastructure.storage.file.handler.bz2.open", side_effect=open_bz2
+    ) as mock_open:
+        handler = HistoricalDownloadFileHandler(file=file, directory=directory)
+        THEN("the market is valid and the market definition has been read")
+        assert handler.is_valid_market()
+        assert handler.get_market_start_time() == generator.get_market_start_time()
+
+        WHEN("we read the market until it closes and get the outcome")
+        market = handler.get_file_as_list()
+        outcome = handler.get_outcome()
+
+    THEN("every record is processed")
+    assert market[0].get("extract_time") == -180
+    assert market[-1].get("closed_indicator") is True
+    THEN("the outcome is the winner from the settled market definition")
+    assert outcome == generator.get_winner_id()
+    THEN("the file has only been opened once")
+    assert mock_open.call_count == 1
+
+    cleanup_test_file(name=file)
+
+
 def __get_test_ids():
     return [
         26291825,
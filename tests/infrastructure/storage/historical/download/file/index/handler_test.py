@@ -0,0 +1,88 @@
+from bz2 import open as open_bz2
+from json import dumps
+
+from tests.utils import GIVEN, WHEN, THEN, get_test_file_path, cleanup_test_directory
+
+from benchmarks.generator import MarketGenerator
+
+from infrastructure.storage.historical.download.file.handler import (
+    HistoricalDownloadFileHandler,
+)
+from infrastructure.storage.historical.download.file.index.handler import (
+    HistoricalDownloadFileIndexHandler,
+)
+from infrastructure.built_in.adapter.os_utils import remove_file
+
+
+def test_keyframe():
+    for name in ["1.999999999.bz2", "1.999999999.txt"]:
+        GIVEN("a historical file which starts long before the required records")
+        path = __make_market_file(name=name)
+        directory, file = path.rsplit("/", 1)
+        handler = HistoricalDownloadFileIndexHandler(
+            directory=directory, file=file, interval=60
+        )
+
+        WHEN("we get a keyframe from before the required records")
+        keyframe = handler.get_keyframe()
+        THEN("it is the last keyframe before the required records")
+        assert keyframe.get("extract_time") == -360
+        assert keyframe.get("offset") > 0
+
+        WHEN("we process the file from the keyframe and from the start")
+        expected = HistoricalDownloadFileHandler(
+            directory=directory, file=file
+        ).get_file_as_list()
+        resumed = HistoricalDownloadFileHandler(
+            directory=directory, file=file, keyframe=keyframe
+        )
+        THEN("the same records are made")
+        assert resumed.get_file_as_list() == expected
+        THEN("the records before the keyframe have not been read")
+        assert resumed.get_records_read() < 400
+
+        remove_file(path=path)
+        remove_file(path=path + ".index.json")
+    cleanup_test_directory()
+
+
+def test_index_is_saved():
+    GIVEN("a historical file and an index handler")
+    path = __make_market_file(name="1.999999999.txt")
+    directory, file = path.rsplit("/", 1)
+    handler = HistoricalDownloadFileIndexHandler(
+        directory=directory, file=file, interval=60
+    )
+    THEN("there is no saved index")
+    assert handler.load() is None
+    WHEN("we get the index")
+    index = handler.get_index()
+    THEN("the index has been saved")
+    loaded = handler.load()
+    assert [keyframe.get("extract_time") for keyframe in loaded.get("keyframes")] == [
+        keyframe.get("extract_time") for keyframe in index.get("keyframes")
+    ]
+    THEN("a handler with a different interval does not use the saved index")
+    assert (
+        HistoricalDownloadFileIndexHandler(
+            directory=directory, file=file, interval=120
+        ).load()
+        is None
+    )
+    WHEN("the file changes")
+    __make_market_file(name="1.999999999.txt", duration=700)
+    THEN("the saved index is no longer used")
+    assert handler.load() is None
+
+    remove_file(path=path)
+    remove_file(path=path + ".index.json")
+    cleanup_test_directory()
+
+
+def __make_market_file(name, duration=600):
+    path = get_test_file_path(name=name)
+    opener = open_bz2 if name.endswith(".bz2") else open
+    with opener(path, "wt", encoding="utf-8") as file:
+        for record in MarketGenerator(duration=duration).get_stream_records():
+            file.write(dumps(record) + "\n")
+    return path
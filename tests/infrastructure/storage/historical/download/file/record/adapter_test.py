@@ -1,18 +1,29 @@
-from pytest import mark
+from unittest.mock import patch
+
+from pytest import approx, mark
 
 from tests.utils import GIVEN, WHEN, THEN
+from app.market.metadata.handler import MetadataHandler
 from infrastructure.storage.historical.download.file.record.adapter import (
     HistoricalDownloadFileRecordAdapter,
 )
 from infrastructure.storage.historical.download.file.handler import (
     HistoricalDownloadFileHandler,
 )
+from infrastructure.storage.historical.download.file.data.state import (
+    RunnerState,
+    TickLadder,
+)
 from infrastructure.third_party.adapter.numpy_utils import is_not_a_number
 
 
 @mark.slow
-def test_adapter():
+@patch(
+    "infrastructure.storage.historical.download.file.record.adapter.MetadataHandler.get_required_variables"
+)
+def test_adapter(required_variables):
     GIVEN("a file loaded in to the historical download file class and a record adapter")
+    required_variables.return_value = all_variables
     adapter = HistoricalDownloadFileRecordAdapter()
     directory = "./dev"
     file = "1.160904847.bz2"
@@ -53,14 +64,15 @@ def test_adapter():
 
             assert item.get("sp_back_size") == __calc_sp_back_size(test_item)
 
+            # the traded volume totals are kept as running sums while replaying
             ex_back_size = __calc_ex_back_size(test_item)
-            assert item.get("ex_back_size") == ex_back_size
+            assert item.get("ex_back_size") == approx(ex_back_size)
 
             assert item.get("sp_back_price") == test_item.get("sp").get("spn")
 
             ex_avg_back_price = item.get("ex_average_back_price")
             if ex_back_size:
-                assert ex_avg_back_price == __calc_ex_avg_back_price(test_item)
+                assert ex_avg_back_price == approx(__calc_ex_avg_back_price(test_item))
             else:
                 assert is_not_a_number(ex_avg_back_price)
 
@@ -73,13 +85,15 @@ def test_adapter():
             assert item.get("sp_lay_size") == __calc_sp_lay_size(test_item)
 
             ex_lay_size = __calc_ex_lay_size(test_item)
-            assert item.get("ex_lay_size") == ex_lay_size
+            assert item.get("ex_lay_size") == approx(ex_lay_size)
 
             assert item.get("sp_lay_price") == __calc_sp_lay_price(test_item)
 
             ex_average_lay_price = item.get("ex_average_lay_price")
             if ex_lay_size:
-                assert ex_average_lay_price == __calc_ex_avg_lay_price(test_item)
+                assert ex_average_lay_price == approx(
+                    __calc_ex_avg_lay_price(test_item)
+                )
             else:
                 assert is_not_a_number(ex_average_lay_price)
 
@@ -91,8 +105,12 @@ def test_adapter():
                 assert is_not_a_number(available_to_lay)
 
 
-def test_adapter_single_record():
+@patch(
+    "infrastructure.storage.historical.download.file.record.adapter.MetadataHandler.get_required_variables"
+)
+def test_adapter_single_record(required_variables):
     GIVEN("a record from a test file and an adapter")
+    required_variables.return_value = all_variables
     record = __get_test_record()
     adapter = HistoricalDownloadFileRecordAdapter()
 
@@ -228,6 +246,109 @@ def test_sum_no_valid_values():
     assert total == 0
 
 
+def test_get_best_prices_from_tick_ladder():
+    GIVEN("an adapter, a dict and a tick ladder made from the valid prices")
+    adapter = HistoricalDownloadFileRecordAdapter()
+    data = __get_test_dict()
+    ladder = TickLadder(
+        {
+            price: size
+            for price, size in data.items()
+            if isinstance(price, (int, float)) and price > 1
+        }
+    )
+    WHEN("we get the best prices from both")
+    THEN("they are the same")
+    assert adapter._get_max_valid_price(ladder) == adapter._get_max_valid_price(data)
+    assert adapter._get_min_valid_price(ladder) == adapter._get_min_valid_price(data)
+    THEN("an empty ladder has no best prices")
+    assert is_not_a_number(adapter._get_max_valid_price(TickLadder()))
+    assert is_not_a_number(adapter._get_min_valid_price(TickLadder()))
+
+
+@patch(
+    "infrastructure.storage.historical.download.file.record.adapter.MetadataHandler.get_required_variables"
+)
+def test_trade_totals_from_runner_state(required_variables):
+    GIVEN("a record and the same record with its items held as runner states")
+    required_variables.return_value = all_variables
+    record = __get_test_record()
+    runner_record = {
+        **record,
+        "items": {
+            runner_id: RunnerState(state=item)
+            for runner_id, item in record.get("items").items()
+        },
+    }
+    WHEN("we convert both records")
+    data = HistoricalDownloadFileRecordAdapter().convert(record)
+    runner_data = HistoricalDownloadFileRecordAdapter().convert(runner_record)
+    THEN("the traded volume totals are the same")
+    for item, runner_item in zip(data.get("items"), runner_data.get("items")):
+        for variable in [
+            "ex_back_size",
+            "ex_average_back_price",
+            "ex_lay_size",
+            "ex_average_lay_price",
+        ]:
+            if is_not_a_number(item.get(variable)):
+                assert is_not_a_number(runner_item.get(variable))
+            else:
+                assert runner_item.get(variable) == approx(item.get(variable))
+
+
+def test_required_variables():
+    GIVEN("a record and an adapter for the default required variables")
+    record = __get_test_record()
+    adapter = HistoricalDownloadFileRecordAdapter()
+
+    WHEN("we convert the record")
+    data = adapter.convert(record)
+
+    THEN("each item has only the id and the required variables")
+    required_variables = MetadataHandler().get_required_variables()
+    for item in data.get("items"):
+        assert set(item.keys()) == {"id"} | (set(required_variables) - {"removal_date"})
+
+
+@patch(
+    "infrastructure.storage.historical.download.file.record.adapter.MetadataHandler.get_required_variables"
+)
+def test_reduced_variables(required_variables):
+    GIVEN("a record and an adapter for a schema of only the back sizes")
+    required_variables.return_value = ["id", "sp_back_size", "ex_back_size"]
+    record = __get_test_record()
+    adapter = HistoricalDownloadFileRecordAdapter()
+
+    WHEN("we convert the record")
+    data = adapter.convert(record)
+
+    THEN("each item has only the id and the back sizes")
+    for item in data.get("items"):
+        assert list(item.keys()) == ["id", "sp_back_size", "ex_back_size"]
+        test_item = record.get("items").get(item.get("id"))
+        assert item.get("ex_back_size") == __calc_ex_back_size(test_item)
+
+
+def test_carried_forward_record():
+    GIVEN("a record and a gap filled copy which shares its items")
+    record = __get_test_record()
+    carried_forward = {**record, "extract_time": record.get("extract_time") + 1}
+    adapter = HistoricalDownloadFileRecordAdapter()
+
+    WHEN("we convert both records")
+    data = adapter.convert(record)
+    carried_forward_data = adapter.convert(carried_forward)
+    THEN("the converted items are reused")
+    assert carried_forward_data.get("items") is data.get("items")
+    assert carried_forward_data.get("extract_time") == -299
+
+    WHEN("we convert a record with new items")
+    new_data = adapter.convert(__get_test_record())
+    THEN("the items are converted again")
+    assert new_data.get("items") is not data.get("items")
+
+
 def __get_test_record():
     return {
         "closed_indicator": False,
@@ -768,3 +889,6 @@ def __calc_ex_avg_lay_price(item):
             for price, size in item.get("ex").get("trd").items()
         ]
     ) / __calc_ex_lay_size(item)
+
+
+all_variables = MetadataHandler().get_extended_variable_list()
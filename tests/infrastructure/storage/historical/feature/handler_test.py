@@ -0,0 +1,95 @@
+from bz2 import open as open_bz2
+from json import dumps
+
+from tests.utils import GIVEN, WHEN, THEN, get_test_file_path, cleanup_test_directory
+
+from app.market.data.transform.handler import TransformHandler
+from app.market.metadata.schema import FeatureSchema
+
+from benchmarks.generator import MarketGenerator
+
+from infrastructure.storage.historical.cache.handler import HistoricalCacheHandler
+from infrastructure.storage.historical.feature.handler import (
+    HistoricalFeatureStoreHandler,
+)
+from infrastructure.built_in.adapter.os_utils import remove_file, remove_tree
+from infrastructure.third_party.adapter.numpy_utils import is_not_a_number
+
+
+def test_build_and_load():
+    GIVEN("a historical file and a feature store handler")
+    path = __make_market_file(name="1.999999999.bz2")
+    feature_directory = get_test_file_path(name="features")
+    handler = HistoricalFeatureStoreHandler(directory=feature_directory)
+    THEN("the market is not in the store")
+    assert handler.load(path=path) is None
+
+    WHEN("we get the market")
+    built = handler.get_market(path=path)
+    THEN("the header describes the market")
+    header = built.get("header")
+    assert header.get("market_id") == "1.999999999"
+    assert header.get("key") == handler.get_key(path=path)
+
+    WHEN("we load the market from the store")
+    loaded = handler.load(path=path)
+    THEN("the stored items hold what the transform makes of the records")
+    records = list(HistoricalFeatureStoreHandler.get_records(market=loaded))
+    expected = list(
+        HistoricalCacheHandler.get_records(
+            market=HistoricalCacheHandler(
+                directory=get_test_file_path(name="cache")
+            ).get_market(path=path)
+        )
+    )
+    assert loaded.get("header") == header
+    assert len(records) == len(expected)
+    transformer = TransformHandler()
+    variables = FeatureSchema().get_runner_variables()
+    for record, expected_record in zip(records, expected):
+        assert record.get("extract_time") == expected_record.get("extract_time")
+        assert record.get("closed_indicator") == expected_record.get("closed_indicator")
+        try:
+            transformed_data = transformer.process(expected_record)
+        except TypeError:
+            THEN("only the required variables of a record which fails are kept")
+            transformed_data = {
+                (variable, item.get("id")): [item.get(variable)]
+                for item in expected_record.get("items")
+                for variable, _ in FeatureSchema().get_required_slots()
+            }
+        for item in record.get("items"):
+            for variable in variables:
+                value = (transformed_data.get((variable, item.get("id"))) or [None])[0]
+                assert (
+                    item.get(variable) == value
+                    or (value is None and item.get(variable) is None)
+                    or (
+                        isinstance(value, float)
+                        and is_not_a_number(value)
+                        and is_not_a_number(item.get(variable))
+                    )
+                )
+
+    remove_file(path=path)
+    remove_tree(path=feature_directory)
+    remove_tree(path=get_test_file_path(name="cache"))
+    cleanup_test_directory()
+
+
+def test_code_version():
+    GIVEN("the code versions of the feature store and the cache")
+    version = HistoricalFeatureStoreHandler.get_code_version()
+    THEN("it is stable between calls")
+    assert version == HistoricalFeatureStoreHandler.get_code_version()
+    THEN("the transform's code is part of the version")
+    assert version != HistoricalCacheHandler.get_code_version()
+
+
+def __make_market_file(name, duration=20):
+    path = get_test_file_path(name=name)
+    generator = MarketGenerator(duration=duration)
+    with open_bz2(path, "wt", encoding="utf-8") as file:
+        for record in generator.get_stream_records():
+            file.write(dumps(record) + "\n")
+    return path
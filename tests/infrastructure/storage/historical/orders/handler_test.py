@@ -0,0 +1,45 @@
+from unittest.mock import patch
+
+from tests.utils import GIVEN, WHEN, THEN
+from tests.mock.mediator import MockMediator
+
+from app.colleague import Colleague
+from infrastructure.storage.historical.orders.handler import HistoricalOrdersHandler
+
+
+@patch("tests.mock.mediator.MockMediator.notify")
+def test_post_order(mock_notify):
+    GIVEN("a historical orders handler and some valid and invalid orders")
+    handler = __get_handler()
+    orders = [
+        {"id": 123, "type": "BUY", "ex_price": 2.0, "size": 5},
+        {"id": 456, "type": "SELL", "ex_price": 0, "size": 5},
+        {"type": "BUY", "ex_price": 2.0, "size": 5},
+    ]
+    WHEN("we post the orders")
+    handler.post_order(orders=orders)
+    THEN("only the valid order is matched")
+    args, kwargs = mock_notify.call_args
+    assert kwargs.get("event") == "orders posted"
+    assert kwargs.get("data") == {
+        "response": [{"instruction": {"selectionId": 123}, "status": "SUCCESS"}],
+        "orders": orders,
+    }
+
+
+@patch("tests.mock.mediator.MockMediator.notify")
+def test_post_no_valid_orders(mock_notify):
+    GIVEN("a historical orders handler and only invalid orders")
+    handler = __get_handler()
+    orders = [{"id": 123, "type": "HOLD", "ex_price": 2.0, "size": 5}]
+    WHEN("we post the orders")
+    handler.post_order(orders=orders)
+    THEN("processing is finished without any orders posted")
+    mock_notify.assert_called_once_with(event="finished processing", data=None)
+
+
+def __get_handler():
+    class Handler(HistoricalOrdersHandler, Colleague):
+        pass
+
+    return Handler(mediator=MockMediator())
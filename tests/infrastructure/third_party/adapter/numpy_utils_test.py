@@ -4,6 +4,8 @@ from infrastructure.third_party.adapter.numpy_utils import (
     not_a_number,
     calculate_log,
     not_a_number_to_number,
+    stack_arrays,
+    calculate_log_returns,
 )
 
 
@@ -55,3 +57,19 @@ def test_log():
     WHEN("we calculate the log for each value in the list")
     for i, value in enumerate(values):
         assert almost_equal(calculate_log(value), i)
+
+
+def test_log_returns():
+    GIVEN("two rows of prices")
+    rows = stack_arrays([[1, 2, 4], [3.0, 3.0, not_a_number()]])
+    WHEN("we calculate the log returns of the rows")
+    returns = calculate_log_returns(rows)
+    THEN("the returns have the same shape as the prices")
+    assert returns.shape == (2, 3)
+    THEN("the first return of each row is not a number")
+    assert is_not_a_number(returns[0][0]) and is_not_a_number(returns[1][0])
+    THEN("the remaining returns are the log of each price over the previous price")
+    assert almost_equal(returns[0][1], calculate_log(2))
+    assert almost_equal(returns[0][2], calculate_log(2))
+    assert almost_equal(returns[1][1], 0)
+    assert is_not_a_number(returns[1][2])
@@ -0,0 +1,144 @@
+from tests.utils import GIVEN, WHEN, THEN, almost_equal
+
+from app.backtest.sweep.handler import SweepHandler
+from app.backtest.sweep.recorder import FeatureRecorder
+from app.market.model.handler import ModelHandler
+from app.market.orders.handler import OrdersHandler
+
+from benchmarks.mediator import RecordingMediator
+
+from infrastructure.third_party.adapter.parameter_sweep import BatchParameterSweep
+from infrastructure.third_party.adapter.stats_model import (
+    BatchWeightedLinearRegression,
+    WeightedLinearRegression,
+)
+
+
+def test_run_matches_handlers():
+    GIVEN("the model data for a tick and a grid of parameters")
+    items = __get_model_data()
+    grid = SweepHandler.make_grid(
+        parameters={
+            "alpha": [-0.00001, -1],
+            "wlr_back_size": [5000, 10000],
+            "back_size_share": [0.6, 0.9],
+            "kelly_fraction": [1, 0.5],
+            "cap": [0.05, 0.5],
+        }
+    )
+    recorder = FeatureRecorder(
+        mediator=RecordingMediator(), batch_wls_model=BatchWeightedLinearRegression()
+    )
+    recorder.run_models(items=items)
+
+    WHEN("we run the sweep over the recorded tick")
+    sweep = BatchParameterSweep(grid=grid, bank=5000)
+    sweep.run(ticks=recorder.get_ticks())
+    orders = sweep.get_orders()
+
+    THEN("there are orders for each grid point")
+    assert len(orders) == len(grid)
+    assert any(orders) and not all(orders)
+    for point, parameters in enumerate(grid):
+        THEN("the orders are those the models and orders handler make")
+        expected = __get_orders(items=items, parameters=parameters)
+        assert [order.get("id") for order in orders[point]] == [
+            order.get("id") for order in expected
+        ]
+        for order, expected_order in zip(orders[point], expected):
+            assert order.get("model_id") == expected_order.get("model_id")
+            assert order.get("size") == expected_order.get("size")
+            assert almost_equal(
+                order.get("probability"), expected_order.get("probability")
+            )
+            assert order.get("tick") == 0
+
+
+def test_run_no_ticks():
+    GIVEN("a grid of parameters and no ticks")
+    grid = SweepHandler.make_grid(parameters={"cap": [0.05, 0.1]})
+    WHEN("we run the sweep")
+    sweep = BatchParameterSweep(grid=grid)
+    sweep.run(ticks=[])
+    THEN("there are no orders for any grid point")
+    assert sweep.get_orders() == [[], []]
+
+
+def __get_orders(items, parameters):
+    mediator = RecordingMediator()
+    ModelHandler(
+        mediator=mediator,
+        wls_model=WeightedLinearRegression(),
+        batch_wls_model=BatchWeightedLinearRegression(),
+        thresholds={
+            name: parameters.get(name) for name in ModelHandler.get_default_thresholds()
+        },
+    ).run_models(items=[dict(item) for item in items])
+    results = mediator.get_data(event="models have results")
+    if not results:
+        return []
+    OrdersHandler(
+        mediator=mediator,
+        bank=5000,
+        sizing={
+            name: parameters.get(name) for name in OrdersHandler.get_default_sizing()
+        },
+    ).get_new_orders(items=results[0])
+    orders = mediator.get_data(event="new orders")
+    return orders[0] if orders else []
+
+
+def __get_model_data():
+    extract_time = [float(second) for second in range(-10, 1)]
+    return [
+        __get_item(
+            item_id=1,
+            back_size=8000,
+            sp_probability=0.3,
+            ex_average_probability=0.25,
+            price=4.2,
+            # a falling price, falling faster towards the off
+            sp_back_prices=[5 - (0.01 * (second + 10) ** 2) for second in range(11)],
+            extract_time=extract_time,
+        ),
+        __get_item(
+            item_id=2,
+            back_size=30000,
+            sp_probability=0.4,
+            ex_average_probability=0.45,
+            price=3,
+            sp_back_prices=[2.5] * 11,
+            extract_time=extract_time,
+        ),
+        __get_item(
+            item_id=3,
+            back_size=2000,
+            sp_probability=0.3,
+            ex_average_probability=0.3,
+            price=1.8,
+            sp_back_prices=[3.3] * 11,
+            extract_time=extract_time,
+        ),
+    ]
+
+
+def __get_item(
+    item_id,
+    back_size,
+    sp_probability,
+    ex_average_probability,
+    price,
+    sp_back_prices,
+    extract_time,
+):
+    return {
+        "id": item_id,
+        "extract_time_ts": extract_time,
+        "combined_back_size_pit": back_size,
+        "compositional_sp_probability_pit": sp_probability,
+        "compositional_ex_average_probability_pit": ex_average_probability,
+        "ex_offered_back_price_pit": price,
+        "ex_offered_back_price_mc_pit": price - 0.2,
+        "compositional_sp_back_price_ts": sp_back_prices,
+        "combined_back_size_ts": [back_size] * len(extract_time),
+    }
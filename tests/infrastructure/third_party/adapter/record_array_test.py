@@ -0,0 +1,140 @@
+from tests.utils import GIVEN, WHEN, THEN, get_test_file_path, cleanup_test_directory
+
+from infrastructure.built_in.adapter.os_utils import remove_file
+from infrastructure.third_party.adapter.numpy_utils import (
+    is_not_a_number,
+    not_a_number,
+)
+from infrastructure.third_party.adapter.record_array import (
+    iterate_records,
+    load_arrays,
+    make_record_arrays,
+    save_arrays,
+)
+
+
+def test_records_round_trip():
+    GIVEN("records with missing values, a removed runner and a runner added later")
+    records = __get_records()
+    WHEN("we make arrays from the records")
+    arrays, header = make_record_arrays(records=records, variables=["price", "size"])
+    THEN("the arrays are runner by second by variable")
+    assert arrays.get("values").shape == (3, 3, 2)
+    assert header.get("ids") == [1, 2, 3]
+    WHEN("we iterate the records back out of the arrays")
+    result = list(iterate_records(arrays=arrays, header=header))
+    THEN("the records are unchanged")
+    assert len(result) == len(records)
+    for record, expected in zip(result, records):
+        assert record.get("extract_time") == expected.get("extract_time")
+        assert record.get("closed_indicator") == expected.get("closed_indicator")
+        assert [item.get("id") for item in record.get("items")] == [
+            item.get("id") for item in expected.get("items")
+        ]
+        for item, expected_item in zip(record.get("items"), expected.get("items")):
+            assert item.keys() == expected_item.keys()
+            for key, value in expected_item.items():
+                if value is None:
+                    assert item.get(key) is None
+                elif isinstance(value, float) and is_not_a_number(value):
+                    assert is_not_a_number(item.get(key))
+                else:
+                    assert item.get(key) == value
+
+
+def test_save_and_load_arrays():
+    GIVEN("arrays made from records and a directory")
+    arrays, header = make_record_arrays(records=__get_records(), variables=["price"])
+    directory = get_test_file_path(name="")
+    WHEN("we save and load the arrays")
+    save_arrays(directory=directory, arrays=arrays)
+    loaded = load_arrays(directory=directory, names=list(arrays.keys()))
+    THEN("the loaded arrays are memory mapped and equal to the originals")
+    for name, values in arrays.items():
+        assert loaded.get(name).shape == values.shape
+        assert not loaded.get(name).flags.writeable
+    for name in ["present", "missing", "extract_time", "closed_indicator"]:
+        assert loaded.get(name).tolist() == arrays.get(name).tolist()
+    THEN("the records made from the loaded arrays are the same")
+    assert [
+        record.get("extract_time")
+        for record in iterate_records(arrays=loaded, header=header)
+    ] == [1, 2, 3]
+    for name in arrays:
+        remove_file(path=get_test_file_path(name=name + ".npy"))
+    cleanup_test_directory()
+
+
+def test_unchanged_seconds_keep_items():
+    GIVEN("records where the prices only change in the last second")
+    record = {
+        "closed_indicator": False,
+        "items": [{"id": 1, "price": 2.5, "size": not_a_number()}],
+    }
+    records = [dict(record, extract_time=second) for second in range(3)] + [
+        {
+            "extract_time": 3,
+            "closed_indicator": False,
+            "items": [{"id": 1, "price": 2.6, "size": not_a_number()}],
+        }
+    ]
+    arrays, header = make_record_arrays(records=records, variables=["price", "size"])
+    WHEN("we iterate the records back out of the arrays")
+    result = [
+        record.get("items") for record in iterate_records(arrays=arrays, header=header)
+    ]
+    THEN("the unchanged seconds share the items of the second before")
+    assert result[1] is result[0]
+    assert result[2] is result[0]
+    THEN("the changed second has new items")
+    assert result[3] is not result[2]
+    assert result[3][0].get("price") == 2.6
+
+
+def test_removal_date_change_makes_new_items():
+    GIVEN("records where only the removal date of a runner changes")
+    records = [
+        {"extract_time": 1, "items": [{"id": 1, "price": 2.5}]},
+        {
+            "extract_time": 2,
+            "items": [{"id": 1, "price": 2.5, "removal_date": "2019-01-01"}],
+        },
+    ]
+    arrays, header = make_record_arrays(records=records, variables=["price"])
+    WHEN("we iterate the records back out of the arrays")
+    result = [
+        record.get("items") for record in iterate_records(arrays=arrays, header=header)
+    ]
+    THEN("the second with the removal date has new items")
+    assert result[1] is not result[0]
+    assert result[1][0].get("removal_date") == "2019-01-01"
+
+
+def __get_records():
+    return [
+        {
+            "extract_time": 1,
+            "closed_indicator": False,
+            "items": [
+                {"id": 1, "price": 2.5, "size": 10},
+                {"id": 2, "price": None, "size": not_a_number()},
+            ],
+        },
+        {
+            "extract_time": 2,
+            "closed_indicator": False,
+            "items": [
+                {"id": 1, "price": 2.6, "size": 12},
+                {"id": 2, "price": 4, "size": 1, "removal_date": "2019-01-01"},
+                {"id": 3, "price": 9.5, "size": 0},
+            ],
+        },
+        {
+            "extract_time": 3,
+            "closed_indicator": True,
+            "items": [
+                {"id": 2, "price": 4, "size": 1, "removal_date": "2019-01-01"},
+                {"id": 3, "price": 9.5, "size": 0},
+            ],
+        },
+    ]
@@ -1,6 +1,13 @@
 from tests.utils import GIVEN, WHEN, THEN, almost_equal
-from infrastructure.third_party.adapter.stats_model import WeightedLinearRegression
-from infrastructure.third_party.adapter.numpy_utils import is_not_a_number, not_a_number
+from infrastructure.third_party.adapter.stats_model import (
+    WeightedLinearRegression,
+    BatchWeightedLinearRegression,
+)
+from infrastructure.third_party.adapter.numpy_utils import (
+    calculate_log,
+    is_not_a_number,
+    not_a_number,
+)
 
 
 def test_weighted_linear_regression():
@@ -110,3 +117,131 @@ def test_less_than_3_valid():
     THEN("there are not enough valid records and NaNs are returned")
     assert is_not_a_number(model.get_alpha())
     assert is_not_a_number(model.get_Beta())
+
+
+def test_incremental_matches_batch():
+    GIVEN("a growing set of co-ordinate data containing invalid records")
+    y = [1.3, 2.0, not_a_number(), 4.4, 5.1, 5.9, 7.2, 8.1, 8.8, 10.3]
+    x = [-9.0, -8.0, -7.0, not_a_number(), -5.0, -4.0, -3.0, -2.0, -1.0, 0.0]
+    weights = [2, 1, 5, 9, not_a_number(), 3, 7, 0, 11, 4]
+    WHEN("we run a batch and an incremental model on each prefix of the data")
+    batch_model = WeightedLinearRegression()
+    incremental_model = WeightedLinearRegression(incremental=True)
+    for end in range(1, len(y) + 1):
+        batch_model.run(y=y[:end], x=x[:end], weights=weights[:end])
+        incremental_model.run(y=y[:end], x=x[:end], weights=weights[:end], key="runner")
+        THEN("the incremental parameters match the batch parameters")
+        for expected, result in [
+            (batch_model.get_alpha(), incremental_model.get_alpha()),
+            (batch_model.get_Beta(), incremental_model.get_Beta()),
+        ]:
+            if is_not_a_number(expected):
+                assert is_not_a_number(result)
+            else:
+                assert almost_equal(expected, result)
+
+
+def test_incremental_keys_and_reset():
+    GIVEN("an incremental model that has been run for one key")
+    y = [1.1, 2.1, 3.1, 4.1, 5.1, 6.1]
+    x = [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+    weights = [2, 2, 2, 2, 2, 2]
+    model = WeightedLinearRegression(incremental=True)
+    model.run(y=y, x=x, weights=weights, key=1)
+    WHEN("we run the model for another key with too few valid records")
+    model.run(y=y[:2], x=x[:2], weights=weights[:2], key=2)
+    THEN("NaNs are returned as the statistics are kept per key")
+    assert is_not_a_number(model.get_alpha())
+    assert is_not_a_number(model.get_Beta())
+
+    WHEN("we reset the first key and run it with different data")
+    model.reset(key=1)
+    model.run(y=[0, 0, 0, 0, 0, 0], x=x, weights=weights, key=1)
+    THEN("the parameters are calculated from the new data only")
+    assert almost_equal(model.get_alpha(), 0)
+    assert almost_equal(model.get_Beta(), 0)
+
+
+def test_batch_matches_single():
+    GIVEN("co-ordinate data and weights for several runners")
+    x = [-5.0, -4.0, -3.0, -2.0, -1.0, 0.0]
+    y = [
+        [1.1, 2.1, 3.1, 4.1, 5.1, 6.1],
+        [1.0, 2.0, 3.0, 4.0, 5.0, 9999999.0],
+        [0.3, not_a_number(), 0.1, 0.4, 0.2, 0.6],
+        [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+    ]
+    weights = [
+        [2, 2, 2, 2, 2, 2],
+        [2, 2, 2, 2, 2, 0],
+        [5, 3, 8, 1000, 2, 40],
+        [not_a_number(), not_a_number(), not_a_number(), 2, 2, not_a_number()],
+    ]
+    WHEN("we run the batch model and a single model for each runner")
+    batch_model = BatchWeightedLinearRegression()
+    batch_model.run(y=y, x=x, weights=weights)
+    model = WeightedLinearRegression()
+    for i, _ in enumerate(y):
+        model.run(y=y[i], x=x, weights=weights[i])
+        THEN("the batch parameters match the single parameters")
+        for expected, result in [
+            (model.get_alpha(), batch_model.get_alpha()[i]),
+            (model.get_Beta(), batch_model.get_Beta()[i]),
+        ]:
+            if is_not_a_number(expected):
+                assert is_not_a_number(result)
+            else:
+                assert almost_equal(expected, result)
+
+
+def test_batch_non_uniform_lists():
+    GIVEN("runner data with a different length to the x data")
+    y = [[0, 0, 0, 0, 0, 0], [1, 1, 1, 1, 1, 1]]
+    x = [0.0, 1.0, 2.0, 3.0, 4.0]
+    weights = [[2, 2, 2, 2, 2, 2], [2, 2, 2, 2, 2, 2]]
+    WHEN("we run the batch model")
+    model = BatchWeightedLinearRegression()
+    model.run(y=y, x=x, weights=weights)
+    THEN("the input data is rejected and NaNs are returned for every runner")
+    assert len(model.get_alpha()) == 2
+    assert all(is_not_a_number(alpha) for alpha in model.get_alpha())
+    assert all(is_not_a_number(Beta) for Beta in model.get_Beta())
+
+
+def test_batch_inverse():
+    GIVEN("co-ordinate data and weights for two runners and a change to the y data")
+    x = [10.0, 11.0, 12.0, 13.0, 14.0, 15.0]
+    y = [
+        [not_a_number(), 0.2, -0.1, 0.3, 0.05, -0.2],
+        [not_a_number(), 0.1, 0.1, not_a_number(), 0.4, 0.3],
+    ]
+    weights = [[5, 3, 8, 1000, 2, 40], [2, 2, 2, 2, 2, 2]]
+    change = [0, 0, 0, 0.5, -0.25, 0.1]
+    WHEN("we run the batch model with and without the change")
+    model = BatchWeightedLinearRegression()
+    model.run(y=y, x=x, weights=weights)
+    alpha = model.get_alpha()
+    Beta = model.get_Beta()
+    inverse = model.get_inverse()
+    origin = model.get_origin()
+    model.run(
+        y=[[value + change[i] for i, value in enumerate(row)] for row in y],
+        x=x,
+        weights=weights,
+    )
+    THEN("the changed parameters follow from the inverse and the weighted change")
+    for runner, row in enumerate(y):
+        kept = [
+            (calculate_log(max(weight, 1)), x[i] - origin, change[i])
+            for i, weight in enumerate(weights[runner])
+            if not is_not_a_number(row[i])
+        ]
+        wy = sum(weight * value for weight, _, value in kept)
+        wxy = sum(weight * position * value for weight, position, value in kept)
+        alpha_change = inverse[runner][1][0] * wy + inverse[runner][1][1] * wxy
+        Beta_change = inverse[runner][0][0] * wy + inverse[runner][0][1] * wxy
+        assert almost_equal(model.get_alpha()[runner], alpha[runner] + alpha_change)
+        assert almost_equal(
+            model.get_Beta()[runner],
+            Beta[runner] + Beta_change - alpha_change * origin,
+        )
@@ -0,0 +1,49 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from json import dumps
+from threading import Thread
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8")
+        self.server.requests.append(
+            {"path": self.path, "body": body, "port": self.client_address[1]}
+        )
+        status = 500 if self.path == "/error" else 200
+        response = dumps({"result": [{"path": self.path, "body": body}]})
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(response)))
+        self.end_headers()
+        self.wfile.write(response.encode("utf-8"))
+
+    def log_message(self, format, *args):  # pylint: disable=redefined-builtin
+        pass
+
+
+class MockServer:
+    def __init__(self):
+        self.__server = ThreadingHTTPServer(("127.0.0.1", 0), MockRequestHandler)
+        self.__server.requests = []
+        self.__thread = Thread(target=self.__server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.__thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.__server.shutdown()
+        self.__server.server_close()
+
+    def get_url(self, path="/"):
+        host, port = self.__server.server_address
+        return f"http://{host}:{port}{path}"
+
+    def get_requests(self):
+        return self.__server.requests
+
+    def get_connection_count(self):
+        return len({request.get("port") for request in self.__server.requests})